@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark: time to first key and peak memory when parsing list responses.
+
+Parses one synthetic ListObjectsV2 page, read from a fake response in
+64 KiB chunks the way a socket delivers it, three ways:
+
+  tree      read the whole body, build an ElementTree and a list of dicts
+            (how list responses were parsed before the incremental parser)
+  buffered  list_bucket2's default: incremental parse, page yielded when read
+  stream    list_bucket2(stream=True): each key yielded as soon as it is parsed
+
+Each case runs in a fresh subprocess so peak RSS is measured separately.
+Real pages hold at most 1000 keys; larger pages make the difference visible.
+
+Usage:
+    python benchmarks/bench_list_parse.py [--keys N]
+
+Example:
+    python benchmarks/bench_list_parse.py --keys 200000
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+from time import perf_counter
+from xml.etree.ElementTree import fromstring
+
+import s3lib
+from s3lib import Connection
+
+NS = "http://s3.amazonaws.com/doc/2006-03-01/"
+CASES = ["tree", "buffered", "stream"]
+
+
+def page_chunks(keys):
+    """Generate the body of one ListObjectsV2 page without holding it in memory."""
+    yield f'<ListBucketResult xmlns="{NS}"><Name>bench</Name><Prefix></Prefix><KeyCount>{keys}</KeyCount>'.encode()
+    for i in range(keys):
+        yield (f"<Contents><Key>data/2024/01/{i:012d}-0123456789abcdef.parquet</Key>"
+               f"<LastModified>2024-01-01T00:00:00.000Z</LastModified>"
+               f"<ETag>&quot;0123456789abcdef0123456789abcdef&quot;</ETag>"
+               f"<Size>{i * 7}</Size><StorageClass>STANDARD</StorageClass></Contents>").encode()
+    yield b"</ListBucketResult>"
+
+
+class ChunkedResponse:
+    """Serves page_chunks() through read(size), like an HTTPResponse."""
+
+    status = 200
+
+    def __init__(self, keys):
+        self._chunks = page_chunks(keys)
+        self._buffer = b""
+
+    def read(self, size=-1):
+        parts = [self._buffer]
+        have = len(self._buffer)
+        while size < 0 or have < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            parts.append(chunk)
+            have += len(chunk)
+        data = b"".join(parts)
+        if size < 0:
+            size = len(data)
+        data, self._buffer = data[:size], data[size:]
+        return data
+
+
+def tree_objects(resp):
+    tree = fromstring(resp.read())
+    contents = tree.findall(f"{{{NS}}}Contents")
+    yield from [{child.tag.replace(f"{{{NS}}}", ""): child.text for child in obj} for obj in contents]
+
+
+def run_case(case, keys):
+    resp = ChunkedResponse(keys)
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = perf_counter()
+    if case == "tree":
+        objects = tree_objects(resp)
+    else:
+        conn = Connection("bench", b"bench")
+        conn._s3_request = lambda *args, **kwargs: resp
+        objects = conn.list_bucket2("bench", stream=(case == "stream"))
+    next(objects)
+    first = perf_counter() - start
+    count = 1 + sum(1 for _ in objects)
+    total = perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+    assert count == keys, count
+    print(json.dumps({'first': first, 'total': total, 'peak_kib': peak}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark list response parsing')
+    parser.add_argument('--keys', type=int, default=100000,
+                        help='Keys in the synthetic page (default: 100000)')
+    parser.add_argument('--case', choices=CASES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        run_case(args.case, args.keys)
+        return
+
+    print(f"One page of {args.keys} keys, read in {s3lib.LIST_READ_CHUNK_SIZE // 1024} KiB chunks")
+    print(f"  {'case':9} {'first key':>10} {'all keys':>10} {'peak RSS':>12}")
+    for case in CASES:
+        out = subprocess.run([sys.executable, __file__, '--case', case, '--keys', str(args.keys)],
+                             check=True, capture_output=True, text=True).stdout
+        result = json.loads(out)
+        print(f"  {case:9} {result['first'] * 1000:8.1f}ms {result['total'] * 1000:8.1f}ms "
+              f"{result['peak_kib'] / 1024:9.1f} MiB")
+
+
+if __name__ == '__main__':
+    main()
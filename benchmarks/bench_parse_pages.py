@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark: keys parsed per second for ListObjectsV2 and DeleteObjects responses.
+
+Parses 1000-key list pages the way list_bucket2 reads them, in 64 KiB chunks,
+with each parser:
+
+  tree      fromstring() the whole body and build dicts with namespaced
+            findall() and tag.replace() (how pages were parsed originally)
+  pull      the incremental ElementTree parser, now only the fallback
+  scan      the pattern-based parser list_bucket2 uses
+  records   the same parser building ObjectInfo (list_objects)
+
+and 1000-key DeleteObjects responses with ElementTree and with the pattern-based parser.
+
+Pages are recorded responses given with --page, or synthetic pages in the
+shape S3 writes them: XML declaration, continuation token first, quoted
+ETags and some keys that need escaping.
+
+Usage:
+    python benchmarks/bench_parse_pages.py [--page FILE ...] [--pages N]
+
+Example:
+    curl -s "$PRESIGNED_LIST_URL" > page.xml
+    python benchmarks/bench_parse_pages.py --page page.xml --pages 200
+"""
+
+import argparse
+from time import perf_counter
+from xml.etree.ElementTree import fromstring
+
+import s3lib
+from s3lib import _ListResponseParser, _TreeListParser, _parse_delete_bulk_response
+from s3lib import _parse_delete_bulk_response_tree
+
+NS = "http://s3.amazonaws.com/doc/2006-03-01/"
+KEYS_PER_PAGE = 1000
+
+
+def synthetic_keys(page):
+    for i in range(KEYS_PER_PAGE):
+        n = page * KEYS_PER_PAGE + i
+        name = f"data/year=2024/month={n % 12 + 1:02d}/part-{n:08d}-7c1e2d3b.snappy.parquet"
+        # A few keys with characters S3 escapes
+        yield name.replace("part", "a&b part") if n % 50 == 0 else name
+
+
+def synthetic_list_page(page):
+    contents = "".join(
+        f"<Contents><Key>{key.replace('&', '&amp;')}</Key>"
+        f"<LastModified>2024-05-{page % 28 + 1:02d}T12:34:56.000Z</LastModified>"
+        f"<ETag>&quot;{(page * 7919 + i) % 2**128:032x}&quot;</ETag>"
+        f"<Size>{(page * 7919 + i * 104729) % 10**9}</Size>"
+        f"<StorageClass>STANDARD</StorageClass></Contents>"
+        for (i, key) in enumerate(synthetic_keys(page)))
+    return (f'<?xml version="1.0" encoding="UTF-8"?>\n<ListBucketResult xmlns="{NS}"><Name>bench</Name>'
+            f'<Prefix>data/</Prefix><NextContinuationToken>1ueGcxLPRx1Tr/XYExHnhbYLgveDs2J/wm36Hy4vbOwM='
+            f'</NextContinuationToken><KeyCount>{KEYS_PER_PAGE}</KeyCount><MaxKeys>1000</MaxKeys>'
+            f'<IsTruncated>true</IsTruncated>{contents}</ListBucketResult>').encode()
+
+
+def synthetic_delete_response(page):
+    entries = "".join(
+        f"<Error><Key>{key.replace('&', '&amp;')}</Key><Code>AccessDenied</Code>"
+        f"<Message>Access Denied</Message></Error>" if i % 100 == 0 else
+        f"<Deleted><Key>{key.replace('&', '&amp;')}</Key></Deleted>"
+        for (i, key) in enumerate(synthetic_keys(page)))
+    return f'<?xml version="1.0" encoding="UTF-8"?>\n<DeleteResult xmlns="{NS}">{entries}</DeleteResult>'.encode()
+
+
+def parse_tree(body):
+    tree = fromstring(body)
+    objects = [{child.tag.replace(f"{{{NS}}}", ""): child.text for child in obj}
+               for obj in tree.findall(f"{{{NS}}}Contents")]
+    tree.findtext(f"{{{NS}}}NextContinuationToken")
+    return objects
+
+
+def parse_incremental(parser_class, records=False):
+    def parse(body):
+        parser = parser_class(records)
+        objects = []
+        for i in range(0, len(body), s3lib.LIST_READ_CHUNK_SIZE):
+            objects += parser.feed(body[i:i + s3lib.LIST_READ_CHUNK_SIZE])
+        return objects + parser.close()
+    return parse
+
+
+LIST_PARSERS = {
+    'tree': parse_tree,
+    'pull': parse_incremental(_TreeListParser),
+    'scan': parse_incremental(_ListResponseParser),
+    'records': parse_incremental(_ListResponseParser, records=True),
+}
+
+DELETE_PARSERS = {
+    'tree': lambda body: list(_parse_delete_bulk_response_tree(body)),
+    'scan': lambda body: list(_parse_delete_bulk_response(body)),
+}
+
+
+def run(parsers, bodies, repeat):
+    results = {}
+    for (name, parse) in parsers.items():
+        best = None
+        for _ in range(repeat):
+            start = perf_counter()
+            keys = sum(len(parse(body)) for body in bodies)
+            elapsed = perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = (keys, best)
+    return results
+
+
+def report(title, results):
+    print(title)
+    baseline = results['tree'][1]
+    for (name, (keys, elapsed)) in results.items():
+        print(f"  {name:8} {keys / elapsed:>12,.0f} keys/s  {baseline / elapsed:5.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark list and delete response parsers')
+    parser.add_argument('--page', action='append', default=[],
+                        help='Recorded ListObjectsV2 response body (repeatable; default: synthetic pages)')
+    parser.add_argument('--pages', type=int, default=100,
+                        help='Pages parsed per run (default: 100)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Runs per parser; the fastest is reported (default: 3)')
+    args = parser.parse_args()
+
+    if args.page:
+        recorded = []
+        for path in args.page:
+            with open(path, 'rb') as f:
+                recorded.append(f.read())
+        pages = [recorded[i % len(recorded)] for i in range(args.pages)]
+    else:
+        pages = [synthetic_list_page(i) for i in range(args.pages)]
+    deletes = [synthetic_delete_response(i) for i in range(args.pages)]
+
+    report(f"ListObjectsV2: {args.pages} pages", run(LIST_PARSERS, pages, args.repeat))
+    report(f"DeleteObjects: {args.pages} responses", run(DELETE_PARSERS, deletes, args.repeat))
+
+
+if __name__ == '__main__':
+    main()
@@ -3,20 +3,37 @@ from hashlib import md5
 from hashlib import sha1
 from hmac import new as hmac_new
 from http.client import HTTPConnection, HTTPSConnection, HTTPException, HTTPResponse, NO_CONTENT, OK, RemoteDisconnected
+import queue
+import re
 import ssl
+import threading
 from logging import basicConfig as logging_basicConfig, DEBUG, getLogger
-from typing import Generator, Iterable, Optional, Tuple, TypedDict, Union
-from .utils import batchify, raise_http_resp_error
-from .sigv4 import sign_request_v4, hash_payload, get_timestamp
+from typing import Generator, Iterable, Optional, Tuple, TypedDict, Union, cast
+from .utils import batchify, lower_headers, raise_http_resp_error
+from .utils import S3ResponseError  # noqa: F401
+from .sigv4 import sign_request_v4, hash_payload, get_timestamp, SigningKeyCache, DEFAULT_SIGNING_KEY_CACHE
+from .sigv4 import STREAMING_PAYLOAD, MIN_SIGNED_CHUNK_SIZE, aws_chunked_length, sign_chunks
 from os import environ, fstat
+from io import BytesIO
+from tempfile import TemporaryFile
 from urllib.parse import quote
 from stat import S_ISREG, ST_SIZE
 from sys import stderr
 from time import time
 from xml.etree.ElementTree import fromstring as parse
-from xml.etree.ElementTree import Element, SubElement, tostring
+from xml.etree.ElementTree import Element, ParseError, SubElement, XMLPullParser, tostring
 
 from .pool import ConnectionPool, ConnectionLease  # noqa: F401
+from .multipart import FileSlice, upload_multipart  # noqa: F401
+from .download import download_parallel, read_ranges  # noqa: F401
+from .random_access import S3RandomAccessFile  # noqa: F401
+from .disk_cache import DiskCache  # noqa: F401
+from .memory_cache import MemoryCache  # noqa: F401
+from .listing import list_parallel, list_sharded  # noqa: F401
+from .object_info import ObjectColumns, ObjectInfo  # noqa: F401
+from .snapshot import ListingSnapshot  # noqa: F401
+from .usage import PrefixUsage, UsageSummary, disk_usage  # noqa: F401
+from .delete import delete_parallel, delete_prefix  # noqa: F401
 
 # Configure module-level logger
 logger = getLogger(__name__)
@@ -45,6 +62,30 @@ class PutResult(TypedDict):
     checksum: str | None
 
 
+class MultipartPutResult(PutResult):
+    """
+    Result of a successful complete_multipart_upload() call: a PutResult and
+
+    status:     HTTP status of the CompleteMultipartUpload response
+    """
+    status: int
+
+
+class PartResult(TypedDict):
+    """
+    Result of a successful upload_part() call.
+
+    part_number:        1-based position of the part in the object
+    etag:               ETag of the part, quotes stripped
+    checksum:           Base64 checksum of the part if one was sent, otherwise None
+    checksum_algorithm: Algorithm of checksum ('SHA256' or 'SHA1'), otherwise None
+    """
+    part_number: int
+    etag: str
+    checksum: str | None
+    checksum_algorithm: str | None
+
+
 class ConnectionLifecycleError(Exception):
     """Raised when attempting to reuse a connection with an unconsumed response."""
     pass
@@ -59,6 +100,16 @@ class PreconditionFailed(Exception):
     pass
 
 
+# Unread body bytes S3ByteStream discards on exit to keep the connection alive
+DEFAULT_DRAIN_THRESHOLD = 64 * 1024
+_DRAIN_CHUNK_SIZE = 64 * 1024
+
+
+class ChecksumMismatch(ValueError):
+    """Raised when downloaded bytes do not match the object's x-amz-checksum-* header."""
+    pass
+
+
 class S3ByteStream:
     """
     A streaming byte source wrapping an S3 HTTP response.
@@ -70,44 +121,120 @@ class S3ByteStream:
     Connection hygiene on __exit__:
       - If the stream was fully exhausted by read(), the HTTP connection is
         already clean and remains open for reuse (keep-alive).
-      - If the stream was not fully consumed (early exit), the underlying
-        response is closed, triggering a reconnect on the next request.
-        This avoids draining potentially large amounts of unwanted data.
+      - If no more than drain_threshold bytes of the body are left unread,
+        they are read and discarded so the connection stays reusable; a new
+        TCP+TLS handshake costs more than a few kilobytes of transfer.
+      - Otherwise (early exit), the underlying response is closed,
+        triggering a reconnect on the next request. This avoids draining
+        potentially large amounts of unwanted data.
+      The outcome is recorded in release: 'exhausted', 'drained' or 'closed'.
 
     An optional on_close callback fires in __exit__ after cleanup, allowing
     callers to track stream lifetime and enforce handle discipline.
 
+    readinto() fills a caller-supplied buffer instead of allocating a new
+    bytes object per chunk, so a copy loop can reuse one buffer throughout.
+
+    A verifying stream (get_object2(..., verify=True)) hashes the body as it
+    is read and raises ChecksumMismatch from the read that reaches the end of
+    the body if the digest does not match the object's checksum header.
+
     Usage:
         stream, headers = conn.get_object2(bucket, key)
         if stream is not None:
             with stream:
                 while chunk := stream.read(65536):
                     process(chunk)
+
+        # Reusing one buffer
+        buf = memoryview(bytearray(65536))
+        with stream:
+            while n := stream.readinto(buf):
+                process(buf[:n])
     """
 
-    def __init__(self, response: HTTPResponse, on_close=None):
+    def __init__(self, response: HTTPResponse | BytesIO, on_close=None, checksum: Tuple[str, str] | None = None,
+                 remaining: int | None = None, drain_threshold: int = 0):
         self._response = response
         self._exhausted = False
         self._on_close = on_close
-
-    def read(self, size: int = -1) -> bytes:
+        # Unread body bytes, from Content-Length; None if unknown (chunked)
+        self._remaining = remaining
+        self._drain_threshold = drain_threshold
+        self.release: str | None = None
+        # Algorithm of the checksum being verified, or None if unverified
+        self.checksum_algorithm: str | None = None
+        self._expected_checksum: str | None = None
+        self._hasher = None
+        if checksum is not None:
+            self.checksum_algorithm, self._expected_checksum = checksum
+            self._hasher = _new_hasher(self.checksum_algorithm)
+
+    def read(self, size: int | None = -1) -> bytes:
         buf = self._response.read(size)
-        if not buf:
-            self._exhausted = True
+        if self._remaining is not None:
+            self._remaining -= len(buf)
+        if self._hasher is not None:
+            self._hasher.update(buf)
+        # read(0) returns b'' without reaching the end of the body
+        if size is None or size < 0 or (not buf and size > 0):
+            self._finish()
         return buf
 
+    def readinto(self, buffer) -> int:
+        """
+        Read up to len(buffer) bytes into buffer (a bytearray or writable memoryview).
+
+        Returns:
+            Number of bytes read; 0 once the body is exhausted
+        """
+        n = self._response.readinto(buffer)
+        if self._remaining is not None:
+            self._remaining -= n
+        if self._hasher is not None:
+            self._hasher.update(memoryview(buffer)[:n])
+        if n == 0 and len(buffer) > 0:
+            self._finish()
+        return n
+
+    def _finish(self) -> None:
+        self._exhausted = True
+        if self._hasher is not None:
+            hasher, self._hasher = self._hasher, None
+            _check_digest(cast(str, self.checksum_algorithm), cast(str, self._expected_checksum), hasher.digest())
+
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if not self._exhausted:
+        if self._exhausted:
+            self.release = 'exhausted'
+        elif self._drain():
+            self.release = 'drained'
+        else:
             # Not fully consumed — close to avoid draining a potentially large body.
             # The connection will reconnect on the next request.
+            self.release = 'closed'
             self._response.close()
         if self._on_close:
             self._on_close()
         return False
 
+    def _drain(self) -> bool:
+        """Discard a small unread remainder. Returns True if the body was fully read."""
+        if self._remaining is None or self._remaining > self._drain_threshold:
+            return False
+        try:
+            while self._remaining > 0:
+                n = len(self._response.read(min(self._remaining, _DRAIN_CHUNK_SIZE)))
+                if n == 0:
+                    return False
+                self._remaining -= n
+        except (OSError, HTTPException):
+            return False
+        self._exhausted = True
+        return True
+
 
 class Connection:
     """
@@ -140,7 +267,10 @@ class Connection:
         port: int | None = None,
         conn_timeout: float | None = None,
         region: str | None = None,
-        use_ssl: bool = True
+        use_ssl: bool = True,
+        signing_key_cache: SigningKeyCache | None = None,
+        object_cache: MemoryCache | None = None,
+        drain_threshold: int = DEFAULT_DRAIN_THRESHOLD,
     ):
         """
         Initialize a new S3 connection.
@@ -153,6 +283,14 @@ class Connection:
             conn_timeout: Connection timeout in seconds (optional, default 10)
             region: AWS region (optional)
             use_ssl: Use HTTPS if True (default), HTTP if False
+            signing_key_cache: SigV4 signing key cache (optional). Defaults to
+                               a process-wide cache shared by all connections.
+            object_cache: MemoryCache of small object bodies (optional). Populated
+                          by get_object2 and put_object2, invalidated by writes
+                          and deletes made through this connection.
+            drain_threshold: Largest unread remainder, in bytes, that a stream
+                             from get_object2 reads and discards on exit to keep
+                             the connection alive rather than closing it.
         """
         assert isinstance(secret, bytes)
         self.access_id = access_id
@@ -171,10 +309,18 @@ class Connection:
         self._bucket_regions: dict[str, str] = {}
         # Track socket identity even after socket closes
         self._socket_identity: Optional[str] = None  # Will be set to "fd=X local_port=Y" when connected
+        # Derived signing keys only change per day/region, so share them across requests
+        if signing_key_cache is None:
+            signing_key_cache = DEFAULT_SIGNING_KEY_CACHE
+        self.signing_key_cache = signing_key_cache
+        self.object_cache = object_cache
+        self.drain_threshold = drain_threshold
         # Statistics counters for monitoring performance
         self._connects = 0    # Number of TCP connections established
         self._requests = 0    # Number of HTTP requests made
         self._redirects = 0   # Number of S3 redirects (301/307) encountered
+        self._drained = 0     # Streams whose small unread remainder was drained
+        self._closed = 0      # Streams closed with data unread (forcing a reconnect)
 
     def __enter__(self):
         """Activate the connection for use. Must be called before making requests."""
@@ -212,11 +358,17 @@ class Connection:
                 - connects: Number of TCP connections established
                 - requests: Number of HTTP requests made
                 - redirects: Number of S3 redirects (301/307) encountered
+                - drained: Streams exited early whose unread remainder was
+                  under drain_threshold and was drained, keeping the connection
+                - closed: Streams exited early with more than drain_threshold
+                  unread, closing the connection
         """
         return {
             'connects': self._connects,
             'requests': self._requests,
             'redirects': self._redirects,
+            'drained': self._drained,
+            'closed': self._closed,
         }
 
     def is_ready(self) -> bool:
@@ -250,22 +402,172 @@ class Connection:
             bucket: str,
             start: str | None = None,
             prefix: str | None = None,
-            batch_size: int | None = None):
-        """List contents of individual bucket returning dict of all attributes."""
+            batch_size: int | None = None,
+            stream: bool = False,
+            prefetch: int = 0):
+        """
+        List contents of individual bucket returning dict of all attributes.
+
+        Each page is parsed incrementally as it is read. By default a page's
+        objects are yielded once the whole page has arrived, so the connection
+        is free for other requests while the caller works through them. With
+        stream=True every object is yielded as soon as it is parsed; the
+        connection is then busy until the generator moves past the page, and
+        other requests on it raise ConnectionLifecycleError.
+
+        With prefetch=N, pages are fetched by a background thread on a
+        connection of its own, up to N pages ahead of the caller, so listing
+        latency overlaps with the caller's work. This connection stays free.
+        stream is ignored in this mode.
+        """
+        yield from self._list(bucket, start, prefix, batch_size, stream, prefetch, records=False)
+
+    def list_objects(
+            self,
+            bucket: str,
+            start: str | None = None,
+            prefix: str | None = None,
+            batch_size: int | None = None,
+            stream: bool = False,
+            prefetch: int = 0) -> Generator[ObjectInfo, None, None]:
+        """
+        List contents of individual bucket as ObjectInfo records.
+
+        Like list_bucket2, with the same stream and prefetch options, but each
+        object is a slotted ObjectInfo with an int size and a lazily parsed
+        timestamp instead of a dict of strings.
+        """
+        yield from self._list(bucket, start, prefix, batch_size, stream, prefetch, records=True)
+
+    def list_columns(
+            self,
+            bucket: str,
+            start: str | None = None,
+            prefix: str | None = None,
+            batch_size: int | None = None,
+            prefetch: int = 0) -> Generator[ObjectColumns, None, None]:
+        """
+        List contents of individual bucket as column batches.
+
+        Yields one ObjectColumns per batch_size objects (1000 by default,
+        one full page), holding keys, sizes, modification times, ETags and
+        storage classes column by column.
+        """
+        objects = self._list(bucket, start, prefix, batch_size, False, prefetch, records=True)
+        for batch in batchify(batch_size or 1000, objects):
+            yield ObjectColumns.from_objects(batch)
+
+    def _list(self, bucket, start, prefix, batch_size, stream, prefetch, records):
+        """Listing loop shared by list_bucket2 and list_objects."""
+        if prefetch > 0:
+            yield from self._list_prefetched(bucket, start, prefix, batch_size, prefetch, records)
+            return
         continuation_token = None
         more = True
         while more:
-            xml = self._s3_list_request(
-                bucket, continuation_token, start, prefix, batch_size
-            )
-            objects, next_token = _parse_list_response(xml)
-            yield from objects
+            parser = _ListResponseParser(records)
+            objects = self._s3_list_stream(parser, bucket, continuation_token, start, prefix, batch_size)
+            if stream:
+                yield from objects
+            else:
+                yield from list(objects)
             # For v2 API, use continuation token from response (not last key)
-            continuation_token = next_token
-            more = next_token is not None
+            continuation_token = parser.next_token
+            more = continuation_token is not None
             # After first request, start parameter is no longer used (v2 uses continuation token)
             start = None
 
+    def _list_prefetched(self, bucket, start, prefix, batch_size, prefetch, records):
+        """list_bucket2 with pages fetched ahead on a background thread and its own connection."""
+        pages: queue.Queue = queue.Queue(maxsize=prefetch)
+        stopped = threading.Event()
+
+        def put(item) -> bool:
+            # Block while the queue is full, but give up once the caller has gone
+            while not stopped.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def fetch_pages():
+            try:
+                with self._clone() as conn:
+                    token = None
+                    after = start
+                    while not stopped.is_set():
+                        parser = _ListResponseParser(records)
+                        objects = list(conn._s3_list_stream(parser, bucket, token, after, prefix, batch_size))
+                        token, after = parser.next_token, None
+                        if not put(objects) or token is None:
+                            break
+                put(None)
+            except BaseException as e:
+                put(e)
+
+        thread = threading.Thread(target=fetch_pages, name="s3lib-list-prefetch", daemon=True)
+        thread.start()
+        try:
+            while True:
+                page = pages.get()
+                if page is None:
+                    return
+                if isinstance(page, BaseException):
+                    raise page
+                yield from page
+        finally:
+            stopped.set()
+            thread.join()
+
+    def _clone(self) -> 'Connection':
+        """A new, unentered Connection with this one's configuration and known bucket regions."""
+        clone = Connection(
+            self.access_id,
+            self.secret,
+            self.host,
+            self.port,
+            self.conn_timeout,
+            region=self.region,
+            use_ssl=self.use_ssl,
+            signing_key_cache=self.signing_key_cache,
+            drain_threshold=self.drain_threshold,
+        )
+        clone._bucket_regions = dict(self._bucket_regions)
+        return clone
+
+    def list_bucket_page(
+            self,
+            bucket: str,
+            continuation_token: str | None = None,
+            start: str | None = None,
+            prefix: str | None = None,
+            batch_size: int | None = None,
+            delimiter: str | None = None,
+    ) -> Tuple[list[dict[str, str | None]], list[str], str | None]:
+        """
+        Fetch one page of a bucket listing.
+
+        Args:
+            bucket: S3 bucket name
+            continuation_token: next_token from the previous page, or None
+                                for the first page
+            start: List keys after this one (first page only)
+            prefix: Only list keys starting with prefix
+            batch_size: Most keys (plus common prefixes) per page
+            delimiter: Roll keys up into common prefixes at the first
+                       delimiter after prefix, e.g. "/" for one directory
+                       level
+
+        Returns:
+            (objects, common_prefixes, next_token) — objects are dicts as
+            yielded by list_bucket2; next_token is None on the last page.
+        """
+        parser = _ListResponseParser()
+        objects = list(self._s3_list_stream(parser, bucket, continuation_token, start, prefix, batch_size, delimiter))
+        return (objects, parser.prefixes, parser.next_token)
+
     def list_bucket(
             self,
             bucket: str,
@@ -357,6 +659,7 @@ class Connection:
             if_match: str | None = None,
             if_none_match: str | None = None,
             byte_range: Tuple[int | None, int | None] | None = None,
+            verify: bool = False,
     ) -> Tuple['S3ByteStream', dict[str, str]] | Tuple[None, dict[str, str]]:
         """
         Fetch an S3 object, returning a stream and headers.
@@ -374,6 +677,13 @@ class Connection:
                            returns (None, headers) with the server's 304 response
             byte_range: (start, end) byte positions, inclusive, 0-based. Either
                         can be None for "from start" or "to end".
+            verify: Hash the body while it is read and raise ChecksumMismatch
+                    when the stream is exhausted if it does not match the
+                    x-amz-checksum-* header (SHA256 > SHA1 > MD5). Objects
+                    without a full-object checksum, and byte ranges, are
+                    streamed unverified; check stream.checksum_algorithm.
+                    Verified reads bypass object_cache, neither served from
+                    nor stored in it.
 
         Returns:
             (S3ByteStream, headers) — data is available. Caller MUST always use
@@ -386,6 +696,8 @@ class Connection:
 
         Raises:
             ValueError: On any unexpected HTTP response status
+            ChecksumMismatch: From the stream's final read, when verify=True
+                              and the body does not match its checksum
 
         Examples:
             # Basic streaming download — always use as context manager
@@ -414,7 +726,27 @@ class Connection:
             stream, headers = conn.get_object2(bucket, key, byte_range=(0, 1023))
             with stream:
                 header_bytes = stream.read()
+
+            # One-pass verified download
+            stream, headers = conn.get_object2(bucket, key, verify=True)
+            with stream, open(path, 'wb') as f:
+                while chunk := stream.read(65536):
+                    f.write(chunk)  # ChecksumMismatch raised by the last read
         """
+        cache = self.object_cache
+        cached = None
+        # Cached entries carry no checksum to verify against, so verified reads go to S3
+        if cache is not None and if_match is None and if_none_match is None and byte_range is None and not verify:
+            cached, fresh = cache.get(bucket, key)
+            if cached is not None and fresh:
+                return (_cached_stream(cached), cached.headers)
+            if cached is not None:
+                # Stale: revalidate
+                if_none_match = cached.etag
+            read_token = cache.read_token()
+        else:
+            cache = None
+
         response, resp_headers = self._s3_get_request(
             bucket, key,
             if_match=if_match,
@@ -422,12 +754,107 @@ class Connection:
             byte_range=byte_range,
         )
         if response is None:
+            if cache is not None and cached is not None:
+                # 304 Not Modified for our revalidation
+                cache.revalidated(bucket, key, cached)
+                return (_cached_stream(cached), cached.headers)
             return (None, resp_headers)
 
         def _on_close():
             self._outstanding_response = None
+            if stream.release == 'drained':
+                self._drained += 1
+            elif stream.release == 'closed':
+                self._closed += 1
+
+        checksum = None
+        if verify and byte_range is None:
+            # Ranges carry no checksum of their own bytes
+            algorithm, expected = _expected_checksum(resp_headers)
+            if algorithm is not None and expected is not None:
+                checksum = (algorithm, expected)
+
+        lowered = lower_headers(resp_headers)
+        length = lowered.get('content-length')
+        stream = S3ByteStream(response, on_close=_on_close, checksum=checksum,
+                              remaining=int(length) if length is not None else None,
+                              drain_threshold=self.drain_threshold)
+        if cache is not None:
+            if cache.cacheable(int(lowered.get('content-length', -1))):
+                # Small enough to cache: read it now, which also frees the connection.
+                with stream:
+                    body = stream.read()
+                cache.put(bucket, key, body, resp_headers, lowered.get('etag', '').strip('"'),
+                          read_token=read_token)
+                return (S3ByteStream(BytesIO(body)), resp_headers)
+            cache.invalidate(bucket, key)
+        return (stream, resp_headers)
+
+    def get_object_into(
+            self,
+            bucket: str,
+            key: str,
+            buffer: bytearray | memoryview | None = None,
+            if_match: str | None = None,
+            if_none_match: str | None = None,
+            byte_range: Tuple[int | None, int | None] | None = None,
+            verify: bool = False,
+    ) -> Tuple[memoryview, dict[str, str]] | Tuple[None, dict[str, str]]:
+        """
+        Fetch an S3 object directly into a buffer.
 
-        return (S3ByteStream(response, on_close=_on_close), resp_headers)
+        The body is read with readinto(), so it is copied once, from the socket
+        into the buffer. Reusing one buffer across calls avoids allocating a new
+        object per download.
+
+        Args:
+            bucket: S3 bucket name
+            key: Object key
+            buffer: bytearray or writable memoryview to fill. Must hold at least
+                    Content-Length bytes. When None, a bytearray of exactly
+                    Content-Length bytes is allocated.
+            if_match: ETag (without quotes), as for get_object2()
+            if_none_match: ETag (without quotes), as for get_object2()
+            byte_range: (start, end) byte positions, as for get_object2()
+            verify: Verify the body's checksum, as for get_object2()
+
+        Returns:
+            (memoryview, headers) — view of the filled prefix of the buffer
+            (None, headers) — no body (304 or 412), as for get_object2()
+
+        Raises:
+            ValueError: If buffer is smaller than Content-Length, or the body
+                        ends before Content-Length bytes; on any unexpected
+                        HTTP response status
+            ChecksumMismatch: When verify=True and the body does not match
+
+        Example:
+            buf = bytearray(8 * 1024 * 1024)
+            for key in keys:
+                data, headers = conn.get_object_into(bucket, key, buf)
+                process(data)
+        """
+        stream, resp_headers = self.get_object2(
+            bucket, key, if_match=if_match, if_none_match=if_none_match, byte_range=byte_range, verify=verify)
+        if stream is None:
+            return (None, resp_headers)
+        with stream:
+            length = int(lower_headers(resp_headers)['content-length'])
+            if buffer is None:
+                buffer = bytearray(length)
+            view = memoryview(buffer).cast('B')
+            if len(view) < length:
+                raise ValueError(f"Buffer of {len(view)} bytes is too small for {length} byte object {key}")
+            filled = 0
+            while filled < length:
+                n = stream.readinto(view[filled:length])
+                if n == 0:
+                    raise ValueError(f"Body of {key} ended after {filled} of {length} bytes")
+                filled += n
+            # Reach EOF so the connection stays reusable.
+            if stream.read(1):
+                raise ValueError(f"Body of {key} is longer than its Content-Length {length}")
+        return (view[:length], resp_headers)
 
     def get_object_url(self, bucket: str, key: str, proto="https") -> str:
         """get a public url for the object in the bucket."""
@@ -441,12 +868,15 @@ class Connection:
 
     def delete_object(self, bucket: str, key: str) -> Tuple[int, dict[str, str]]:
         """delete key from bucket"""
+        self._invalidate_cached(bucket, key)
         status, headers = self._s3_delete_request(bucket, key)
         return (status, headers)
 
     def delete_objects(self, bucket: str, keys: Iterable[str], batch_size=1000, quiet=False):
         """delete keys from bucket"""
         for batch in batchify(batch_size, keys):
+            for key in batch:
+                self._invalidate_cached(bucket, key)
             xml = self._s3_delete_bulk_request(bucket, batch, quiet)
             results = _parse_delete_bulk_response(xml)
             for key, result in results:
@@ -464,6 +894,7 @@ class Connection:
             headers = dict()
         else:
             headers = dict(headers)
+        self._invalidate_cached(dst_bucket, dst_key)
         (status, resp_headers) = self._s3_copy_request(
             src_bucket, src_key, dst_bucket, dst_key, headers
         )
@@ -480,6 +911,7 @@ class Connection:
         checksum_algorithm: str | None = None,
         if_none_match: bool = False,
         if_match: str | None = None,
+        signed_chunk_size: int | None = None,
     ):
         """
         Push object from local to bucket with optional integrity and conditional checks.
@@ -497,6 +929,12 @@ class Connection:
             if_none_match: If True, upload only succeeds if object doesn't exist (create-only).
             if_match: ETag string (without quotes) for optimistic concurrency control.
                       Example: 'abc123def456'
+            signed_chunk_size: For file-like data, upload as aws-chunked with each chunk
+                               of this many bytes signed as it streams
+                               (STREAMING-AWS4-HMAC-SHA256-PAYLOAD) instead of sending
+                               UNSIGNED-PAYLOAD. Pipes are spooled to a temporary file
+                               to learn their length. Ignored for str/bytes data, whose
+                               payload hash is always signed.
 
         Returns:
             (status, headers) tuple
@@ -526,7 +964,12 @@ class Connection:
             headers_resp = conn.head_object(bucket, key)
             etag = dict(headers_resp)['etag'].strip('"')  # Remove quotes
             conn.put_object(bucket, key, new_data, if_match=etag)
+
+            # Signed streaming upload of a large file, 64 KiB per signed chunk
+            with open(path, 'rb') as f:
+                conn.put_object(bucket, key, f, signed_chunk_size=65536)
         """
+        self._invalidate_cached(bucket, key)
         return self._s3_put_request(
             bucket, key, data,
             sha256_hint=sha256_hint,
@@ -534,6 +977,7 @@ class Connection:
             if_none_match=if_none_match,
             if_match=if_match,
             extra_headers=headers,
+            signed_chunk_size=signed_chunk_size,
         )
 
     def put_object2(
@@ -545,6 +989,7 @@ class Connection:
         checksum_algorithm: str | None = None,
         if_none_match: bool = False,
         if_match: str | None = None,
+        signed_chunk_size: int | None = None,
     ) -> 'PutResult | None':
         """
         Upload an object, returning a PutResult with fields useful for consistency checks.
@@ -562,6 +1007,8 @@ class Connection:
                                 for str/bytes data.
             if_none_match: If True, only upload if object does not already exist
             if_match: ETag (without quotes) — only upload if current ETag matches
+            signed_chunk_size: For file-like data, sign each chunk of this many bytes
+                               as it streams (aws-chunked) instead of UNSIGNED-PAYLOAD
 
         Returns:
             PutResult with:
@@ -596,6 +1043,7 @@ class Connection:
             if result is None:
                 pass  # conflict, retry with fresh ETag
         """
+        self._invalidate_cached(bucket, key)
         try:
             _, resp_headers = self._s3_put_request(
                 bucket, key, data,
@@ -603,27 +1051,145 @@ class Connection:
                 checksum_algorithm=checksum_algorithm,
                 if_none_match=if_none_match,
                 if_match=if_match,
+                signed_chunk_size=signed_chunk_size,
             )
         except PreconditionFailed:
             return None
-        h = dict(resp_headers)
+        result = _put_result(resp_headers)
+        if self.object_cache is not None and isinstance(data, (str, bytes)):
+            # Write through: the uploaded bytes are the object's new content
+            body = data.encode('utf-8') if isinstance(data, str) else data
+            self.object_cache.put(bucket, key, body, {'ETag': f'"{result["etag"]}"', 'Content-Length': str(len(body))},
+                                  result['etag'])
+        return result
+
+    def create_multipart_upload(
+        self,
+        bucket: str,
+        key: str,
+        headers: dict[str, str] | None = None,
+        checksum_algorithm: str | None = "SHA256",
+    ) -> str:
+        """
+        Start a multipart upload (CreateMultipartUpload).
 
-        # Strip surrounding quotes S3 wraps ETags in
-        etag = h.get('etag', '').strip('"')
+        Args:
+            bucket: S3 bucket name
+            key: Object key
+            headers: Optional dict of additional headers (Content-Type, metadata, ...)
+            checksum_algorithm: 'SHA256', 'SHA1', or None. Every part must then be
+                                uploaded with the same algorithm.
 
-        # checksum confirmation — S3 echoes back whichever algorithm was used
-        checksum = (
-            h.get('x-amz-checksum-sha256') or
-            h.get('x-amz-checksum-sha1') or
-            h.get('x-amz-checksum-md5')
-        )
+        Returns:
+            The upload ID to pass to upload_part, complete_multipart_upload and
+            abort_multipart_upload.
+        """
+        request_headers: dict[str, str] = dict(headers) if headers else {}
+        if checksum_algorithm:
+            _check_multipart_algorithm(checksum_algorithm)
+            request_headers["x-amz-checksum-algorithm"] = checksum_algorithm
+        xml = self._s3_multipart_request("POST", bucket, key, {"uploads": None}, request_headers, "")
+        return _parse_create_multipart_response(xml)
 
-        return PutResult(
+    def upload_part(
+        self,
+        bucket: str,
+        key: str,
+        upload_id: str,
+        part_number: int,
+        data,
+        checksum_algorithm: str | None = "SHA256",
+    ) -> PartResult:
+        """
+        Upload one part of a multipart upload (UploadPart).
+
+        The part is hashed once; the SHA256 digest signs the payload and, with
+        checksum_algorithm set, the part checksum is sent for S3 to verify.
+
+        Args:
+            bucket: S3 bucket name
+            key: Object key
+            upload_id: ID returned by create_multipart_upload
+            part_number: 1-based part number, at most 10000
+            data: bytes, or a seekable file-like object positioned at the part start
+                  (e.g. multipart.FileSlice). File-like data is read twice: once to
+                  hash, once to send.
+            checksum_algorithm: Must match the algorithm given to create_multipart_upload
+
+        Returns:
+            PartResult for complete_multipart_upload
+        """
+        algorithms = ["SHA256"]
+        if checksum_algorithm:
+            _check_multipart_algorithm(checksum_algorithm)
+            if checksum_algorithm not in algorithms:
+                algorithms.append(checksum_algorithm)
+        digests, content_length = _digest_part(data, algorithms)
+
+        headers = {"content-length": str(content_length)}
+        checksum = None
+        if checksum_algorithm:
+            checksum = b2a_base64(digests[checksum_algorithm]).strip().decode("ascii")
+            headers[f"x-amz-checksum-{checksum_algorithm.lower()}"] = checksum
+
+        args = {"partNumber": str(part_number), "uploadId": upload_id}
+        resp = self._s3_request("PUT", bucket, key, args, headers, data, sha256_hint=digests["SHA256"])
+        if resp.status != OK:
+            raise_http_resp_error(resp)
+        resp.read()  # NOTE: Should be zero length response. Required to reset the connection.
+        self._outstanding_response = None  # Response consumed
+        etag = (resp.getheader("etag") or "").strip('"')
+        return PartResult(
+            part_number=part_number,
             etag=etag,
-            version_id=h.get('x-amz-version-id'),
             checksum=checksum,
+            checksum_algorithm=checksum_algorithm if checksum else None,
         )
 
+    def complete_multipart_upload(
+        self,
+        bucket: str,
+        key: str,
+        upload_id: str,
+        parts: Iterable[PartResult],
+    ) -> MultipartPutResult:
+        """
+        Assemble uploaded parts into the final object (CompleteMultipartUpload).
+
+        Args:
+            bucket: S3 bucket name
+            key: Object key
+            upload_id: ID returned by create_multipart_upload
+            parts: PartResults from upload_part, in any order
+
+        Returns:
+            MultipartPutResult for the assembled object. Its checksum, when
+            present, is the composite checksum-of-checksums S3 reports
+            (suffixed with -<parts>).
+
+        Raises:
+            ValueError: If S3 rejects the upload, including errors S3 reports in
+                        the body of a 200 response
+        """
+        content = _render_complete_multipart_content(sorted(parts, key=lambda p: p["part_number"]))
+        self._invalidate_cached(bucket, key)
+        resp = self._s3_request("POST", bucket, key, {"uploadId": upload_id}, {}, content)
+        if resp.status != OK:
+            raise_http_resp_error(resp)
+        xml = resp.read()
+        self._outstanding_response = None  # Response consumed
+        result = _parse_complete_multipart_response(xml)
+        return MultipartPutResult(etag=result["etag"], version_id=resp.getheader("x-amz-version-id"),
+                                  checksum=result["checksum"], status=resp.status)
+
+    def abort_multipart_upload(self, bucket: str, key: str, upload_id: str) -> None:
+        """Abort a multipart upload and free its stored parts (AbortMultipartUpload)."""
+        resp = self._s3_request("DELETE", bucket, key, {"uploadId": upload_id}, {}, "")
+        if resp.status != NO_CONTENT:
+            raise_http_resp_error(resp)
+        resp.read()  # NOTE: Should be zero size response. Required to reset the connection
+        self._outstanding_response = None  # Response consumed
+
     ##########################
     # Http request Functions #
     ##########################
@@ -643,8 +1209,14 @@ class Connection:
         start_after: str | None = None,
         prefix: str | None = None,
         max_keys: int | None = None,
-    ) -> str:
-        """List bucket using ListObjectsV2 API."""
+        delimiter: str | None = None,
+    ) -> HTTPResponse:
+        """
+        List bucket using ListObjectsV2 API, returning the response unread.
+
+        With a delimiter, keys sharing the part of their name up to the next
+        delimiter after prefix are rolled up into one CommonPrefixes entry.
+        """
         args = {}
         # v2 API requires list-type=2
         args["list-type"] = "2"
@@ -660,18 +1232,62 @@ class Connection:
             args["prefix"] = prefix
         if max_keys:
             args["max-keys"] = str(max_keys)
+        if delimiter:
+            args["delimiter"] = delimiter
+
+        resp = self._s3_request("GET", bucket, None, args, {}, "")
+        if resp.status != OK:
+            raise_http_resp_error(resp)
+        return resp
+
+    def _s3_list_stream(
+        self,
+        parser: '_ListResponseParser',
+        bucket: str,
+        continuation_token: str | None = None,
+        start_after: str | None = None,
+        prefix: str | None = None,
+        max_keys: int | None = None,
+        delimiter: str | None = None,
+    ) -> Generator[dict[str, str | None], None, None]:
+        """
+        Yield the objects of one ListObjectsV2 page as they are parsed.
 
+        The body is read and parsed in LIST_READ_CHUNK_SIZE chunks; common
+        prefixes and the next continuation token are left on parser. A read
+        that fails mid-page is retried by requesting the page again and
+        skipping the objects already yielded.
+        """
+        yielded = 0
         for _read_attempt in range(3):
-            resp = self._s3_request("GET", bucket, None, args, {}, "")
-            if resp.status != OK:
-                raise_http_resp_error(resp)
+            parser.reset()
+            resp = self._s3_list_request(bucket, continuation_token, start_after, prefix, max_keys, delimiter)
+            skip = yielded
+            complete = False
             try:
-                data = resp.read()
-            except (ssl.SSLError, RemoteDisconnected, EOFError, ConnectionResetError, TimeoutError):
-                self._disconnect()
-                continue
-            self._outstanding_response = None  # Response consumed
-            return data
+                while not complete:
+                    try:
+                        chunk = resp.read(LIST_READ_CHUNK_SIZE)
+                    except (ssl.SSLError, RemoteDisconnected, EOFError, ConnectionResetError, TimeoutError):
+                        break
+                    if chunk:
+                        objects = parser.feed(chunk)
+                    else:
+                        objects = parser.close()
+                        complete = True
+                        self._outstanding_response = None  # Response consumed
+                    for obj in objects:
+                        if skip:
+                            skip -= 1
+                            continue
+                        yielded += 1
+                        yield obj
+            finally:
+                if not complete:
+                    # Failed or abandoned mid-page; the rest of the body is unwanted
+                    self._disconnect()
+            if complete:
+                return
         raise ConnectionError("Failed to read list response after retries")
 
     def _s3_get_request(
@@ -757,6 +1373,18 @@ class Connection:
         self._outstanding_response = None  # Response consumed
         return results
 
+    def _invalidate_cached(self, bucket: str, key: str) -> None:
+        if self.object_cache is not None:
+            self.object_cache.invalidate(bucket, key)
+
+    def _s3_multipart_request(self, method, bucket, key, args, headers, content):
+        resp = self._s3_request(method, bucket, key, args, headers, content)
+        if resp.status != OK:
+            raise_http_resp_error(resp)
+        results = resp.read()
+        self._outstanding_response = None  # Response consumed
+        return results
+
     def _s3_copy_request(self, src_bucket, src_key, dst_bucket, dst_key, headers):
         headers["x-amz-copy-source"] = "/%s/%s" % (src_bucket, src_key)
         headers["x-amz-metadata-directive"] = "REPLACE"
@@ -778,6 +1406,7 @@ class Connection:
         if_match: str | None = None,
         extra_headers: dict[str, str] | None = None,
         md5_hint=None,
+        signed_chunk_size: int | None = None,
     ) -> Tuple[int, list]:
         """
         Execute a PUT request against S3, handling all header construction and
@@ -788,7 +1417,11 @@ class Connection:
 
         Raises:
             ValueError: If checksum calculation requested but not possible for streaming data
+            ValueError: If signed_chunk_size is below the S3 minimum chunk size
         """
+        if signed_chunk_size is not None and signed_chunk_size < MIN_SIGNED_CHUNK_SIZE:
+            raise ValueError(f"signed_chunk_size must be at least {MIN_SIGNED_CHUNK_SIZE} bytes")
+
         headers: dict[str, str] = dict(extra_headers) if extra_headers else {}
 
         # Determine which checksum algorithm to use.
@@ -830,9 +1463,10 @@ class Connection:
             headers["If-Match"] = f'"{if_match}"'
 
         # Determine content-length
+        spooled = None
         if isinstance(data, (str, bytes)):
             content_length = len(data)
-        elif hasattr(data, "seek") and hasattr(data, "tell"):
+        elif hasattr(data, "seek") and hasattr(data, "tell") and _is_seekable(data):
             # Seekable stream (e.g. BytesIO, open file) — measure without reading
             pos = data.tell()
             data.seek(0, 2)  # seek to end
@@ -844,6 +1478,12 @@ class Connection:
                 filestat = fstat(fileno)
                 if S_ISREG(filestat.st_mode):
                     content_length = filestat[ST_SIZE]
+                elif signed_chunk_size is not None:
+                    # Special file (e.g. stdin/pipe) — spool to disk to learn the length
+                    # while holding only one chunk in memory.
+                    data = spooled = _spool_to_tempfile(data, signed_chunk_size)
+                    content_length = data.tell()
+                    data.seek(0)
                 else:
                     # Special file (e.g. stdin/pipe) — read into buffer to get length.
                     # TODO we are reading the ENTIRE STREAM we should not do that.
@@ -859,11 +1499,16 @@ class Connection:
             raise TypeError(f"Cannot determine content-length of type {type(data)}")
         headers["content-length"] = str(content_length)
 
-        resp = self._s3_request(
-            "PUT", bucket, key, {}, headers, data,
-            sha256_hint=sha256_hint,
-            md5_hint=md5_hint,
-        )
+        try:
+            resp = self._s3_request(
+                "PUT", bucket, key, {}, headers, data,
+                sha256_hint=sha256_hint,
+                md5_hint=md5_hint,
+                signed_chunk_size=signed_chunk_size,
+            )
+        finally:
+            if spooled is not None:
+                spooled.close()
         if resp.status == 412:
             resp.read()  # consume response body before raising
             self._outstanding_response = None
@@ -886,6 +1531,7 @@ class Connection:
         content,
         sha256_hint=None,
         md5_hint=None,
+        signed_chunk_size=None,
     ):
         """
         Make an S3 request using AWS Signature Version 4.
@@ -901,6 +1547,7 @@ class Connection:
             content: Request body (str, bytes, or file-like object)
             sha256_hint: Pre-calculated SHA256 digest (bytes) to skip recalculation
             md5_hint: Pre-calculated MD5 digest (bytes) to skip recalculation
+            signed_chunk_size: Sign file-like content in aws-chunked chunks of this size
         """
 
         # Validate that previous response was consumed before making a new request
@@ -930,6 +1577,7 @@ class Connection:
                         content,
                         sha256_hint=sha256_hint,
                         md5_hint=md5_hint,
+                        signed_chunk_size=signed_chunk_size,
                     )
                     break  # Success, exit retry loop
                 except (ConnectionResetError, BrokenPipeError, ConnectionAbortedError, ValueError,
@@ -983,6 +1631,7 @@ class Connection:
         content,
         sha256_hint=None,
         md5_hint=None,
+        signed_chunk_size=None,
     ):
         """
         Inner request method that performs a single S3 request.
@@ -999,6 +1648,9 @@ class Connection:
                          Converts to hex for x-amz-content-sha256 header (signature).
             md5_hint: Pre-calculated MD5 digest as bytes (16 bytes) to skip recalculation.
                       Converts to base64 for Content-MD5 header.
+            signed_chunk_size: If set and content is file-like, send content as an
+                               aws-chunked body whose chunks are signed as they stream.
+                               headers must carry the decoded content-length.
         """
         # Build the URI path and host for the request
         # Use regional endpoints for non us-east-1 to avoid redirects
@@ -1043,7 +1695,15 @@ class Connection:
             query_string = ""
 
         # Calculate payload hash for SigV4
-        if sha256_hint is not None:
+        chunked = signed_chunk_size is not None and not isinstance(content, (str, bytes))
+        if chunked:
+            # Each chunk carries its own signature, chained from the request signature
+            payload_hash = STREAMING_PAYLOAD
+            decoded_length = int(headers["content-length"])
+            headers["content-encoding"] = "aws-chunked"
+            headers["x-amz-decoded-content-length"] = str(decoded_length)
+            headers["content-length"] = str(aws_chunked_length(decoded_length, signed_chunk_size))
+        elif sha256_hint is not None:
             # Use provided pre-calculated digest (bytes)
             # Convert to hex for x-amz-content-sha256 header
             payload_hash = sha256_hint.hex()
@@ -1088,10 +1748,24 @@ class Connection:
             region=self.region,
             service="s3",
             timestamp=timestamp,
+            signing_key_cache=self.signing_key_cache,
         )
 
         headers["Authorization"] = authorization_header
 
+        body = content
+        if chunked:
+            date = timestamp[:8]
+            body = sign_chunks(
+                content,
+                decoded_length,
+                signed_chunk_size,
+                seed_signature=authorization_header.rsplit("Signature=", 1)[1],
+                signing_key=self.signing_key_cache.get(self.secret, date, self.region, "s3"),
+                timestamp=timestamp,
+                credential_scope=f"{date}/{self.region}/s3/aws4_request",
+            )
+
         if self.conn is None:
             raise RuntimeError("Attempted to make request without opening connection.")
 
@@ -1169,7 +1843,7 @@ class Connection:
                     pass  # If seek fails (non-seekable stream), proceed anyway
 
             request_call_start = time()
-            self.conn.request(method, resource, content, headers, encode_chunked=False)
+            self.conn.request(method, resource, body, headers, encode_chunked=False)
             self._requests += 1
             request_call_duration = time() - request_call_start
 
@@ -1334,6 +2008,11 @@ class Connection:
         self._server_requested_close = False  # Reset flag
 
 
+def _cached_stream(entry) -> S3ByteStream:
+    """Stream over a MemoryCache entry's body; there is no response to clean up."""
+    return S3ByteStream(BytesIO(entry.body))
+
+
 def sign(secret, string_to_sign):
     """
     secret is a str?
@@ -1344,6 +2023,85 @@ def sign(secret, string_to_sign):
     return b2a_base64(hashed.digest()).strip()
 
 
+def _put_result(resp_headers) -> PutResult:
+    """Extract the consistency-check fields from PUT response headers."""
+    h = dict(resp_headers)
+
+    # Strip surrounding quotes S3 wraps ETags in
+    etag = h.get('etag', '').strip('"')
+
+    # checksum confirmation — S3 echoes back whichever algorithm was used
+    checksum = (
+        h.get('x-amz-checksum-sha256') or
+        h.get('x-amz-checksum-sha1') or
+        h.get('x-amz-checksum-md5')
+    )
+
+    return PutResult(
+        etag=etag,
+        version_id=h.get('x-amz-version-id'),
+        checksum=checksum,
+    )
+
+
+# Checksums S3 accepts on multipart uploads (MD5 is only a Content-MD5 header there)
+MULTIPART_CHECKSUM_ALGORITHMS = ("SHA256", "SHA1")
+
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def _check_multipart_algorithm(algorithm):
+    if algorithm not in MULTIPART_CHECKSUM_ALGORITHMS:
+        raise ValueError(
+            f"Unsupported multipart checksum algorithm: {algorithm}. Use SHA256 or SHA1"
+        )
+
+
+def _digest_part(data, algorithms):
+    """
+    Hash a part with every algorithm in one pass.
+
+    Returns ({algorithm: digest bytes}, length). File-like data is read to the
+    end and then sought back to where it started.
+    """
+    from hashlib import sha256
+    constructors = {"SHA256": sha256, "SHA1": sha1}
+    hashers = {algorithm: constructors[algorithm]() for algorithm in algorithms}
+    if isinstance(data, (str, bytes)):
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        for hasher in hashers.values():
+            hasher.update(data)
+        length = len(data)
+    else:
+        start = data.tell()
+        length = 0
+        while buf := data.read(_HASH_BLOCK_SIZE):
+            for hasher in hashers.values():
+                hasher.update(buf)
+            length += len(buf)
+        data.seek(start)
+    return ({algorithm: hasher.digest() for algorithm, hasher in hashers.items()}, length)
+
+
+def _is_seekable(data):
+    """False for streams that expose seek() but cannot seek, like sys.stdin.buffer on a pipe."""
+    seekable = getattr(data, "seekable", None)
+    return seekable() if seekable is not None else True
+
+
+def _spool_to_tempfile(src, chunk_size):
+    """Copy a non-seekable stream into an anonymous temporary file, one chunk at a time."""
+    spool = TemporaryFile()
+    try:
+        while buf := src.read(chunk_size):
+            spool.write(buf)
+    except BaseException:
+        spool.close()
+        raise
+    return spool
+
+
 def sign_content_if_possible(content):
     # TODO if the content is a proper file, it would also be possible.
     if content != "" and isinstance(content, (str, bytes)):
@@ -1414,6 +2172,47 @@ def calculate_checksum_if_possible(content, algorithm):
     return ""
 
 
+def _expected_checksum(headers) -> Tuple[str | None, str | None]:
+    """
+    Pick the full-object checksum to verify from response headers.
+
+    Prefers SHA256 > SHA1 > MD5. Composite checksums of multipart objects
+    (suffixed with -<parts>) are checksums of part checksums, not of the
+    object bytes, so they are skipped.
+
+    Returns:
+        (algorithm, expected_base64) or (None, None)
+    """
+    headers = lower_headers(headers)
+    for algorithm in ('SHA256', 'SHA1', 'MD5'):
+        expected = headers.get('x-amz-checksum-' + algorithm.lower())
+        if expected and '-' not in expected:
+            return (algorithm, expected)
+    return (None, None)
+
+
+def _new_hasher(algorithm: str):
+    if algorithm == 'SHA256':
+        from hashlib import sha256
+        return sha256()
+    elif algorithm == 'SHA1':
+        return sha1()
+    elif algorithm == 'MD5':
+        return md5()
+    raise ValueError(f"Unsupported algorithm: {algorithm}. Use SHA256, SHA1, or MD5")
+
+
+def _check_digest(algorithm: str, expected_checksum: str, digest: bytes) -> None:
+    actual_checksum = b2a_base64(digest).strip().decode('ascii')
+    if actual_checksum != expected_checksum:
+        raise ChecksumMismatch(
+          f"Checksum verification failed!\n"
+          f"Algorithm: {algorithm}\n"
+          f"Expected:  {expected_checksum}\n"
+          f"Actual:    {actual_checksum}"
+        )
+
+
 def sha256_hex_to_base64(hex_string):
     """
     Convert hex-encoded SHA256 to base64-encoded.
@@ -1456,6 +2255,20 @@ def _render_delete_bulk_content(keys, quiet):
     return tostring(delete)
 
 
+def _render_complete_multipart_content(parts):
+    complete = Element("CompleteMultipartUpload")
+    for part in parts:
+        part_element = SubElement(complete, "Part")
+        number = SubElement(part_element, "PartNumber")
+        number.text = str(part["part_number"])
+        etag = SubElement(part_element, "ETag")
+        etag.text = f'"{part["etag"]}"'
+        if part["checksum"] and part["checksum_algorithm"]:
+            checksum = SubElement(part_element, f"Checksum{part['checksum_algorithm']}")
+            checksum.text = part["checksum"]
+    return tostring(complete)
+
+
 ####################################
 # Http Response Handling Functions #
 ####################################
@@ -1474,24 +2287,17 @@ LIST_BUCKET_CHECKSUM_ATTRIBUTES = [
 LIST_BUCKET_ALL_ATTRIBUTES = LIST_BUCKET_ATTRIBUTES + LIST_BUCKET_CHECKSUM_ATTRIBUTES
 
 
-def _parse_list_response(xml: str) -> Tuple[list[dict[str, str | None]], str | None]:
-    """Parse ListObjectsV2 response."""
-    ns = {"ListBucketResult": "http://s3.amazonaws.com/doc/2006-03-01/"}
-    ns_str = "{http://s3.amazonaws.com/doc/2006-03-01/}"
-    next_token_path = "ListBucketResult:NextContinuationToken"
-    contents_path = "ListBucketResult:Contents"
-    tree = parse(xml)
-
-    # v2 API returns NextContinuationToken when there are more results
-    next_token_elem = tree.find(next_token_path, ns)
-    next_token = next_token_elem.text if next_token_elem is not None else None
+def _parse_list_response(xml: str | bytes) -> Tuple[list[dict[str, str | None]], list[str], str | None]:
+    """
+    Parse ListObjectsV2 response.
 
-    contents = tree.findall(contents_path, ns)
-    items = [
-        {child.tag.replace(ns_str, ""): child.text for child in iter(obj)}
-        for obj in contents
-    ]
-    return (items, next_token)
+    Returns:
+        (objects, common_prefixes, next_token) — common_prefixes is empty
+        unless the request had a delimiter.
+    """
+    parser = _ListResponseParser()
+    objects = parser.feed(xml) + parser.close()
+    return (objects, parser.prefixes, parser.next_token)
 
 
 API_VERSION = "http://s3.amazonaws.com/doc/2006-03-01/"
@@ -1507,6 +2313,328 @@ def _parse_get_service_response(xml: str) -> list[str]:
 
 KEY_PATH = f"{{{API_VERSION}}}Key"
 
+# Bytes of a list response read and parsed at a time
+LIST_READ_CHUNK_SIZE = 64 * 1024
+
+_LIST_CONTENTS_TAG = f"{{{API_VERSION}}}Contents"
+_LIST_COMMON_PREFIXES_TAG = f"{{{API_VERSION}}}CommonPrefixes"
+_LIST_PREFIX_TAG = f"{{{API_VERSION}}}Prefix"
+_LIST_NEXT_TOKEN_TAG = f"{{{API_VERSION}}}NextContinuationToken"
+_NS_PREFIX = f"{{{API_VERSION}}}"
+_LIST_KEY_TAG = f"{{{API_VERSION}}}Key"
+_LIST_SIZE_TAG = f"{{{API_VERSION}}}Size"
+_LIST_ETAG_TAG = f"{{{API_VERSION}}}ETag"
+_LIST_LAST_MODIFIED_TAG = f"{{{API_VERSION}}}LastModified"
+_LIST_STORAGE_CLASS_TAG = f"{{{API_VERSION}}}StorageClass"
+_LIST_CHECKSUM_ALGORITHM_TAG = f"{{{API_VERSION}}}ChecksumAlgorithm"
+_LIST_CHECKSUM_TYPE_TAG = f"{{{API_VERSION}}}ChecksumType"
+
+
+class _TreeListParser:
+    """
+    Incremental ElementTree parser for ListObjectsV2 responses.
+
+    Fed the body in chunks, it returns each <Contents> entry as soon as its
+    closing tag has arrived and then drops the element from the tree, so
+    memory is bounded by one entry rather than by the whole page.
+    _ListResponseParser hands responses of unexpected shape to this parser.
+    """
+
+    def __init__(self, records: bool = False):
+        # Build ObjectInfo records rather than dicts
+        self._records = records
+        self.reset()
+
+    def reset(self) -> None:
+        """Start over, for a page requested again after a failed read."""
+        self._parser: XMLPullParser[Element] = XMLPullParser(events=("start", "end"))
+        self._root: Element | None = None
+        self.prefixes: list[str] = []
+        self.next_token: str | None = None
+
+    def feed(self, data: str | bytes) -> list:
+        """Parse the next chunk of the body, returning the objects it completed."""
+        self._parser.feed(data)
+        return self._read_events()
+
+    def close(self) -> list:
+        """Finish parsing, returning any objects not returned yet."""
+        self._parser.close()
+        return self._read_events()
+
+    def _read_events(self) -> list:
+        objects: list = []
+        # Only start and end events were requested, and those carry elements
+        events = cast(Iterable[Tuple[str, Element]], self._parser.read_events())
+        for (event, elem) in events:
+            if event == "start":
+                if self._root is None:
+                    self._root = elem
+                continue
+            if elem.tag == _LIST_CONTENTS_TAG:
+                if self._records:
+                    objects.append(_object_info(elem))
+                else:
+                    objects.append({child.tag.replace(_NS_PREFIX, ""): child.text for child in elem})
+            elif elem.tag == _LIST_COMMON_PREFIXES_TAG:
+                self.prefixes.append(str(elem.findtext(_LIST_PREFIX_TAG)))
+            elif elem.tag == _LIST_NEXT_TOKEN_TAG:
+                self.next_token = elem.text
+            else:
+                continue
+            if self._root is not None and elem is not self._root:
+                self._root.remove(elem)
+        return objects
+
+
+_LIST_ROOT_START = f'<ListBucketResult xmlns="{API_VERSION}">'.encode()
+_DELETE_ROOT_START = f'<DeleteResult xmlns="{API_VERSION}">'.encode()
+# A child element holding only text, e.g. <Size>1024</Size>
+_TEXT_ELEMENT = re.compile(r"<([A-Za-z]+)>([^<]*)</\1>")
+# A <Contents> entry in the layout S3 writes for objects uploaded without
+# checksums, with every value present and free of entities
+_STANDARD_CONTENTS = re.compile(
+    r"<Contents><Key>([^<&\r]+)</Key><LastModified>([^<&\r]+)</LastModified><ETag>([^<&\r]+)</ETag>"
+    r"<Size>([0-9]+)</Size><StorageClass>([^<&\r]+)</StorageClass></Contents>")
+# A DeleteObjects result entry, which S3 writes with the key first
+_DELETE_ENTRY = re.compile(r"<(Deleted|Error)><Key>([^<]*)</Key>")
+_XML_ENTITY = re.compile(r"&(#x[0-9a-fA-F]+|#[0-9]+|amp|lt|gt|quot|apos);")
+_XML_ENTITIES = {'amp': "&", 'lt': "<", 'gt': ">", 'quot': '"', 'apos': "'"}
+
+
+def _xml_unescape_entity(match: 're.Match[str]') -> str:
+    name = match.group(1)
+    if name[0] != "#":
+        return _XML_ENTITIES[name]
+    return chr(int(name[2:], 16) if name[1] == "x" else int(name[1:]))
+
+
+def _xml_text(text: str) -> str | None:
+    """Element text as ElementTree reports it: None when empty, entities replaced."""
+    if not text:
+        return None
+    if "&" in text:
+        text = _XML_ENTITY.sub(_xml_unescape_entity, text)
+    return text
+
+
+def _simple_root(data: bytes, root_start: bytes) -> bool | None:
+    """
+    Whether the document starts with exactly root_start, after an optional
+    UTF-8 XML declaration. None if data is too short to tell yet.
+    """
+    pos = len(data) - len(data.lstrip())
+    if data.startswith(b"<?", pos):
+        end = data.find(b"?>", pos)
+        if end < 0:
+            return None
+        declaration = data[pos:end].lower()
+        if b"encoding" in declaration and b"utf-8" not in declaration:
+            return False
+        pos = end + 2
+        pos += len(data[pos:]) - len(data[pos:].lstrip())
+    have = data[pos:pos + len(root_start)]
+    if have != root_start[:len(have)]:
+        return False
+    return True if len(have) == len(root_start) else None
+
+
+def _simple_fields(segment: str) -> dict[str, str | None] | None:
+    """
+    The child elements of an entry as a dict, or None if any child is more
+    than plain text (nested elements, CDATA, comments, attributes).
+    """
+    if "&quot;" in segment:
+        # Every ETag is quoted; quotes cannot change the markup, so unescape them up front
+        segment = segment.replace("&quot;", '"')
+    children = _TEXT_ELEMENT.findall(segment)
+    # Each plain child has exactly two "<"; anything else is left to ElementTree.
+    # XML parsers turn a raw CR into LF, so those go to ElementTree as well.
+    if segment.count("<") != 2 * len(children) or "\r" in segment:
+        return None
+    if "&" in segment or "></" in segment:
+        return {tag: _xml_text(text) for (tag, text) in children}
+    return dict(children)
+
+
+class _ListResponseParser:
+    """
+    Incremental parser for ListObjectsV2 responses.
+
+    ListObjectsV2 bodies have a fixed, flat shape, so instead of building
+    elements this splits each chunk of the body at <Contents> and reads the
+    children of each entry with one regular expression. Entries are returned
+    as soon as their closing tag arrives. Bodies that do not start the way
+    S3 writes them are parsed by _TreeListParser instead, and single entries
+    with nested elements, CDATA, comments or attributes by ElementTree, so
+    the results are the same as ElementTree's.
+    """
+
+    def __init__(self, records: bool = False):
+        # Build ObjectInfo records rather than dicts
+        self._records = records
+        self.reset()
+
+    def reset(self) -> None:
+        """Start over, for a page requested again after a failed read."""
+        self._buffer = b""
+        self._checked = False
+        self._ended = False
+        self._fallback: _TreeListParser | None = None
+        self._prefixes: list[str] = []
+        self._next_token: str | None = None
+
+    @property
+    def prefixes(self) -> list[str]:
+        return self._fallback.prefixes if self._fallback is not None else self._prefixes
+
+    @property
+    def next_token(self) -> str | None:
+        return self._fallback.next_token if self._fallback is not None else self._next_token
+
+    def feed(self, data: str | bytes) -> list:
+        """Parse the next chunk of the body, returning the objects it completed."""
+        if isinstance(data, str):
+            data = data.encode()
+        if self._fallback is not None:
+            return self._fallback.feed(data)
+        self._buffer += data
+        if not self._checked:
+            simple = _simple_root(self._buffer, _LIST_ROOT_START)
+            if simple is None:
+                return []
+            if not simple:
+                return self._fall_back()
+            self._checked = True
+        # Parse up to the last complete entry; the rest waits for more data
+        end = self._buffer.rfind(b"</Contents>")
+        if end < 0:
+            return []
+        end += len(b"</Contents>")
+        (region, self._buffer) = (self._buffer[:end], self._buffer[end:])
+        return self._parse_region(region.decode())
+
+    def close(self) -> list:
+        """Finish parsing, returning any objects not returned yet."""
+        if self._fallback is None and not self._checked:
+            self._fall_back()
+        if self._fallback is not None:
+            return self._fallback.close()
+        (region, self._buffer) = (self._buffer, b"")
+        objects = self._parse_region(region.decode())
+        if not self._ended:
+            raise ParseError("ListBucketResult response ended early")
+        return objects
+
+    def _fall_back(self) -> list:
+        self._fallback = _TreeListParser(self._records)
+        (data, self._buffer) = (self._buffer, b"")
+        return self._fallback.feed(data)
+
+    def _parse_region(self, text: str) -> list:
+        """Parse a run of complete top-level elements."""
+        if "<!" in text:
+            # CDATA or a comment could hide markup from the patterns; go element by element
+            return self._parse_elements(text)
+        if "&quot;" in text:
+            # Every ETag is quoted; quotes cannot change the markup, so unescape them up front
+            text = text.replace("&quot;", '"')
+        # Entries in the usual layout come out of split() as their five values,
+        # anything between them (other entries, prefixes, tokens) as text
+        pieces = _STANDARD_CONTENTS.split(text)
+        objects = []
+        for i in range(0, len(pieces) - 1, 6):
+            if pieces[i]:
+                objects += self._parse_elements(pieces[i])
+            (key, last_modified, etag, size, storage_class) = pieces[i + 1:i + 6]
+            if self._records:
+                objects.append(ObjectInfo(key, int(size), etag.strip('"'), last_modified, storage_class))
+            else:
+                objects.append({'Key': key, 'LastModified': last_modified, 'ETag': etag, 'Size': size,
+                                'StorageClass': storage_class})
+        if pieces[-1]:
+            objects += self._parse_elements(pieces[-1])
+        return objects
+
+    def _object(self, body: str, fields: dict[str, str | None] | None):
+        if fields is None:
+            fields = {child.tag: child.text for child in parse("<Contents>" + body + "</Contents>")}
+        return ObjectInfo.from_dict(fields) if self._records else fields
+
+    def _parse_elements(self, text: str) -> list:
+        """Parse top-level elements one at a time, for anything but a plain run of entries."""
+        objects: list = []
+        pos = 0
+        while True:
+            start = text.find("<", pos)
+            if start < 0:
+                return objects
+            gt = text.find(">", start)
+            if gt < 0:
+                raise ParseError("ListBucketResult response ended early")
+            tag = text[start + 1:gt]
+            if " " in tag:
+                # Attributes do not change the fields returned
+                tag = tag.split(None, 1)[0]
+            if tag == "Contents" or tag == "CommonPrefixes" or tag == "NextContinuationToken":
+                end = text.find("</" + tag + ">", gt)
+                if end < 0:
+                    raise ParseError("ListBucketResult response ended early")
+                segment = text[gt + 1:end]
+                if tag == "Contents":
+                    objects.append(self._object(segment, _simple_fields(segment)))
+                elif tag == "CommonPrefixes":
+                    fields = _simple_fields(segment)
+                    if fields is None:
+                        prefix = parse("<CommonPrefixes>" + segment + "</CommonPrefixes>").findtext("Prefix")
+                    else:
+                        prefix = fields.get("Prefix")
+                    self._prefixes.append(str(prefix))
+                else:
+                    self._next_token = _xml_text(segment)
+                pos = end + len(tag) + 3
+            else:
+                if tag == "/ListBucketResult":
+                    self._ended = True
+                pos = gt + 1
+
+
+def _object_info(contents: Element) -> ObjectInfo:
+    """Build an ObjectInfo from a <Contents> element without an intermediate dict."""
+    fields = {child.tag: child.text for child in contents}
+    return ObjectInfo(
+        fields.get(_LIST_KEY_TAG) or "",
+        int(fields.get(_LIST_SIZE_TAG) or 0),
+        (fields.get(_LIST_ETAG_TAG) or "").strip('"'),
+        fields.get(_LIST_LAST_MODIFIED_TAG),
+        fields.get(_LIST_STORAGE_CLASS_TAG),
+        fields.get(_LIST_CHECKSUM_ALGORITHM_TAG),
+        fields.get(_LIST_CHECKSUM_TYPE_TAG),
+    )
+
+
+def _parse_create_multipart_response(xml: str) -> str:
+    tree = parse(xml)
+    upload_id = tree.find(f"{{{API_VERSION}}}UploadId")
+    if upload_id is None or not upload_id.text:
+        raise ValueError("UploadId missing from CreateMultipartUpload response")
+    return upload_id.text
+
+
+def _parse_complete_multipart_response(xml: str) -> PutResult:
+    tree = parse(xml)
+    if _tag_normalize(tree.tag) == "Error":
+        # CompleteMultipartUpload can fail after S3 has already sent 200 OK.
+        code = tree.findtext("Code")
+        message = tree.findtext("Message")
+        raise ValueError(f"S3 request failed with:\nCompleteMultipartUpload {code}\n{message}")
+    etag = tree.findtext(f"{{{API_VERSION}}}ETag") or ""
+    checksum = (
+        tree.findtext(f"{{{API_VERSION}}}ChecksumSHA256") or
+        tree.findtext(f"{{{API_VERSION}}}ChecksumSHA1")
+    )
+    return PutResult(etag=etag.strip('"'), version_id=None, checksum=checksum)
+
 
 def _tag_normalize(name: str) -> str:
     if name[0] == "{":
@@ -1516,7 +2644,37 @@ def _tag_normalize(name: str) -> str:
         return name
 
 
-def _parse_delete_bulk_response(xml: str) -> Generator[Tuple[str, str], None, None]:
+def _parse_delete_bulk_response(xml: str | bytes) -> Generator[Tuple[str, str], None, None]:
+    """
+    Parse a DeleteObjects response into (key, "Deleted" or "Error") pairs.
+
+    Scans the bytes for <Deleted> and <Error> entries directly, falling back
+    to ElementTree for bodies or entries of unexpected shape.
+    """
+    data = xml.encode() if isinstance(xml, str) else xml
+    results = _scan_delete_bulk_response(data)
+    if results is None:
+        results = list(_parse_delete_bulk_response_tree(data))
+    yield from results
+
+
+def _scan_delete_bulk_response(data: bytes) -> list[Tuple[str, str]] | None:
+    """The (key, result) pairs of a DeleteObjects response as S3 writes it, or None for any other shape."""
+    if not _simple_root(data, _DELETE_ROOT_START):
+        return None
+    text = data.decode()
+    if "<!" in text or "\r" in text or "</DeleteResult>" not in text:
+        return None
+    entries = _DELETE_ENTRY.findall(text)
+    # Every entry must have matched, and with a key ElementTree would accept
+    if text.count("<Deleted") + text.count("<Error") != len(entries) or "<Key></Key>" in text:
+        return None
+    if "&" in text:
+        return [(str(_xml_text(key)), tag) for (tag, key) in entries]
+    return [(key, tag) for (tag, key) in entries]
+
+
+def _parse_delete_bulk_response_tree(xml: str | bytes) -> Generator[Tuple[str, str], None, None]:
     actions = parse(xml)
     for action in actions:
         if action is None:
@@ -0,0 +1,276 @@
+"""
+Concurrent bulk deletes for s3lib.
+
+DeleteObjects removes up to 1000 keys per request, but Connection.delete_objects
+sends those requests one after another. delete_parallel keeps several
+batches in flight on connections leased from a ConnectionPool and yields
+each key's result as soon as its batch completes, so results arrive in no
+particular order. Keys a response reports as Error (SlowDown, InternalError
+and the like) are sent again in a later batch after a backoff. Keys are
+read lazily, so only the batches in flight are held in memory.
+
+delete_prefix purges everything under a prefix: a background thread lists
+the prefix page by page into a bounded queue that delete_parallel drains,
+so the next page is listed while the last one is being deleted. Progress
+can be saved to a checkpoint file, from which an interrupted purge resumes
+listing where it stopped.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from heapq import heappop, heappush
+from itertools import count, islice
+from logging import getLogger
+from typing import Generator, Iterable, Iterator, Tuple
+
+from .utils import batchify, retry_call, retry_delay
+
+logger = getLogger(__name__)
+
+DEFAULT_JOBS = 8
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_DELETE_RETRIES = 5
+
+# Listed pages delete_prefix holds ahead of the deletes
+DEFAULT_PREFETCH = 4
+
+
+def _delete_batch(pool, bucket: str, keys: list[str], quiet: bool, max_retries: int) -> list[Tuple[str, str]]:
+    """
+    Send one DeleteObjects request for keys, retrying transient request failures with backoff.
+
+    A request S3 rejects outright, e.g. with AccessDenied or MalformedXML, is
+    not sent again; see utils.is_retryable.
+    """
+    return retry_call(_send_delete_batch, (pool, bucket, keys, quiet), max_retries, f"Delete of {len(keys)} keys")
+
+
+def _send_delete_batch(pool, bucket: str, keys: list[str], quiet: bool) -> list[Tuple[str, str]]:
+    # Import here to avoid circular dependency
+    from . import _parse_delete_bulk_response
+
+    with pool.lease() as conn:
+        for key in keys:
+            conn._invalidate_cached(bucket, key)
+        xml = conn._s3_delete_bulk_request(bucket, keys, quiet)
+    return list(_parse_delete_bulk_response(xml))
+
+
+def delete_parallel(
+    pool,
+    bucket: str,
+    keys: Iterable[str],
+    jobs: int = DEFAULT_JOBS,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    quiet: bool = False,
+    max_retries: int = DEFAULT_DELETE_RETRIES,
+) -> Generator[Tuple[str, str], None, None]:
+    """
+    Delete keys from bucket with up to jobs DeleteObjects requests in flight.
+
+    Args:
+        pool: ConnectionPool to lease connections from; allow at least jobs
+              connections
+        bucket: S3 bucket name
+        keys: Keys to delete; read lazily, batch_size at a time
+        jobs: Number of batches deleted concurrently
+        batch_size: Keys per DeleteObjects request (at most 1000)
+        quiet: Ask S3 to report only the keys it failed to delete
+        max_retries: Attempts per key. Keys reported as Error are re-queued
+                     until they have been tried this often; a request that
+                     fails with a transport error, a 5xx or throttling is
+                     retried as often before the error is raised. Other S3
+                     errors are raised at once.
+
+    Yields:
+        (key, result) tuples in completion order, where result is "Deleted"
+        or "Error". A key is yielded once, with its final result.
+
+    Raises:
+        S3ResponseError: S3 rejected a request
+        ValueError, OSError, HTTPException: A request failed max_retries times
+    """
+    pending = iter(keys)
+    exhausted = False
+    # (due time, sequence, attempt, keys) for keys waiting out their backoff
+    retries: list[Tuple[float, int, int, list[str]]] = []
+    sequence = count()
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        running: dict = {}
+        try:
+            while True:
+                now = time.monotonic()
+                while len(running) < jobs:
+                    if retries and retries[0][0] <= now:
+                        (_, _, attempt, batch) = heappop(retries)
+                    elif not exhausted:
+                        (attempt, batch) = (1, list(islice(pending, batch_size)))
+                        if not batch:
+                            exhausted = True
+                            continue
+                    else:
+                        break
+                    future = executor.submit(_delete_batch, pool, bucket, batch, quiet, max_retries)
+                    running[future] = attempt
+                if not running:
+                    if not retries:
+                        return
+                    time.sleep(max(0.0, retries[0][0] - now))
+                    continue
+                timeout = max(0.0, retries[0][0] - now) if retries else None
+                (done, _) = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    attempt = running.pop(future)
+                    failed = []
+                    for (key, result) in future.result():
+                        if result == "Error" and attempt < max_retries:
+                            failed.append(key)
+                        else:
+                            yield (key, result)
+                    if failed:
+                        delay = retry_delay(attempt)
+                        logger.debug("%d keys failed to delete, retrying in %.1fs", len(failed), delay)
+                        heappush(retries, (time.monotonic() + delay, next(sequence), attempt + 1, failed))
+        finally:
+            for future in running:
+                future.cancel()
+
+
+def _read_checkpoint(path: str, bucket: str, prefix: str) -> str | None:
+    """The key a purge of prefix saved to path, or None if path does not exist."""
+    try:
+        with open(path) as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return None
+    if state.get('bucket') != bucket or state.get('prefix') != prefix:
+        raise ValueError(f"Checkpoint {path} is for {state.get('bucket')}/{state.get('prefix')}, not {bucket}/{prefix}")
+    return state['after']
+
+
+def _write_checkpoint(path: str, bucket: str, prefix: str, after: str) -> None:
+    partial = path + ".partial"
+    with open(partial, 'w') as f:
+        json.dump({'bucket': bucket, 'prefix': prefix, 'after': after}, f)
+    os.replace(partial, path)
+
+
+def delete_prefix(
+    pool,
+    bucket: str,
+    prefix: str,
+    start: str | None = None,
+    jobs: int = DEFAULT_JOBS,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    prefetch: int = DEFAULT_PREFETCH,
+    quiet: bool = False,
+    max_retries: int = DEFAULT_DELETE_RETRIES,
+    checkpoint: str | None = None,
+) -> Generator[Tuple[str, str], None, None]:
+    """
+    Delete every key in bucket that starts with prefix.
+
+    The prefix is listed with list_bucket2 on a background thread, up to
+    prefetch pages ahead, and the listed keys are deleted as by
+    delete_parallel while the next page is listed.
+
+    With a checkpoint file, the last key up to which every listed key has
+    been deleted is saved there once per batch_size keys and when the
+    generator stops, for any reason. A later call with the same file lists
+    from after that key instead of from the start of the prefix. The file is
+    removed once the purge finishes with every key deleted; if some keys
+    could not be deleted it stays just before the first of them.
+
+    Args:
+        pool: ConnectionPool to lease connections from; allow at least
+              jobs + 1 connections, one of which lists
+        bucket: S3 bucket name
+        prefix: Prefix to purge; "" purges the whole bucket
+        start: Only delete keys after this one
+        jobs: Number of batches deleted concurrently
+        batch_size: Keys per list and DeleteObjects request
+        prefetch: Listed pages held ahead of the deletes
+        quiet: Only yield keys that could not be deleted
+        max_retries: Attempts per key, as for delete_parallel
+        checkpoint: Path of a file to save progress to and resume from
+
+    Yields:
+        (key, result) tuples in completion order, as delete_parallel
+
+    Raises:
+        ValueError: checkpoint was saved by a purge of another bucket or prefix
+    """
+    if checkpoint is not None:
+        resume = _read_checkpoint(checkpoint, bucket, prefix)
+        if resume is not None and (start is None or resume > start):
+            start = resume
+    pages: queue.Queue = queue.Queue(maxsize=prefetch)
+    stopped = threading.Event()
+
+    def put(item) -> bool:
+        # Block while the queue is full, but give up once the deletes have stopped
+        while not stopped.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def list_pages():
+        try:
+            with pool.lease() as conn:
+                objects = conn.list_bucket2(bucket, start=start, prefix=prefix or None, batch_size=batch_size)
+                for page in batchify(batch_size, (obj['Key'] for obj in objects)):
+                    if not put(page):
+                        return
+            put(None)
+        except BaseException as e:
+            put(e)
+
+    # Listed keys in key order, until they and every key before them have a final result
+    issued: deque[str] = deque()
+
+    def listed_keys() -> Iterator[str]:
+        while True:
+            page = pages.get()
+            if page is None:
+                return
+            if isinstance(page, BaseException):
+                raise page
+            issued.extend(page)
+            yield from page
+
+    finished: dict[str, str] = {}
+    # The last key up to which every listed key was deleted, and how many keys it has advanced unsaved
+    last_deleted = ""
+    unsaved = 0
+    pinned = False
+    thread = threading.Thread(target=list_pages, name="s3lib-delete-prefix-list", daemon=True)
+    thread.start()
+    try:
+        for (key, result) in delete_parallel(pool, bucket, listed_keys(), jobs, batch_size, False, max_retries):
+            finished[key] = result
+            while issued and issued[0] in finished:
+                done = issued.popleft()
+                if finished.pop(done) != "Deleted":
+                    pinned = True
+                elif not pinned:
+                    (last_deleted, unsaved) = (done, unsaved + 1)
+            if checkpoint is not None and unsaved >= batch_size:
+                _write_checkpoint(checkpoint, bucket, prefix, last_deleted)
+                unsaved = 0
+            if result != "Deleted" or not quiet:
+                yield (key, result)
+    finally:
+        stopped.set()
+        thread.join()
+        if checkpoint is not None and unsaved:
+            _write_checkpoint(checkpoint, bucket, prefix, last_deleted)
+    if checkpoint is not None and not pinned and os.path.exists(checkpoint):
+        os.remove(checkpoint)
@@ -0,0 +1,307 @@
+"""
+Persistent on-disk object cache for s3lib.
+
+Keeps object bodies and their ETags in a size-bounded directory so that
+objects read again, even by a later process, only cost a conditional GET:
+a 304 Not Modified is served from disk, anything else replaces the cached
+copy. Least recently used entries are evicted once the directory is over
+budget.
+
+Each entry is two files named after a hash of bucket and key: the body,
+whose name also includes a hash of the ETag, and a JSON metadata file that
+points at it. Both are written to temporary files and renamed into place,
+so a crash or a concurrent reader never sees a partial entry. Temporary
+files and bodies no metadata points at are swept when a cache is opened,
+but only once they are old enough that no live writer can still own them.
+"""
+
+import json
+import os
+import threading
+import time
+from hashlib import sha256
+from logging import getLogger
+from tempfile import mkstemp
+
+from .utils import lower_headers
+
+logger = getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+_META_SUFFIX = ".json"
+_BODY_SUFFIX = ".body"
+_TMP_PREFIX = ".tmp-"
+_COPY_BUFFER_SIZE = 1024 * 1024
+
+# Leftover temporary files and unreferenced bodies younger than this (seconds)
+# may belong to a store still in progress in another process, so are kept
+_SWEEP_AGE = 60 * 60
+
+
+class DiskCache:
+    """
+    Size-bounded directory cache in front of Connection.get_object2.
+
+    Thread-safe. Several processes may share a directory: writes are atomic
+    renames, but each process tracks the directory's size and recency only
+    from what it has seen, so the budget is enforced per process.
+
+    Args:
+        directory: Cache directory, created if missing
+        max_bytes: Total size of cached bodies before LRU eviction. Objects
+                   larger than this are streamed through uncached.
+        verify: Verify checksums of downloaded bodies before caching them
+
+    Usage:
+        cache = DiskCache("~/.cache/s3lib", max_bytes=512 * 1024 * 1024)
+        with Connection(access_id, secret) as s3:
+            body, headers = cache.get_object(s3, bucket, "config/app.json")
+            with body:
+                config = json.load(body)
+        print(cache.stats())
+    """
+
+    def __init__(self, directory, max_bytes: int = DEFAULT_MAX_BYTES, verify: bool = True):
+        self.directory = os.path.expanduser(directory)
+        self.max_bytes = max_bytes
+        self.verify = verify
+        self._lock = threading.Lock()
+        # name -> metadata, least recently used first
+        self._entries: dict[str, dict] = {}
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._revalidations = 0
+        self._evictions = 0
+        os.makedirs(self.directory, exist_ok=True)
+        self._load()
+
+    def get_object(self, conn, bucket: str, key: str):
+        """
+        Fetch an object through the cache.
+
+        A cached object is revalidated with a conditional GET on its ETag and
+        served from disk on 304 Not Modified; otherwise the object is
+        downloaded and cached.
+
+        Args:
+            conn: Connection (or leased pool connection) to fetch with
+            bucket: S3 bucket name
+            key: Object key
+
+        Returns:
+            (file, headers) — file is a readable binary file object that
+            MUST be used as a context manager; headers are the response
+            headers of the GET that last downloaded the body.
+
+        Raises:
+            ChecksumMismatch: If verify is set and a downloaded body is corrupt
+            ValueError: On S3 errors
+        """
+        name = _entry_name(bucket, key)
+        with self._lock:
+            entry = self._entries.get(name)
+
+        if entry is None:
+            stream, headers = conn.get_object2(bucket, key, verify=self.verify)
+            with self._lock:
+                self._misses += 1
+        else:
+            stream, headers = conn.get_object2(bucket, key, if_none_match=entry['etag'], verify=self.verify)
+            with self._lock:
+                self._revalidations += 1
+            if stream is None:
+                body = self._open_body(name, entry)
+                if body is not None:
+                    with self._lock:
+                        self._hits += 1
+                    return (body, entry['headers'])
+                # Body removed behind our back (another process evicted it)
+                stream, headers = conn.get_object2(bucket, key, verify=self.verify)
+
+        if stream is None:
+            raise ValueError(f"Unconditional GET of {key} returned no body")
+        size = int(lower_headers(headers).get('content-length', -1))
+        if size < 0 or size > self.max_bytes:
+            # Too large to cache; any older cached copy is stale now
+            self.invalidate(bucket, key)
+            return (stream, headers)
+        return (self._store(name, bucket, key, stream, headers), headers)
+
+    def invalidate(self, bucket: str, key: str) -> None:
+        """Drop the cached copy of an object, if any."""
+        name = _entry_name(bucket, key)
+        with self._lock:
+            entry = self._entries.pop(name, None)
+            if entry is not None:
+                self._bytes -= entry['size']
+        if entry is not None:
+            self._remove_files(name, entry)
+
+    def clear(self) -> None:
+        """Drop every cached object."""
+        with self._lock:
+            entries, self._entries = self._entries, {}
+            self._bytes = 0
+        for name, entry in entries.items():
+            self._remove_files(name, entry)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Cache counters.
+
+        Returns:
+            dict with hits (304s served from disk), misses (objects not in
+            the cache), revalidations (conditional GETs sent), evictions,
+            entries and bytes (current cached body total)
+        """
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'revalidations': self._revalidations,
+                'evictions': self._evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+            }
+
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.directory, filename)
+
+    def _open_body(self, name: str, entry: dict):
+        try:
+            body = open(self._path(entry['body']), 'rb')
+        except FileNotFoundError:
+            with self._lock:
+                if self._entries.get(name) is entry:
+                    del self._entries[name]
+                    self._bytes -= entry['size']
+            return None
+        # Record the use, both for this process and for the next one to load the directory
+        with self._lock:
+            if self._entries.get(name) is entry:
+                self._entries[name] = self._entries.pop(name)
+        try:
+            os.utime(self._path(name + _META_SUFFIX))
+        except OSError:
+            pass
+        return body
+
+    def _store(self, name: str, bucket: str, key: str, stream, headers):
+        etag = lower_headers(headers).get('etag', '').strip('"')
+        body_name = f"{name}-{sha256(etag.encode('utf-8')).hexdigest()[:16]}{_BODY_SUFFIX}"
+        fd, tmp_body = mkstemp(dir=self.directory, prefix=_TMP_PREFIX)
+        try:
+            size = 0
+            buf = memoryview(bytearray(_COPY_BUFFER_SIZE))
+            with open(fd, 'wb') as out, stream:
+                while n := stream.readinto(buf):
+                    out.write(buf[:n])
+                    size += n
+            entry = {
+                'bucket': bucket,
+                'key': key,
+                'etag': etag,
+                'size': size,
+                'body': body_name,
+                'headers': dict(headers),
+            }
+            os.replace(tmp_body, self._path(body_name))
+            _write_atomic(self.directory, self._path(name + _META_SUFFIX), json.dumps(entry).encode('utf-8'))
+        except BaseException:
+            _unlink(tmp_body)
+            raise
+
+        with self._lock:
+            old = self._entries.pop(name, None)
+            if old is not None:
+                self._bytes -= old['size']
+            self._entries[name] = entry
+            self._bytes += size
+            evicted = self._evict(keep=name)
+        if old is not None and old['body'] != body_name:
+            _unlink(self._path(old['body']))
+        for evicted_name, evicted_entry in evicted:
+            self._remove_files(evicted_name, evicted_entry)
+        return open(self._path(body_name), 'rb')
+
+    def _evict(self, keep: str):
+        """Pop least recently used entries until under budget. Call with the lock held."""
+        evicted = []
+        for name in list(self._entries):
+            if self._bytes <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            entry = self._entries.pop(name)
+            self._bytes -= entry['size']
+            self._evictions += 1
+            evicted.append((name, entry))
+        return evicted
+
+    def _remove_files(self, name: str, entry: dict) -> None:
+        _unlink(self._path(name + _META_SUFFIX))
+        _unlink(self._path(entry['body']))
+
+    def _load(self) -> None:
+        """Index the entries already in the directory, oldest use first, and sweep stale leftovers."""
+        loaded = []
+        referenced = set()
+        leftovers = []
+        for filename in os.listdir(self.directory):
+            path = self._path(filename)
+            if filename.startswith(_TMP_PREFIX):
+                leftovers.append(filename)
+            elif filename.endswith(_META_SUFFIX):
+                try:
+                    with open(path, 'rb') as f:
+                        entry = json.loads(f.read())
+                    mtime = os.stat(path).st_mtime
+                except (OSError, ValueError) as e:
+                    logger.debug("Dropping unreadable cache entry %s: %s", filename, e)
+                    _unlink(path)
+                    continue
+                referenced.add(entry['body'])
+                loaded.append((mtime, filename[:-len(_META_SUFFIX)], entry))
+        # A body is renamed into place before its metadata is written, so a
+        # fresh unreferenced body may be another process's store in progress
+        leftovers.extend(filename for filename in os.listdir(self.directory)
+                         if filename.endswith(_BODY_SUFFIX) and filename not in referenced)
+        cutoff = time.time() - _SWEEP_AGE
+        for filename in leftovers:
+            path = self._path(filename)
+            try:
+                if os.stat(path).st_mtime < cutoff:
+                    # Left behind by a writer that crashed
+                    _unlink(path)
+            except FileNotFoundError:
+                pass
+        for (_, name, entry) in sorted(loaded, key=lambda item: item[0]):
+            self._entries[name] = entry
+            self._bytes += entry['size']
+        evicted = self._evict(keep="")
+        for name, entry in evicted:
+            self._remove_files(name, entry)
+
+
+def _entry_name(bucket: str, key: str) -> str:
+    return sha256(f"{bucket}/{key}".encode('utf-8')).hexdigest()
+
+
+def _unlink(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def _write_atomic(directory: str, path: str, data: bytes) -> None:
+    fd, tmp = mkstemp(dir=directory, prefix=_TMP_PREFIX)
+    try:
+        with open(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        _unlink(tmp)
+        raise
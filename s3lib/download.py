@@ -0,0 +1,279 @@
+"""
+Parallel ranged downloads and vectored range reads for s3lib.
+
+HEADs the object, splits it into byte ranges and fetches them concurrently
+on connections leased from a ConnectionPool. Every range is written with
+os.pwrite straight into its place in a preallocated destination file, so no
+range is buffered beyond one read chunk and no reassembly pass is needed.
+All ranges are pinned to the ETag seen by the HEAD with If-Match, so an
+object overwritten mid-download fails the download instead of producing a
+file mixed from two versions.
+
+read_ranges serves readers that need many small pieces of one object, such
+as columnar file footers and column chunks: nearby ranges are merged into
+larger spans, the spans are fetched concurrently under the same ETag pin,
+and each requested range is returned as a view into its span.
+"""
+
+import os
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from logging import getLogger
+
+from .utils import S3ResponseError, lower_headers, retry_call
+
+logger = getLogger(__name__)
+
+DEFAULT_RANGE_SIZE = 16 * 1024 * 1024
+DEFAULT_JOBS = 4
+DEFAULT_RANGE_RETRIES = 3
+
+# Ranges separated by at most this many bytes are fetched in one request
+DEFAULT_MAX_GAP = 64 * 1024
+
+# Size of the buffer each range is read into and written from
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+def _preallocate(fd: int, size: int) -> None:
+    """Size the destination file, reserving its blocks where the platform allows."""
+    os.ftruncate(fd, size)
+    if size > 0 and hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, 0, size)
+        except OSError:
+            # Not supported by every filesystem; the sparse file still works.
+            pass
+
+
+def iter_ranges(size: int, range_size: int):
+    """Yield inclusive (start, end) byte ranges covering an object of size bytes."""
+    if range_size < 1:
+        raise ValueError("range_size must be at least 1")
+    for start in range(0, size, range_size):
+        yield (start, min(start + range_size, size) - 1)
+
+
+def _fetch_range(pool, bucket, key, etag, fd, start, end):
+    # Import here to avoid circular dependency
+    from . import PreconditionFailed
+
+    with pool.lease() as conn:
+        stream, headers = conn.get_object2(bucket, key, if_match=etag, byte_range=(start, end))
+        if stream is None:
+            raise PreconditionFailed(f"{key} changed during download (ETag is no longer {etag})")
+        offset = start
+        buf = memoryview(bytearray(READ_CHUNK_SIZE))
+        with stream:
+            while n := stream.readinto(buf):
+                if offset + n > end + 1:
+                    raise ValueError(f"Range {start}-{end} of {key} returned more than {end + 1 - start} bytes")
+                view = buf[:n]
+                while view:
+                    written = os.pwrite(fd, view, offset)
+                    offset += written
+                    view = view[written:]
+    if offset != end + 1:
+        raise ValueError(f"Short range for {key}: got bytes {start}-{offset - 1} of {start}-{end}")
+
+
+def _fetch_range_with_retry(pool, bucket, key, etag, fd, start, end, max_retries):
+    return _retry(_fetch_range, (pool, bucket, key, etag, fd, start, end), key, start, end, max_retries)
+
+
+def _retry(fetch, args, key, start, end, max_retries):
+    """
+    Call fetch(*args) for range start-end of key, retrying transient failures with backoff.
+
+    S3 error responses other than 5xx and throttling, such as AccessDenied,
+    NoSuchKey or InvalidRange, are raised at once; see utils.is_retryable.
+    """
+    return retry_call(fetch, args, max_retries, f"Range {start}-{end} of {key}")
+
+
+def download_parallel(
+    pool,
+    bucket: str,
+    key: str,
+    dst,
+    range_size: int = DEFAULT_RANGE_SIZE,
+    jobs: int = DEFAULT_JOBS,
+    if_match: str | None = None,
+    max_retries: int = DEFAULT_RANGE_RETRIES,
+) -> dict[str, str]:
+    """
+    Download an object with concurrent ranged GETs into a preallocated file.
+
+    Args:
+        pool: ConnectionPool to lease connections from. Allow at least jobs
+              connections, or workers will wait for leases.
+        bucket: S3 bucket name
+        key: Object key
+        dst: Regular file opened for writing in binary mode. It is truncated
+             to the object's size; ranges are written at their own offsets.
+        range_size: Bytes per ranged GET
+        jobs: Number of ranges fetched concurrently
+        if_match: ETag (without quotes) the object must have. Defaults to the
+                  ETag returned by the HEAD.
+        max_retries: Attempts per range before the download fails
+
+    Returns:
+        The object's HEAD response headers, with lowercase names
+
+    Raises:
+        PreconditionFailed: The object's ETag did not match if_match, or the
+                            object was overwritten during the download
+        ValueError: On S3 errors
+
+    Example:
+        with ConnectionPool(access_id, secret, max_connections=8) as pool:
+            with open("big.bin", "wb") as f:
+                headers = download_parallel(pool, bucket, key, f, jobs=8)
+    """
+    # Import here to avoid circular dependency
+    from . import PreconditionFailed
+
+    if jobs < 1:
+        raise ValueError("jobs must be at least 1")
+
+    with pool.lease() as conn:
+        headers = lower_headers(conn.head_object(bucket, key))
+    etag = headers.get('etag', '').strip('"')
+    if if_match is not None and etag != if_match:
+        raise PreconditionFailed(f"{key} has ETag {etag}, expected {if_match}")
+    size = int(headers['content-length'])
+
+    dst.flush()
+    fd = dst.fileno()
+    _preallocate(fd, size)
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(_fetch_range_with_retry, pool, bucket, key, etag, fd, start, end, max_retries)
+                   for (start, end) in iter_ranges(size, range_size)]
+        try:
+            for future in futures:
+                future.result()
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+    return headers
+
+
+def coalesce_ranges(ranges, max_gap: int = DEFAULT_MAX_GAP) -> list[tuple[int, int]]:
+    """
+    Merge inclusive (start, end) byte ranges into the spans to fetch.
+
+    Overlapping ranges, and ranges separated by at most max_gap bytes, are
+    merged; the unwanted gap bytes are cheaper than another request.
+
+    Returns:
+        Sorted, non-overlapping inclusive (start, end) spans
+    """
+    spans: list[tuple[int, int]] = []
+    for (start, end) in sorted(ranges):
+        if start < 0 or end < start:
+            raise ValueError(f"Invalid byte range {start}-{end}")
+        if spans and start <= spans[-1][1] + 1 + max_gap:
+            if end > spans[-1][1]:
+                spans[-1] = (spans[-1][0], end)
+        else:
+            spans.append((start, end))
+    return spans
+
+
+def _fetch_span(pool, bucket, key, etag, start, end):
+    # Import here to avoid circular dependency
+    from . import PreconditionFailed
+
+    with pool.lease() as conn:
+        data, headers = conn.get_object_into(bucket, key, bytearray(end + 1 - start),
+                                             if_match=etag, byte_range=(start, end))
+    if data is None:
+        raise PreconditionFailed(f"{key} changed during read (ETag is no longer {etag})")
+    if len(data) != end + 1 - start:
+        # A short body is a truncated transfer, unless the object really ends before the span does
+        size = lower_headers(headers).get('content-range', '').rpartition('/')[2]
+        if size.isdigit() and end >= int(size):
+            raise S3ResponseError(f"Range {start}-{end} is past the end of {key} ({size} bytes)", 416, "InvalidRange")
+        raise ValueError(f"Short range for {key}: got {len(data)} bytes of {start}-{end}")
+    return data, headers
+
+
+def read_ranges(
+    pool,
+    bucket: str,
+    key: str,
+    ranges,
+    max_gap: int = DEFAULT_MAX_GAP,
+    jobs: int = DEFAULT_JOBS,
+    etag: str | None = None,
+    max_retries: int = DEFAULT_RANGE_RETRIES,
+) -> list[memoryview]:
+    """
+    Read many byte ranges of one object with as few requests as possible.
+
+    Ranges are merged by coalesce_ranges() and the resulting spans fetched
+    concurrently, each with If-Match on one ETag, so every range comes from
+    the same version of the object. Without an etag, the first span is
+    fetched alone and the ETag it returns pins the rest.
+
+    Args:
+        pool: ConnectionPool to lease connections from
+        bucket: S3 bucket name
+        key: Object key
+        ranges: Inclusive (start, end) byte ranges, in any order. Every range
+                must lie within the object.
+        max_gap: Largest gap, in bytes, between two ranges fetched in one span
+        jobs: Number of spans fetched concurrently
+        etag: ETag (without quotes) the object must have
+        max_retries: Attempts per span before the read fails
+
+    Returns:
+        One memoryview per range, in the order of ranges. The views share
+        the buffers of the fetched spans; nothing is copied.
+
+    Raises:
+        PreconditionFailed: The object's ETag is not etag, or the object was
+                            overwritten during the read
+        ValueError: On S3 errors, or a range past the end of the object
+
+    Example:
+        with ConnectionPool(access_id, secret, max_connections=8) as pool:
+            footer, = read_ranges(pool, bucket, key, [(size - 8, size - 1)])
+            chunks = read_ranges(pool, bucket, key, column_ranges, jobs=8, etag=etag)
+    """
+    if jobs < 1:
+        raise ValueError("jobs must be at least 1")
+    ranges = list(ranges)
+    spans = coalesce_ranges(ranges, max_gap)
+    if not spans:
+        return []
+
+    fetched: dict[tuple[int, int], memoryview] = {}
+    remaining = spans
+    if etag is None:
+        first = spans[0]
+        fetched[first], headers = _retry(_fetch_span, (pool, bucket, key, None) + first, key, *first, max_retries)
+        etag = lower_headers(headers).get('etag', '').strip('"')
+        remaining = spans[1:]
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [(span, executor.submit(_retry, _fetch_span, (pool, bucket, key, etag) + span, key, *span,
+                                          max_retries))
+                   for span in remaining]
+        try:
+            for (span, future) in futures:
+                fetched[span] = future.result()[0]
+        except BaseException:
+            for (_, future) in futures:
+                future.cancel()
+            raise
+
+    # Each range lies within the last span starting at or before it
+    starts = [start for (start, _) in spans]
+    views = []
+    for (start, end) in ranges:
+        span = spans[bisect_right(starts, start) - 1]
+        views.append(fetched[span][start - span[0]:end + 1 - span[0]])
+    return views
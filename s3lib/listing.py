@@ -0,0 +1,471 @@
+"""
+Parallel bucket listing for s3lib.
+
+ListObjectsV2 pages can only be fetched one after another, because each
+page's continuation token comes from the page before it. list_parallel
+breaks that chain by listing with a delimiter: every CommonPrefixes entry
+names a disjoint part of the key space, which is listed on its own leased
+connection, recursively, while its parent's listing continues. Objects are
+yielded as their pages arrive, or in the same sorted order as list_bucket2.
+"""
+
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from heapq import merge
+from typing import Tuple
+
+DEFAULT_JOBS = 8
+DEFAULT_DELIMITER = "/"
+
+
+class _Listing:
+    """One prefix being listed, and the pages its worker has fetched so far."""
+
+    __slots__ = ('prefix', 'start', 'pages')
+
+    def __init__(self, prefix: str, start: str | None):
+        self.prefix = prefix
+        self.start = start
+        # Ordered mode only: page entries, then None; or an exception
+        self.pages: queue.Queue = queue.Queue()
+
+
+def _entry_key(entry) -> str:
+    return entry.prefix if isinstance(entry, _Listing) else entry['Key']
+
+
+class _ParallelLister:
+    """Fans a listing out over common prefixes on a thread pool."""
+
+    def __init__(self, pool, bucket, executor, delimiter, batch_size, start, ordered):
+        self._pool = pool
+        self._bucket = bucket
+        self._executor = executor
+        self._delimiter = delimiter
+        self._batch_size = batch_size
+        self._start = start
+        self._ordered = ordered
+        self._stopped = threading.Event()
+        # Unordered mode only: (objects, children spawned, last page) or an exception
+        self.results: queue.Queue = queue.Queue()
+
+    def child(self, prefix: str) -> _Listing | None:
+        """A listing of prefix, unless every key under it sorts before start."""
+        start = self._start
+        if start is None or start < prefix:
+            return _Listing(prefix, None)
+        if not start.startswith(prefix):
+            return None
+        # start == prefix still excludes the key equal to prefix, e.g. a folder marker
+        return _Listing(prefix, start)
+
+    def spawn(self, prefix: str) -> _Listing | None:
+        """Start listing prefix, unless every key under it sorts before start."""
+        listing = self.child(prefix)
+        if listing is not None:
+            self._executor.submit(self._run, listing)
+        return listing
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _run(self, listing: _Listing) -> None:
+        try:
+            self._list(listing)
+        except BaseException as e:
+            self._emit(listing, e)
+
+    def _list(self, listing: _Listing) -> None:
+        token = None
+        with self._pool.lease() as conn:
+            while not self._stopped.is_set():
+                objects, prefixes, token = conn.list_bucket_page(
+                    self._bucket, token, listing.start, listing.prefix or None, self._batch_size, self._delimiter)
+                children = [child for child in map(self.child, prefixes) if child is not None]
+                if self._ordered:
+                    # Objects and prefixes are each sorted; a prefix's keys sort
+                    # exactly where the prefix itself does.
+                    entries = list(merge(objects, children, key=_entry_key))
+                    self._emit(listing, entries)
+                    if token is None:
+                        self._emit(listing, None)
+                else:
+                    self._emit(listing, (objects, len(children), token is None))
+                # Children start only once this page, which counts them, has been
+                # emitted; otherwise a child could finish before it was counted.
+                for child in children:
+                    self._executor.submit(self._run, child)
+                if token is None:
+                    return
+
+    def _emit(self, listing: _Listing, item) -> None:
+        if self._ordered:
+            listing.pages.put(item)
+        else:
+            self.results.put(item)
+
+    def iter_unordered(self):
+        outstanding = 1
+        while outstanding:
+            item = self.results.get()
+            if isinstance(item, BaseException):
+                raise item
+            objects, spawned, last = item
+            outstanding += spawned - last
+            yield from objects
+
+    def iter_ordered(self, listing: _Listing):
+        while True:
+            page = listing.pages.get()
+            if isinstance(page, BaseException):
+                raise page
+            if page is None:
+                return
+            for entry in page:
+                if isinstance(entry, _Listing):
+                    yield from self.iter_ordered(entry)
+                else:
+                    yield entry
+
+
+def list_parallel(
+    pool,
+    bucket: str,
+    prefix: str | None = None,
+    start: str | None = None,
+    jobs: int = DEFAULT_JOBS,
+    ordered: bool = False,
+    delimiter: str = DEFAULT_DELIMITER,
+    batch_size: int | None = None,
+):
+    """
+    List a bucket with many concurrent ListObjectsV2 requests.
+
+    The listing is split at every common prefix the delimiter produces, so
+    the speedup depends on the key layout: a bucket whose keys share no
+    delimiter is listed by one request at a time, like list_bucket2.
+
+    Args:
+        pool: ConnectionPool to lease connections from. Each worker holds a
+              lease while it lists a prefix; allow at least jobs connections.
+        bucket: S3 bucket name
+        prefix: Only list keys starting with prefix
+        start: Only list keys after this one
+        jobs: Number of prefixes listed concurrently
+        ordered: Yield objects in key order, as list_bucket2 does. Pages of
+                 prefixes that sort later are held in memory until reached.
+                 Otherwise objects are yielded in whatever order pages arrive.
+        delimiter: Character that separates levels of the key space
+        batch_size: Most keys per ListObjectsV2 page
+
+    Yields:
+        Object dicts, as yielded by list_bucket2
+
+    Raises:
+        ValueError: On S3 errors
+
+    Example:
+        with ConnectionPool(access_id, secret, max_connections=16) as pool:
+            for obj in list_parallel(pool, bucket, prefix="logs/", jobs=16):
+                print(obj['Key'], obj['Size'])
+    """
+    if jobs < 1:
+        raise ValueError("jobs must be at least 1")
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        lister = _ParallelLister(pool, bucket, executor, delimiter, batch_size, start, ordered)
+        try:
+            root = lister.spawn(prefix or "")
+            if root is None:
+                return
+            if ordered:
+                yield from lister.iter_ordered(root)
+            else:
+                yield from lister.iter_unordered()
+        finally:
+            # Abandoned early or failed: let running workers finish their
+            # current page and drop the prefixes still queued.
+            lister.stop()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+# Split points are chosen from printable ASCII, where most keys live
+_MIN_CHAR = 0x20
+_MAX_CHAR = 0x7e
+
+DEFAULT_SHARDS = 16
+
+
+def _split_point(lo: str | None, hi: str | None) -> str | None:
+    """
+    A key roughly halfway between lo and hi, or None if there is none.
+
+    lo is an exclusive lower bound (None for the start of the key space),
+    hi an inclusive upper bound (None for the end). The result m satisfies
+    lo < m < hi, so (lo, m] and (m, hi] split the range.
+    """
+    lo = lo or ""
+    i = 0
+    if hi is not None:
+        while i < len(lo) and i < len(hi) and lo[i] == hi[i]:
+            i += 1
+        if i == len(hi):
+            return None
+    while True:
+        a = ord(lo[i]) if i < len(lo) else _MIN_CHAR - 1
+        b = ord(hi[i]) if hi is not None else _MAX_CHAR + 1
+        if b - a >= 2:
+            return lo[:i] + chr((a + b) // 2)
+        if i >= len(lo):
+            return None
+        # lo[:i + 1] is still below hi, so anything longer than it is too
+        i += 1
+        hi = None
+
+
+def _plan_ranges(lo: str | None, count: int) -> list[Tuple[str | None, str | None]]:
+    """Split (lo, end] into up to count contiguous (lo, hi] ranges of roughly even key space."""
+    ranges: list[Tuple[str | None, str | None]] = [(lo, None)]
+    while len(ranges) < count:
+        split: list[Tuple[str | None, str | None]] = []
+        for (index, (range_lo, range_hi)) in enumerate(ranges):
+            mid = _split_point(range_lo, range_hi)
+            # Splitting adds one range to the ones kept or still to visit
+            if mid is not None and len(split) + len(ranges) - index < count:
+                split += [(range_lo, mid), (mid, range_hi)]
+            else:
+                split.append((range_lo, range_hi))
+        if len(split) == len(ranges):
+            break
+        ranges = split
+    return ranges
+
+
+class _Shard:
+    """
+    Keys k with lo < k <= hi, relative to the listing prefix, and its progress.
+
+    hi shrinks when another worker steals the upper part of the range;
+    next is the shard holding the keys that follow, for ordered output.
+    """
+
+    __slots__ = ('lo', 'hi', 'position', 'pages_fetched', 'done', 'next', 'pages')
+
+    def __init__(self, lo: str | None, hi: str | None):
+        self.lo = lo
+        self.hi = hi
+        self.position: str | None = None
+        self.pages_fetched = 0
+        self.done = False
+        self.next: _Shard | None = None
+        # Ordered mode only: lists of objects, then None; or an exception
+        self.pages: queue.Queue = queue.Queue()
+
+
+_WORKER_DONE = object()
+
+
+class _ShardedLister:
+    """Lists key-range shards on a thread pool, splitting busy shards for idle workers."""
+
+    def __init__(self, pool, bucket, prefix, batch_size, ordered):
+        self._pool = pool
+        self._bucket = bucket
+        self._prefix = prefix
+        self._batch_size = batch_size
+        self._ordered = ordered
+        self._lock = threading.Lock()
+        # Notified whenever a shard fetches a page or finishes, for idle workers
+        self._changed = threading.Condition(self._lock)
+        self._stopped = threading.Event()
+        self._pending: deque[_Shard] = deque()
+        self._active: list[_Shard] = []
+        self.steals = 0
+        # Unordered mode only: lists of objects, _WORKER_DONE, or an exception
+        self.results: queue.Queue = queue.Queue()
+
+    def plan(self, lo: str | None, count: int) -> _Shard:
+        """Split (lo, end] into up to count shards and return the first."""
+        shards = [_Shard(shard_lo, shard_hi) for (shard_lo, shard_hi) in _plan_ranges(lo, count)]
+        for (shard, following) in zip(shards, shards[1:]):
+            shard.next = following
+        self._pending.extend(shards)
+        return shards[0]
+
+    def stop(self) -> None:
+        with self._lock:
+            self._stopped.set()
+            self._changed.notify_all()
+
+    def work(self) -> None:
+        try:
+            while not self._stopped.is_set():
+                shard = self._take()
+                if shard is None:
+                    return
+                try:
+                    with self._pool.lease() as conn:
+                        self._list(conn, shard)
+                except BaseException as e:
+                    with self._lock:
+                        shard.done = True
+                        self._changed.notify_all()
+                    self._emit(shard, e)
+                    return
+        finally:
+            self.results.put(_WORKER_DONE)
+
+    def _take(self) -> _Shard | None:
+        """
+        Next unstarted shard or, once there are none, the upper half of the busiest one.
+
+        Waits while the only shards left are too new to judge or cannot be
+        split; returns None once every shard is done.
+        """
+        with self._lock:
+            while not self._stopped.is_set():
+                shard = self._pending.popleft() if self._pending else self._steal()
+                if shard is not None:
+                    self._active.append(shard)
+                    return shard
+                if not self._active:
+                    return None
+                self._changed.wait()
+            return None
+
+    def _steal(self) -> _Shard | None:
+        """Split the active shard that has needed the most pages. Call with the lock held."""
+        self._active = [shard for shard in self._active if not shard.done]
+        for victim in sorted(self._active, key=lambda shard: shard.pages_fetched, reverse=True):
+            if victim.pages_fetched == 0:
+                # Not known to hold more than one page yet; wait for it
+                break
+            mid = _split_point(victim.position or victim.lo, victim.hi)
+            if mid is None:
+                continue
+            stolen = _Shard(mid, victim.hi)
+            stolen.next = victim.next
+            victim.hi = mid
+            victim.next = stolen
+            self.steals += 1
+            return stolen
+        return None
+
+    def _list(self, conn, shard: _Shard) -> None:
+        prefix = self._prefix
+        start = prefix + shard.lo if shard.lo is not None else None
+        token = None
+        while not self._stopped.is_set():
+            objects, _, token = conn.list_bucket_page(self._bucket, token, start, prefix or None, self._batch_size)
+            with self._lock:
+                shard.pages_fetched += 1
+                taken = objects
+                if shard.hi is not None:
+                    bound = prefix + shard.hi
+                    taken = [obj for obj in objects if obj['Key'] <= bound]
+                if taken:
+                    shard.position = taken[-1]['Key'][len(prefix):]
+                shard.done = token is None or len(taken) < len(objects)
+                self._changed.notify_all()
+            self._emit(shard, taken)
+            if shard.done:
+                if self._ordered:
+                    shard.pages.put(None)
+                return
+
+    def _emit(self, shard: _Shard, item) -> None:
+        if self._ordered:
+            shard.pages.put(item)
+        else:
+            self.results.put(item)
+
+    def iter_unordered(self, workers: int):
+        while workers:
+            item = self.results.get()
+            if item is _WORKER_DONE:
+                workers -= 1
+            elif isinstance(item, BaseException):
+                raise item
+            else:
+                yield from item
+
+    def iter_ordered(self, shard: _Shard | None):
+        while shard is not None:
+            page = shard.pages.get()
+            if isinstance(page, BaseException):
+                raise page
+            if page is None:
+                # Read only now: a steal may have inserted a shard after this one
+                with self._lock:
+                    shard = shard.next
+            else:
+                yield from page
+
+
+def list_sharded(
+    pool,
+    bucket: str,
+    prefix: str | None = None,
+    start: str | None = None,
+    shards: int = DEFAULT_SHARDS,
+    jobs: int = DEFAULT_JOBS,
+    ordered: bool = False,
+    batch_size: int | None = None,
+):
+    """
+    List a flat bucket by bisecting its key space.
+
+    The keys after prefix are split into shards at evenly spaced printable
+    ASCII characters, and each shard (lo, hi] is listed with start-after lo
+    until a key passes hi. Keys are rarely spread evenly, so a worker that
+    runs out of shards steals from the shard that has needed the most pages:
+    that shard's remaining range is halved and the worker lists the upper
+    half. Unlike list_parallel this needs no delimiter in the keys, which
+    suits hash-like key names.
+
+    Args:
+        pool: ConnectionPool to lease connections from. Each worker holds a
+              lease for the whole listing; allow at least jobs connections.
+        bucket: S3 bucket name
+        prefix: Only list keys starting with prefix
+        start: Only list keys after this one
+        shards: Number of shards to split the key space into up front
+        jobs: Number of shards listed concurrently
+        ordered: Yield objects in key order, as list_bucket2 does. Pages of
+                 later shards are held in memory until reached.
+        batch_size: Most keys per ListObjectsV2 page
+
+    Yields:
+        Object dicts, as yielded by list_bucket2
+
+    Raises:
+        ValueError: On S3 errors
+
+    Example:
+        with ConnectionPool(access_id, secret, max_connections=16) as pool:
+            for obj in list_sharded(pool, bucket, shards=64, jobs=16):
+                print(obj['Key'])
+    """
+    if jobs < 1:
+        raise ValueError("jobs must be at least 1")
+    if shards < 1:
+        raise ValueError("shards must be at least 1")
+    prefix = prefix or ""
+    lo = None
+    if start is not None and start >= prefix:
+        if not start.startswith(prefix):
+            return
+        lo = start[len(prefix):]
+    lister = _ShardedLister(pool, bucket, prefix, batch_size, ordered)
+    first = lister.plan(lo, shards)
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        try:
+            for _ in range(jobs):
+                executor.submit(lister.work)
+            if ordered:
+                yield from lister.iter_ordered(first)
+            else:
+                yield from lister.iter_unordered(jobs)
+        finally:
+            lister.stop()
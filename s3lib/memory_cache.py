@@ -0,0 +1,179 @@
+"""
+In-process write-through cache for small S3 objects.
+
+A MemoryCache attached to a Connection (or to every connection of a
+ConnectionPool) keeps recently read and written small objects in memory,
+bounded by their total size. Reads through get_object2 populate it,
+put_object2 writes through to it using the returned ETag, and deletes,
+overwrites and copies made through the same client invalidate it.
+
+Writes made by other clients are only noticed through revalidation: with a
+ttl, an entry older than ttl seconds is revalidated with a conditional GET
+(If-None-Match) and served from memory on 304 Not Modified.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Tuple
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_OBJECT_SIZE = 1024 * 1024
+
+
+class CacheEntry:
+    """One cached object: its body, response headers, ETag and last validation time."""
+
+    __slots__ = ('body', 'headers', 'etag', 'validated_at')
+
+    def __init__(self, body: bytes, headers: dict[str, str], etag: str, validated_at: float):
+        self.body = body
+        self.headers = headers
+        self.etag = etag
+        self.validated_at = validated_at
+
+
+class MemoryCache:
+    """
+    Thread-safe LRU cache of small object bodies, bounded by total bytes.
+
+    Args:
+        max_bytes: Total size of cached bodies before least recently used
+                   entries are evicted
+        max_object_size: Largest body that is cached; larger objects are
+                         streamed as usual
+        ttl: Seconds an entry is served without asking S3. After that it is
+             revalidated with If-None-Match. None serves entries until they
+             are evicted or invalidated by this client; 0 revalidates on
+             every read.
+        clock: Monotonic time source, for tests
+
+    Usage:
+        cache = MemoryCache(max_bytes=32 * 1024 * 1024, ttl=5)
+        with ConnectionPool(access_id, secret, object_cache=cache) as pool:
+            with pool.lease() as conn:
+                stream, headers = conn.get_object2(bucket, "flags.json")
+                with stream:
+                    flags = json.load(stream)
+        print(cache.stats())
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_object_size: int = DEFAULT_MAX_OBJECT_SIZE,
+        ttl: float | None = None,
+        clock=time.monotonic,
+    ):
+        self.max_bytes = max_bytes
+        self.max_object_size = min(max_object_size, max_bytes)
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, str], CacheEntry] = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._revalidations = 0
+        self._evictions = 0
+        # Bumped by every write-through and invalidation, so a read that raced
+        # with a write does not cache the body it fetched before the write.
+        self._writes = 0
+
+    def cacheable(self, size: int) -> bool:
+        """Whether a body of size bytes is small enough to cache."""
+        return 0 <= size <= self.max_object_size
+
+    def get(self, bucket: str, key: str) -> Tuple[CacheEntry | None, bool]:
+        """
+        Look up an object.
+
+        Returns:
+            (entry, fresh) — entry is None on a miss. A stale entry (fresh is
+            False) must be revalidated, then passed to revalidated() on 304.
+        """
+        with self._lock:
+            entry = self._entries.get((bucket, key))
+            if entry is None:
+                self._misses += 1
+                return (None, False)
+            self._entries.move_to_end((bucket, key))
+            if self.ttl is None or self._clock() - entry.validated_at < self.ttl:
+                self._hits += 1
+                return (entry, True)
+            self._revalidations += 1
+            return (entry, False)
+
+    def read_token(self) -> int:
+        """Token to pass to put() for a body about to be fetched from S3."""
+        with self._lock:
+            return self._writes
+
+    def revalidated(self, bucket: str, key: str, entry: CacheEntry) -> None:
+        """Record that S3 confirmed entry is current (304 Not Modified)."""
+        with self._lock:
+            entry.validated_at = self._clock()
+            self._hits += 1
+
+    def put(self, bucket: str, key: str, body: bytes, headers: dict[str, str], etag: str,
+            read_token: int | None = None) -> None:
+        """
+        Cache body as the current content of bucket/key, if it is small enough.
+
+        Args:
+            read_token: For a body read from S3, the read_token() taken before
+                        the request. The body is not cached if this client
+                        wrote or invalidated anything since. None for a write.
+        """
+        if not self.cacheable(len(body)):
+            self.invalidate(bucket, key)
+            return
+        entry = CacheEntry(body, headers, etag, self._clock())
+        with self._lock:
+            if read_token is None:
+                self._writes += 1
+            elif read_token != self._writes:
+                return
+            old = self._entries.pop((bucket, key), None)
+            if old is not None:
+                self._bytes -= len(old.body)
+            self._entries[(bucket, key)] = entry
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted.body)
+                self._evictions += 1
+
+    def invalidate(self, bucket: str, key: str) -> None:
+        """Drop bucket/key from the cache, if present."""
+        with self._lock:
+            self._writes += 1
+            old = self._entries.pop((bucket, key), None)
+            if old is not None:
+                self._bytes -= len(old.body)
+
+    def clear(self) -> None:
+        """Drop every cached object."""
+        with self._lock:
+            self._writes += 1
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        """
+        Cache counters.
+
+        Returns:
+            dict with hits (reads served from memory, including after a 304),
+            misses, revalidations (conditional GETs sent), evictions, entries
+            and bytes (current cached body total)
+        """
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'revalidations': self._revalidations,
+                'evictions': self._evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+            }
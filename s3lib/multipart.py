@@ -0,0 +1,257 @@
+"""
+Parallel multipart uploads for s3lib.
+
+Splits an object into parts and uploads them concurrently on connections
+leased from a ConnectionPool. Regular files are sliced with positional reads
+(os.pread) so parts are never copied to memory or temporary files ahead of
+time; other streams are read one part at a time with a bounded number of
+parts in flight. A part that fails with a transport error, a 5xx or
+throttling is retried on its own; if it keeps failing, or S3 rejects it
+outright, the whole upload is aborted so S3 does not keep the orphaned parts.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from logging import getLogger
+from stat import S_ISREG
+
+from .utils import retry_call
+
+logger = getLogger(__name__)
+
+# S3 limits: every part except the last must be at least 5 MiB, and an
+# upload has at most 10000 parts.
+MIN_PART_SIZE = 5 * 1024 * 1024
+MAX_PARTS = 10000
+
+DEFAULT_PART_SIZE = 16 * 1024 * 1024
+DEFAULT_MULTIPART_THRESHOLD = 64 * 1024 * 1024
+DEFAULT_JOBS = 4
+DEFAULT_PART_RETRIES = 3
+
+
+class FileSlice:
+    """
+    Read-only, seekable file-like view of one byte range of a file.
+
+    Reads use os.pread against the shared file descriptor, so many slices of
+    the same file can be read concurrently from different threads without
+    seeking the underlying file object.
+
+    Usage:
+        with open(path, 'rb') as f:
+            part = FileSlice(f.fileno(), offset=0, length=16 * 1024 * 1024)
+            conn.upload_part(bucket, key, upload_id, 1, part)
+    """
+
+    def __init__(self, fd: int, offset: int, length: int):
+        self._fd = fd
+        self._offset = offset
+        self._length = length
+        self._pos = 0
+
+    def read(self, size: int | None = -1) -> bytes:
+        remaining = self._length - self._pos
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+        if size == 0:
+            return b""
+        buf = os.pread(self._fd, size, self._offset + self._pos)
+        self._pos += len(buf)
+        return buf
+
+    def seek(self, pos: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            pos += self._pos
+        elif whence == os.SEEK_END:
+            pos += self._length
+        self._pos = min(max(pos, 0), self._length)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seekable(self) -> bool:
+        return True
+
+    def readable(self) -> bool:
+        return True
+
+    def __len__(self) -> int:
+        return self._length
+
+
+def part_size_for(size: int, part_size: int = DEFAULT_PART_SIZE) -> int:
+    """
+    Part size to use for an object of a known size.
+
+    Returns part_size, raised to the S3 minimum, and raised further if the
+    object would otherwise need more than MAX_PARTS parts.
+    """
+    part_size = max(part_size, MIN_PART_SIZE)
+    return max(part_size, -(-size // MAX_PARTS))
+
+
+def _regular_file_fd(data) -> int | None:
+    """File descriptor of data if it is a regular file, otherwise None."""
+    if not hasattr(data, "fileno"):
+        return None
+    try:
+        fd = data.fileno()
+        return fd if S_ISREG(os.fstat(fd).st_mode) else None
+    except OSError:
+        return None
+
+
+def _iter_file_parts(fd: int, start: int, size: int, part_size: int):
+    """Yield (part_number, FileSlice) covering size bytes from start."""
+    part_size = part_size_for(size, part_size)
+    offset = 0
+    part_number = 1
+    while True:
+        length = min(part_size, size - offset)
+        yield (part_number, FileSlice(fd, start + offset, length))
+        offset += length
+        part_number += 1
+        if offset >= size:
+            return
+
+
+def _iter_stream_parts(src, part_size: int, head: bytes = b""):
+    """Yield (part_number, bytes) read sequentially from src, starting with head."""
+    part_size = max(part_size, MIN_PART_SIZE)
+    # Parts are cut from head through a view, so each byte of it is copied once
+    view = memoryview(head)
+    offset = 0
+    part_number = 1
+    while True:
+        buf = bytearray(view[offset:offset + part_size])
+        offset += len(buf)
+        while len(buf) < part_size:
+            more = src.read(part_size - len(buf))
+            if not more:
+                break
+            buf += more
+        # Always send at least one part, even for an empty object.
+        if buf or part_number == 1:
+            yield (part_number, bytes(buf))
+        if len(buf) < part_size:
+            return
+        part_number += 1
+
+
+def _upload_part(pool, bucket, key, upload_id, part_number, part, checksum_algorithm):
+    if not isinstance(part, bytes):
+        part.seek(0)
+    with pool.lease() as conn:
+        return conn.upload_part(bucket, key, upload_id, part_number, part, checksum_algorithm=checksum_algorithm)
+
+
+def _upload_part_with_retry(pool, bucket, key, upload_id, part_number, part,
+                            checksum_algorithm, max_retries):
+    return retry_call(_upload_part, (pool, bucket, key, upload_id, part_number, part, checksum_algorithm),
+                      max_retries, f"Part {part_number} of {key}")
+
+
+def _upload_parts(pool, bucket, key, upload_id, parts, jobs, checksum_algorithm, max_retries):
+    """
+    Upload (part_number, part) pairs with at most jobs in flight.
+
+    Parts are pulled from the iterator only when a worker is free, so a
+    streamed source never holds more than jobs + 1 parts in memory. Once any
+    part fails for good, no further parts are started.
+    """
+    slots = threading.BoundedSemaphore(jobs)
+    failed = threading.Event()
+
+    def _done(future):
+        if future.exception() is not None:
+            failed.set()
+        slots.release()
+
+    futures = []
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        for part_number, part in parts:
+            slots.acquire()
+            if failed.is_set():
+                slots.release()
+                break
+            future = executor.submit(_upload_part_with_retry, pool, bucket, key, upload_id,
+                                     part_number, part, checksum_algorithm, max_retries)
+            future.add_done_callback(_done)
+            futures.append(future)
+    # Raises the first failure, if any
+    return [future.result() for future in futures]
+
+
+def upload_multipart(
+    pool,
+    bucket: str,
+    key: str,
+    data,
+    part_size: int = DEFAULT_PART_SIZE,
+    jobs: int = DEFAULT_JOBS,
+    headers: dict[str, str] | None = None,
+    checksum_algorithm: str | None = "SHA256",
+    max_retries: int = DEFAULT_PART_RETRIES,
+    head: bytes = b"",
+):
+    """
+    Upload an object with a parallel multipart upload.
+
+    Args:
+        pool: ConnectionPool to lease connections from. Allow at least jobs
+              connections, or workers will wait for leases.
+        bucket: S3 bucket name
+        key: Object key
+        data: Regular file opened in binary mode (sliced with positional reads
+              from its current position), or any readable binary stream (read
+              sequentially, one part at a time)
+        part_size: Bytes per part. Raised to 5 MiB, and for regular files raised
+                   further so the object fits in 10000 parts. Streams are limited
+                   to 10000 * part_size bytes.
+        jobs: Number of parts uploaded concurrently
+        headers: Optional dict of additional headers for CreateMultipartUpload
+        checksum_algorithm: Per-part checksum, 'SHA256', 'SHA1', or None
+        max_retries: Attempts per part before the upload is aborted. Only
+                     retryable failures (see utils.is_retryable) are retried.
+        head: Bytes already read from the front of a stream, e.g. to decide
+              whether it was large enough to need a multipart upload
+
+    Returns:
+        MultipartPutResult for the assembled object, including the status of
+        the CompleteMultipartUpload response
+
+    Raises:
+        ValueError: On S3 errors, after the upload has been aborted
+
+    Example:
+        with ConnectionPool(access_id, secret, max_connections=8) as pool:
+            with open("big.bin", "rb") as f:
+                result = upload_multipart(pool, bucket, key, f, jobs=8)
+    """
+    if jobs < 1:
+        raise ValueError("jobs must be at least 1")
+
+    fd = None if head else _regular_file_fd(data)
+    if fd is not None:
+        start = data.tell()
+        parts = _iter_file_parts(fd, start, os.fstat(fd).st_size - start, part_size)
+    else:
+        parts = _iter_stream_parts(data, part_size, head)
+
+    with pool.lease() as conn:
+        upload_id = conn.create_multipart_upload(bucket, key, headers, checksum_algorithm)
+    try:
+        results = _upload_parts(pool, bucket, key, upload_id, parts, jobs,
+                                checksum_algorithm, max_retries)
+        with pool.lease() as conn:
+            return conn.complete_multipart_upload(bucket, key, upload_id, results)
+    except BaseException:
+        try:
+            with pool.lease() as conn:
+                conn.abort_multipart_upload(bucket, key, upload_id)
+        except Exception as e:
+            logger.debug("Abort of upload %s for %s failed: %s", upload_id, key, e)
+        raise
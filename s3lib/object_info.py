@@ -0,0 +1,175 @@
+"""
+Compact, typed records for bucket listings.
+
+list_bucket2 yields one dict of strings per object. For very large listings
+that is costly twice over: every dict carries its own hash table, and every
+consumer converts Size and LastModified again. ObjectInfo holds the same
+fields in slots, with the size as an int, StorageClass and ChecksumAlgorithm
+interned so millions of records share a handful of strings, and LastModified
+kept as the raw string until it is first read.
+
+ObjectColumns holds a batch of listed objects column by column: keys and
+ETags in lists, sizes and modification times in typed arrays, which is what
+aggregations over a listing want.
+"""
+
+import sys
+from array import array
+from datetime import datetime
+from typing import Iterable
+
+
+def _parse_timestamp(text: str) -> datetime:
+    """Parse an S3 timestamp such as 2024-01-01T00:00:00.000Z to an aware datetime."""
+    if text.endswith("Z"):
+        text = text[:-1] + "+00:00"
+    return datetime.fromisoformat(text)
+
+
+def _intern(text: str | None) -> str | None:
+    return None if text is None else sys.intern(text)
+
+
+class ObjectInfo:
+    """
+    One object from a bucket listing.
+
+    Attributes:
+        key: Object key
+        size: Size in bytes
+        etag: ETag without surrounding quotes
+        storage_class: Storage class, e.g. STANDARD (interned)
+        checksum_algorithm: Checksum algorithm the object was uploaded
+                            with, or None (interned)
+        checksum_type: FULL_OBJECT or COMPOSITE, or None (interned)
+        last_modified: Modification time as an aware UTC datetime, parsed
+                       from the listing on first access
+        mtime: Modification time as seconds since the epoch
+    """
+
+    __slots__ = ('key', 'size', 'etag', 'storage_class', 'checksum_algorithm', 'checksum_type',
+                 '_last_modified_text', '_last_modified')
+
+    def __init__(
+        self,
+        key: str,
+        size: int,
+        etag: str,
+        last_modified: str | None,
+        storage_class: str | None = None,
+        checksum_algorithm: str | None = None,
+        checksum_type: str | None = None,
+    ):
+        self.key = key
+        self.size = size
+        self.etag = etag
+        self.storage_class = _intern(storage_class)
+        self.checksum_algorithm = _intern(checksum_algorithm)
+        self.checksum_type = _intern(checksum_type)
+        self._last_modified_text = last_modified
+        self._last_modified: datetime | None = None
+
+    @classmethod
+    def from_dict(cls, obj: dict[str, str | None]) -> 'ObjectInfo':
+        """Build from an object dict as yielded by list_bucket2."""
+        return cls(
+            str(obj['Key']),
+            int(obj.get('Size') or 0),
+            (obj.get('ETag') or "").strip('"'),
+            obj.get('LastModified'),
+            obj.get('StorageClass'),
+            obj.get('ChecksumAlgorithm'),
+            obj.get('ChecksumType'),
+        )
+
+    def to_dict(self) -> dict[str, str | None]:
+        """The object dict list_bucket2 yields for this object."""
+        obj: dict[str, str | None] = {
+            'Key': self.key,
+            'LastModified': self._last_modified_text,
+            'ETag': f'"{self.etag}"',
+            'Size': str(self.size),
+            'StorageClass': self.storage_class,
+        }
+        if self.checksum_algorithm is not None:
+            obj['ChecksumAlgorithm'] = self.checksum_algorithm
+        if self.checksum_type is not None:
+            obj['ChecksumType'] = self.checksum_type
+        return obj
+
+    @property
+    def last_modified_text(self) -> str | None:
+        """LastModified exactly as listed, e.g. 2024-01-01T00:00:00.000Z."""
+        return self._last_modified_text
+
+    @property
+    def last_modified(self) -> datetime | None:
+        if self._last_modified is None and self._last_modified_text is not None:
+            self._last_modified = _parse_timestamp(self._last_modified_text)
+        return self._last_modified
+
+    @property
+    def mtime(self) -> float:
+        last_modified = self.last_modified
+        return 0.0 if last_modified is None else last_modified.timestamp()
+
+    def __eq__(self, other):
+        if not isinstance(other, ObjectInfo):
+            return NotImplemented
+        return (self.key, self.size, self.etag, self._last_modified_text, self.storage_class,
+                self.checksum_algorithm, self.checksum_type) == \
+            (other.key, other.size, other.etag, other._last_modified_text, other.storage_class,
+             other.checksum_algorithm, other.checksum_type)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self):
+        return (f"ObjectInfo(key={self.key!r}, size={self.size}, etag={self.etag!r}, "
+                f"last_modified={self._last_modified_text!r}, storage_class={self.storage_class!r})")
+
+
+class ObjectColumns:
+    """
+    A batch of listed objects stored column by column.
+
+    Attributes:
+        keys: Object keys
+        sizes: array('q') of sizes in bytes
+        mtimes: array('d') of modification times, in seconds since the epoch
+        etags: ETags without surrounding quotes
+        storage_classes: Storage classes (interned)
+
+    Usage:
+        for batch in s3.list_columns("mybucket", prefix="logs/"):
+            total += sum(batch.sizes)
+    """
+
+    __slots__ = ('keys', 'sizes', 'mtimes', 'etags', 'storage_classes')
+
+    def __init__(self):
+        self.keys: list[str] = []
+        self.sizes = array('q')
+        self.mtimes = array('d')
+        self.etags: list[str] = []
+        self.storage_classes: list[str | None] = []
+
+    @classmethod
+    def from_objects(cls, objects: Iterable[ObjectInfo]) -> 'ObjectColumns':
+        """Collect ObjectInfo records into columns."""
+        columns = cls()
+        columns.extend(objects)
+        return columns
+
+    def append(self, obj: ObjectInfo) -> None:
+        self.keys.append(obj.key)
+        self.sizes.append(obj.size)
+        self.mtimes.append(obj.mtime)
+        self.etags.append(obj.etag)
+        self.storage_classes.append(obj.storage_class)
+
+    def extend(self, objects: Iterable[ObjectInfo]) -> None:
+        for obj in objects:
+            self.append(obj)
+
+    def __len__(self):
+        return len(self.keys)
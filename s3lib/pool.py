@@ -5,11 +5,18 @@ Provides thread-safe connection pooling with MRU (Most Recently Used) strategy
 for efficient S3 operations.
 """
 
+import contextlib
 import threading
 import time
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Deque
 
+from .utils import lower_headers
+
+DEFAULT_PREFETCH = 8
+DEFAULT_MAX_BUFFERED_BYTES = 64 * 1024 * 1024
+
 
 class ConnectionLease:
     """
@@ -98,7 +105,8 @@ class ConnectionPool:
     """
 
     def __init__(self, access_id, secret, host=None, port=None,
-                 max_connections=10, conn_timeout=60, wait_timeout=30, use_ssl=True):
+                 max_connections=10, conn_timeout=60, wait_timeout=30, use_ssl=True,
+                 signing_key_cache=None, object_cache=None, drain_threshold=None):
         """
         Initialize thread-safe connection pool.
 
@@ -114,6 +122,14 @@ class ConnectionPool:
             wait_timeout (int): Maximum time to wait for available connection
                 in seconds. Defaults to 30
             use_ssl (bool): Use HTTPS if True (default), HTTP if False
+            signing_key_cache (SigningKeyCache, optional): SigV4 signing key
+                cache shared by every pooled connection. Defaults to the
+                process-wide cache.
+            object_cache (MemoryCache, optional): In-memory cache of small
+                object bodies shared by every pooled connection.
+            drain_threshold (int, optional): Largest unread stream remainder
+                drained to keep a connection alive. Defaults to
+                Connection's default.
         """
         # Validate inputs
         if not isinstance(secret, bytes):
@@ -134,6 +150,9 @@ class ConnectionPool:
         self.max_connections = max_connections
         self.conn_timeout = conn_timeout
         self.wait_timeout = wait_timeout
+        self.signing_key_cache = signing_key_cache
+        self.object_cache = object_cache
+        self.drain_threshold = drain_threshold
 
         # Thread-safe data structures
         # Use deque for O(1) append/pop (LIFO = MRU strategy)
@@ -254,7 +273,7 @@ class ConnectionPool:
             Any exception from Connection construction
         """
         # Import here to avoid circular dependency
-        from . import Connection
+        from . import DEFAULT_DRAIN_THRESHOLD, Connection
 
         conn = Connection(
             self.access_id,
@@ -262,7 +281,11 @@ class ConnectionPool:
             self.host,
             self.port,
             self.conn_timeout,
-            use_ssl=self.use_ssl
+            use_ssl=self.use_ssl,
+            signing_key_cache=self.signing_key_cache,
+            object_cache=self.object_cache,
+            drain_threshold=(DEFAULT_DRAIN_THRESHOLD if self.drain_threshold is None
+                             else self.drain_threshold),
         )
 
         self._all_connections.add(conn)
@@ -365,6 +388,108 @@ class ConnectionPool:
             # Notify all waiting threads (they will get RuntimeError)
             self._condition.notify_all()
 
+    def get_objects(self, bucket, keys, prefetch=DEFAULT_PREFETCH,
+                    max_buffered_bytes=DEFAULT_MAX_BUFFERED_BYTES, verify=False):
+        """
+        Fetch many objects, overlapping requests with the caller's processing.
+
+        Up to prefetch objects ahead of the one being consumed are fetched on
+        separate leased connections. Bodies that fit in what is left of
+        max_buffered_bytes are read into memory and their connections returned
+        at once; a larger body is handed over as an open stream, keeping its
+        connection leased until the caller moves on.
+
+        Results are yielded in the order of keys. An item is only valid until
+        the next one is requested: its buffer budget is released and its
+        connection returned at that point.
+
+        Args:
+            bucket (str): S3 bucket name
+            keys (iterable of str): Object keys, consumed lazily
+            prefetch (int): Objects fetched ahead of the one being consumed.
+                Limited to max_connections - 1 so the pool cannot starve the
+                next object. Defaults to 8
+            max_buffered_bytes (int): Total size of bodies held in memory
+                ahead of the caller. Defaults to 64 MiB
+            verify (bool): Verify bodies against their checksums, as for
+                Connection.get_object2
+
+        Yields:
+            (key, body, headers) — body is bytes for a buffered object, or an
+            S3ByteStream that MUST be used as a context manager.
+
+        Raises:
+            ValueError: On S3 errors (e.g. a missing key), when that key is
+                reached
+            ChecksumMismatch: If verify is set and a body is corrupt
+
+        Example:
+            for key, body, headers in pool.get_objects(bucket, keys, prefetch=16):
+                if isinstance(body, bytes):
+                    process(body)
+                else:
+                    with body:
+                        process(body.read())
+        """
+        if prefetch < 1:
+            raise ValueError("prefetch must be at least 1")
+        prefetch = max(1, min(prefetch, self.max_connections - 1))
+        budget = _ByteBudget(max_buffered_bytes)
+        keys = iter(keys)
+        pending: Deque = deque()
+
+        with ThreadPoolExecutor(max_workers=prefetch) as executor:
+            def submit_next():
+                key = next(keys, None)
+                if key is not None:
+                    pending.append(executor.submit(self._fetch_object, bucket, key, budget, verify))
+
+            try:
+                for _ in range(prefetch):
+                    submit_next()
+                while pending:
+                    key, body, headers, reserved, held = pending.popleft().result()
+                    submit_next()
+                    with held:
+                        yield (key, body, headers)
+                    budget.release(reserved)
+            finally:
+                # Abandoned early: drop queued fetches and release finished ones
+                for future in pending:
+                    future.cancel()
+                for future in pending:
+                    if not future.cancelled() and future.exception() is None:
+                        future.result()[4].close()
+
+    def _fetch_object(self, bucket, key, budget, verify):
+        """
+        Fetch one object for get_objects, on a worker thread.
+
+        Returns:
+            (key, body, headers, reserved, held) — held is an ExitStack that
+            returns the connection once the caller is done with the body.
+        """
+        held = contextlib.ExitStack()
+        try:
+            conn = held.enter_context(self.lease())
+            stream, headers = conn.get_object2(bucket, key, verify=verify)
+            if stream is None:
+                raise ValueError(f"GET of {key} returned no body")
+            length = int(lower_headers(headers).get('content-length', -1))
+            if length >= 0 and budget.reserve(length):
+                try:
+                    with stream:
+                        body = stream.read()
+                except BaseException:
+                    budget.release(length)
+                    raise
+                held.close()
+                return (key, body, headers, length, held)
+            return (key, stream, headers, 0, held)
+        except BaseException:
+            held.close()
+            raise
+
     @property
     def closed(self):
         """
@@ -441,3 +566,24 @@ class ConnectionPool:
                     f"available={len(self._available)}, "
                     f"in_use={len(self._in_use)}, "
                     f"closed={self._closed})")
+
+
+class _ByteBudget:
+    """Thread-safe count of bytes get_objects holds in memory, bounded by limit."""
+
+    def __init__(self, limit):
+        self._limit = limit
+        self._used = 0
+        self._lock = threading.Lock()
+
+    def reserve(self, size):
+        """Reserve size bytes if they fit. Never blocks."""
+        with self._lock:
+            if self._used + size > self._limit:
+                return False
+            self._used += size
+            return True
+
+    def release(self, size):
+        with self._lock:
+            self._used -= size
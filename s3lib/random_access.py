@@ -0,0 +1,198 @@
+"""
+Seekable, read-only file objects over S3 objects.
+
+S3RandomAccessFile turns reads at arbitrary offsets into ranged GETs, so
+container formats whose index lives in a header or footer (zip, parquet,
+tar indexes) can be opened with the standard library without downloading
+the whole object. Data is fetched in fixed-size blocks kept in an LRU cache;
+when reads are sequential, each miss also fetches the following blocks so a
+streaming consumer makes few, large requests.
+"""
+
+import contextlib
+import io
+from collections import OrderedDict
+
+from .utils import lower_headers
+
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+DEFAULT_CACHE_BLOCKS = 32
+DEFAULT_READ_AHEAD = 4
+
+
+class S3RandomAccessFile(io.RawIOBase):
+    """
+    Read-only, seekable raw file over one S3 object.
+
+    Every ranged GET is pinned with If-Match to the ETag the file was opened
+    with, so all reads see the same version of the object. If the object is
+    overwritten while the file is open, the next uncached read raises
+    PreconditionFailed instead of returning bytes of a different version.
+
+    Not safe for concurrent use from several threads; open one file per
+    thread (they may share a ConnectionPool).
+
+    Args:
+        source: Connection or ConnectionPool. A ConnectionPool is leased per
+                request; a Connection is used directly and must not have a
+                stream outstanding while this file reads.
+        bucket: S3 bucket name
+        key: Object key
+        block_size: Bytes per cached block, and the smallest ranged GET
+        cache_blocks: Number of blocks kept in the LRU cache
+        read_ahead: Extra blocks fetched on a miss while reads are sequential
+        etag: ETag (without quotes) to pin to. With size, skips the HEAD.
+        size: Object size in bytes
+
+    Usage:
+        with ConnectionPool(access_id, secret) as pool:
+            with S3RandomAccessFile(pool, bucket, "archive.zip") as raw:
+                with zipfile.ZipFile(io.BufferedReader(raw)) as zf:
+                    print(zf.namelist())
+    """
+
+    def __init__(
+        self,
+        source,
+        bucket: str,
+        key: str,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        cache_blocks: int = DEFAULT_CACHE_BLOCKS,
+        read_ahead: int = DEFAULT_READ_AHEAD,
+        etag: str | None = None,
+        size: int | None = None,
+    ):
+        super().__init__()
+        if block_size < 1:
+            raise ValueError("block_size must be at least 1")
+        if cache_blocks < 1:
+            raise ValueError("cache_blocks must be at least 1")
+        self._source = source
+        self.bucket = bucket
+        self.key = key
+        self.block_size = block_size
+        self.cache_blocks = cache_blocks
+        # A read-ahead window larger than the cache would evict itself.
+        self.read_ahead = max(0, min(read_ahead, cache_blocks - 1))
+        self._blocks: OrderedDict[int, memoryview] = OrderedDict()
+        self._pos = 0
+        # End offset of the previous read, for sequential access detection
+        self._last_end: int | None = None
+        self._hits = 0
+        self._misses = 0
+        self._requests = 0
+
+        if etag is None or size is None:
+            with self._lease() as conn:
+                headers = lower_headers(conn.head_object(bucket, key))
+            etag = headers.get('etag', '').strip('"') if etag is None else etag
+            size = int(headers['content-length']) if size is None else size
+        self.etag = etag
+        self.size = size
+
+    def _lease(self):
+        if hasattr(self._source, "lease"):
+            return self._source.lease()
+        return contextlib.nullcontext(self._source)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        self._checkClosed()
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self._checkClosed()
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence ({whence})")
+        if pos < 0:
+            raise ValueError(f"Negative seek position {pos}")
+        self._pos = pos
+        return pos
+
+    def readinto(self, buffer) -> int:
+        self._checkClosed()
+        view = memoryview(buffer).cast('B')
+        start = self._pos
+        end = min(start + len(view), self.size)
+        if start >= end:
+            return 0
+
+        sequential = start == self._last_end
+        last_block = (end - 1) // self.block_size
+        filled = 0
+        for index in range(start // self.block_size, last_block + 1):
+            block = self._block(index, last_block, sequential)
+            block_start = index * self.block_size
+            lo = start + filled - block_start
+            hi = min(len(block), end - block_start)
+            view[filled:filled + hi - lo] = block[lo:hi]
+            filled += hi - lo
+
+        self._pos = self._last_end = start + filled
+        return filled
+
+    def readall(self) -> bytes:
+        buf = bytearray(max(self.size - self._pos, 0))
+        n = self.readinto(buf)
+        return bytes(buf[:n])
+
+    def close(self) -> None:
+        self._blocks.clear()
+        super().close()
+
+    def stats(self) -> dict[str, int]:
+        """Block cache counters: hits, misses, ranged GETs issued, and blocks cached."""
+        return {
+            'hits': self._hits,
+            'misses': self._misses,
+            'requests': self._requests,
+            'size': len(self._blocks),
+        }
+
+    def _block(self, index: int, last_needed: int, sequential: bool) -> memoryview:
+        block = self._blocks.get(index)
+        if block is not None:
+            self._blocks.move_to_end(index)
+            self._hits += 1
+            return block
+        self._misses += 1
+
+        # Fetch every uncached block this read still needs, plus the
+        # read-ahead window when access is sequential, in one ranged GET.
+        last_block = (self.size - 1) // self.block_size
+        stop = min(max(last_needed, index + self.read_ahead if sequential else index), last_block)
+        count = 1
+        while index + count <= stop and index + count not in self._blocks and count < self.cache_blocks:
+            count += 1
+        fetched = self._fetch(index, count)
+        for i in range(count):
+            self._blocks[index + i] = fetched[i * self.block_size:(i + 1) * self.block_size]
+        while len(self._blocks) > self.cache_blocks:
+            self._blocks.popitem(last=False)
+        return fetched[:self.block_size]
+
+    def _fetch(self, index: int, count: int) -> memoryview:
+        # Import here to avoid circular dependency
+        from . import PreconditionFailed
+
+        start = index * self.block_size
+        end = min(start + count * self.block_size, self.size) - 1
+        self._requests += 1
+        with self._lease() as conn:
+            data, _ = conn.get_object_into(self.bucket, self.key, if_match=self.etag, byte_range=(start, end))
+        if data is None:
+            raise PreconditionFailed(f"{self.key} changed while open (ETag is no longer {self.etag})")
+        if len(data) != end + 1 - start:
+            raise ValueError(f"Range {start}-{end} of {self.key} returned {len(data)} bytes")
+        return data
@@ -19,8 +19,10 @@ References:
 from hashlib import sha256
 from hmac import new as hmac_new
 from urllib.parse import quote
+import threading
 import time
-from typing import Tuple
+from functools import lru_cache
+from typing import BinaryIO, Generator, Tuple
 
 
 def create_canonical_request(
@@ -59,22 +61,11 @@ def create_canonical_request(
     canonical_query_string = query_string
 
     # 3. Canonical headers - lowercase names, sort alphabetically, trim values
-    canonical_headers_list = []
-    sorted_header_names = sorted(headers.keys(), key=str.lower)
-
-    for header_name in sorted_header_names:
-        # Lowercase the header name
-        canonical_header_name = header_name.lower()
-        # Trim header value (strip leading/trailing whitespace, collapse multiple spaces)
-        # Convert to string first in case it's an integer (like content-length)
-        header_value_str = str(headers[header_name])
-        header_value = ' '.join(header_value_str.split())
-        canonical_headers_list.append(f"{canonical_header_name}:{header_value}")
-
-    canonical_headers = '\n'.join(canonical_headers_list) + '\n'
+    layout = header_layout(tuple(headers))
+    canonical_headers = layout.canonical_headers(headers)
 
     # 4. Signed headers - semicolon-separated list of lowercase header names
-    signed_headers = ';'.join([h.lower() for h in sorted_header_names])
+    signed_headers = layout.signed_headers
 
     # 5. Build the canonical request
     canonical_request = '\n'.join([
@@ -89,6 +80,53 @@ def create_canonical_request(
     return canonical_request, signed_headers
 
 
+class HeaderLayout:
+    """
+    Precompiled canonical header layout for one set of header names.
+
+    Requests made by Connection repeat the same handful of header names
+    (Host, x-amz-date, x-amz-content-sha256, Connection, ...), so the sorted,
+    lowercased name order and the signed-headers string are computed once per
+    name set. Only the values are filled in per request.
+
+    Obtain instances through header_layout(), which caches them.
+    """
+
+    __slots__ = ('names', 'prefixes', 'signed_headers')
+
+    def __init__(self, names: Tuple[str, ...]):
+        sorted_names = sorted(names, key=str.lower)
+        self.names = tuple(sorted_names)
+        self.prefixes = tuple(f"{name.lower()}:" for name in sorted_names)
+        self.signed_headers = ';'.join(name.lower() for name in sorted_names)
+
+    def canonical_headers(self, headers: dict[str, str]) -> str:
+        """
+        Render the canonical headers block for headers with this layout.
+
+        Values are trimmed and have internal whitespace collapsed. Values are
+        converted to strings first in case they are integers (like content-length).
+        """
+        return ''.join([
+            f"{prefix}{' '.join(str(headers[name]).split())}\n"
+            for prefix, name in zip(self.prefixes, self.names)
+        ]) or '\n'
+
+
+@lru_cache(maxsize=256)
+def header_layout(names: Tuple[str, ...]) -> HeaderLayout:
+    """
+    Return the cached HeaderLayout for a tuple of header names.
+
+    Args:
+        names: Header names in the order they appear in the request headers
+
+    Returns:
+        HeaderLayout: The precompiled layout for those names
+    """
+    return HeaderLayout(names)
+
+
 def _create_canonical_uri(uri: str) -> str:
     """
     Create the canonical URI by URI-encoding each path segment.
@@ -191,6 +229,94 @@ def derive_signing_key(secret_key: bytes, date: str, region: str, service: str)
     return k_signing
 
 
+class SigningKeyCache:
+    """
+    Thread-safe cache of derived signing keys.
+
+    A signing key depends only on (secret, date, region, service), so every
+    request made on the same UTC day against the same region can reuse it
+    instead of re-running the four chained HMACs in derive_signing_key().
+
+    Keys roll over at UTC midnight: the first lookup for a new date evicts
+    every key derived for an earlier date, so the cache never holds more
+    than one day's worth of scopes.
+
+    Usage:
+        cache = SigningKeyCache()
+        key = cache.get(secret, "20130524", "us-east-1", "s3")
+        cache.stats()  # {'hits': 0, 'misses': 1, 'size': 1}
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys: dict[Tuple[bytes, str, str, str], bytes] = {}
+        self._date = ""  # Newest date seen, YYYYMMDD
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, secret_key: bytes, date: str, region: str, service: str) -> bytes:
+        """
+        Return the signing key for this scope, deriving it on a miss.
+
+        Args:
+            secret_key: AWS secret access key (bytes)
+            date: Date in YYYYMMDD format (string)
+            region: AWS region (e.g., us-east-1)
+            service: AWS service (e.g., s3)
+
+        Returns:
+            bytes: The derived signing key (32 bytes)
+        """
+        scope = (secret_key, date, region, service)
+        with self._lock:
+            signing_key = self._keys.get(scope)
+            if signing_key is not None:
+                self._hits += 1
+                return signing_key
+            self._misses += 1
+
+        # Derive outside the lock so concurrent misses don't serialize.
+        signing_key = derive_signing_key(secret_key, date, region, service)
+
+        with self._lock:
+            if date > self._date:
+                # UTC midnight rollover — earlier dates will not be signed again.
+                self._keys = {s: k for s, k in self._keys.items() if s[1] >= date}
+                self._date = date
+            self._keys[scope] = signing_key
+        return signing_key
+
+    def clear(self) -> None:
+        """Drop all cached keys and reset counters."""
+        with self._lock:
+            self._keys.clear()
+            self._date = ""
+            self._hits = 0
+            self._misses = 0
+
+    def stats(self) -> dict[str, int]:
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: Cache statistics with keys:
+                - hits: Lookups served from the cache
+                - misses: Lookups that derived a new key
+                - size: Number of keys currently cached
+        """
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'size': len(self._keys),
+            }
+
+
+# Shared by every Connection (and so every ConnectionPool connection) unless
+# a caller supplies its own cache.
+DEFAULT_SIGNING_KEY_CACHE = SigningKeyCache()
+
+
 def calculate_signature(signing_key: bytes, string_to_sign: str) -> str:
     """
     Calculate the final signature using the signing key and string to sign.
@@ -225,7 +351,8 @@ def sign_request_v4(
         secret_key,
         region: str,
         service: str,
-        timestamp: str) -> str:
+        timestamp: str,
+        signing_key_cache: SigningKeyCache | None = None) -> str:
     """
     Complete AWS Signature Version 4 signing process.
 
@@ -243,6 +370,8 @@ def sign_request_v4(
         region: AWS region (e.g., us-east-1)
         service: AWS service (e.g., s3)
         timestamp: ISO 8601 timestamp (YYYYMMDDTHHMMSSZ)
+        signing_key_cache: Optional SigningKeyCache to reuse derived keys.
+                           If None, the key is derived on every call.
 
     Returns:
         str: The complete Authorization header value
@@ -261,7 +390,10 @@ def sign_request_v4(
     )
 
     # Step 3: Derive signing key
-    signing_key = derive_signing_key(secret_key, date, region, service)
+    if signing_key_cache is not None:
+        signing_key = signing_key_cache.get(secret_key, date, region, service)
+    else:
+        signing_key = derive_signing_key(secret_key, date, region, service)
 
     # Step 4: Calculate signature
     signature = calculate_signature(signing_key, string_to_sign)
@@ -278,6 +410,231 @@ def sign_request_v4(
     return authorization_header
 
 
+##################################
+# Query-string (presigned) URLs  #
+##################################
+
+# Longest lifetime S3 accepts for a SigV4 presigned URL (7 days).
+MAX_PRESIGN_EXPIRES = 7 * 24 * 60 * 60
+
+
+class Presigner:
+    """
+    Generate SigV4 query-string authenticated (presigned) URLs in bulk.
+
+    Every URL from one Presigner shares the same timestamp, expiry and
+    credential scope, so the signing key and the X-Amz-* query string are
+    computed once in __init__. Each URL then costs one SHA256 and one
+    HMAC-SHA256.
+
+    Only the host header is signed and the payload is UNSIGNED-PAYLOAD, so
+    the URLs can be used by clients with no credentials.
+
+    Usage:
+        presigner = Presigner(access_id, secret, "us-east-1", expires=3600)
+        for key in keys:
+            url = presigner.url("GET", "mybucket.s3.amazonaws.com", "/" + key)
+    """
+
+    def __init__(
+            self,
+            access_key_id: str,
+            secret_key: bytes,
+            region: str,
+            service: str = "s3",
+            expires: int = 3600,
+            timestamp: str | None = None,
+            signing_key_cache: SigningKeyCache | None = None):
+        """
+        Args:
+            access_key_id: AWS access key ID
+            secret_key: AWS secret access key (bytes)
+            region: AWS region (e.g., us-east-1)
+            service: AWS service (default: s3)
+            expires: Seconds the URLs stay valid, 1 to 604800 (7 days)
+            timestamp: ISO 8601 signing time (YYYYMMDDTHHMMSSZ). Defaults to now.
+            signing_key_cache: Optional SigningKeyCache to reuse derived keys
+
+        Raises:
+            ValueError: If expires is out of range
+        """
+        if not 1 <= expires <= MAX_PRESIGN_EXPIRES:
+            raise ValueError(f"expires must be between 1 and {MAX_PRESIGN_EXPIRES} seconds")
+        self.timestamp = timestamp or get_timestamp()
+        date = self.timestamp[:8]
+        if signing_key_cache is not None:
+            self._signing_key = signing_key_cache.get(secret_key, date, region, service)
+        else:
+            self._signing_key = derive_signing_key(secret_key, date, region, service)
+        self._credential_scope = f"{date}/{region}/{service}/aws4_request"
+        credential = f"{access_key_id}/{self._credential_scope}"
+        # Already in canonical (sorted, encoded) order.
+        self.query_string = '&'.join([
+            "X-Amz-Algorithm=AWS4-HMAC-SHA256",
+            f"X-Amz-Credential={quote(credential, safe='')}",
+            f"X-Amz-Date={self.timestamp}",
+            f"X-Amz-Expires={expires}",
+            "X-Amz-SignedHeaders=host",
+        ])
+        self._string_to_sign_prefix = f"AWS4-HMAC-SHA256\n{self.timestamp}\n{self._credential_scope}\n"
+
+    def signature(self, method: str, host: str, uri: str) -> str:
+        """
+        Calculate the X-Amz-Signature for one request.
+
+        Args:
+            method: HTTP method the URL will be used with (GET, PUT, ...)
+            host: Host the URL points at (e.g. mybucket.s3.amazonaws.com)
+            uri: Absolute, unencoded path (e.g. /photos/cat.jpg)
+
+        Returns:
+            str: The signature as a lowercase hexadecimal string
+        """
+        canonical_request = (
+            f"{method}\n{_create_canonical_uri(uri)}\n{self.query_string}\n"
+            f"host:{host}\n\nhost\nUNSIGNED-PAYLOAD"
+        )
+        string_to_sign = (
+            self._string_to_sign_prefix + sha256(canonical_request.encode('utf-8')).hexdigest()
+        )
+        return calculate_signature(self._signing_key, string_to_sign)
+
+    def url(self, method: str, host: str, uri: str, scheme: str = "https") -> str:
+        """
+        Build a presigned URL.
+
+        Args:
+            method: HTTP method the URL will be used with (GET, PUT, ...)
+            host: Host the URL points at (e.g. mybucket.s3.amazonaws.com)
+            uri: Absolute, unencoded path (e.g. /photos/cat.jpg)
+            scheme: URL scheme (default: https)
+
+        Returns:
+            str: The presigned URL
+        """
+        return (
+            f"{scheme}://{host}{_create_canonical_uri(uri)}?{self.query_string}"
+            f"&X-Amz-Signature={self.signature(method, host, uri)}"
+        )
+
+
+###########################################
+# Streaming (aws-chunked) payload signing #
+###########################################
+
+# x-amz-content-sha256 value announcing a chunk-signed aws-chunked body.
+STREAMING_PAYLOAD = "STREAMING-AWS4-HMAC-SHA256-PAYLOAD"
+
+# S3 requires every chunk except the last to be at least 8 KiB.
+MIN_SIGNED_CHUNK_SIZE = 8 * 1024
+DEFAULT_SIGNED_CHUNK_SIZE = 64 * 1024
+
+_EMPTY_SHA256 = sha256(b"").hexdigest()
+_CHUNK_SIGNATURE_PREFIX = ";chunk-signature="
+
+
+def _chunk_frame_length(size: int) -> int:
+    """Length of one encoded chunk: hex size, signature extension, CRLFs and data."""
+    return len(f"{size:x}") + len(_CHUNK_SIGNATURE_PREFIX) + 64 + 2 + size + 2
+
+
+def aws_chunked_length(decoded_length: int, chunk_size: int) -> int:
+    """
+    Calculate the Content-Length of an aws-chunked body.
+
+    Args:
+        decoded_length: Length of the object data (x-amz-decoded-content-length)
+        chunk_size: Size of every chunk except the last
+
+    Returns:
+        int: Length of the encoded body, including the final zero-length chunk
+    """
+    full_chunks, last_chunk = divmod(decoded_length, chunk_size)
+    length = full_chunks * _chunk_frame_length(chunk_size)
+    if last_chunk:
+        length += _chunk_frame_length(last_chunk)
+    return length + _chunk_frame_length(0)
+
+
+def _read_full(src: BinaryIO, size: int) -> bytes:
+    """Read exactly size bytes unless the stream ends first (pipes return short reads)."""
+    buf = src.read(size)
+    if len(buf) == size or not buf:
+        return buf
+    parts = [buf]
+    remaining = size - len(buf)
+    while remaining:
+        more = src.read(remaining)
+        if not more:
+            break
+        parts.append(more)
+        remaining -= len(more)
+    return b"".join(parts)
+
+
+def sign_chunks(
+        src: BinaryIO,
+        decoded_length: int,
+        chunk_size: int,
+        seed_signature: str,
+        signing_key: bytes,
+        timestamp: str,
+        credential_scope: str) -> Generator[bytes, None, None]:
+    """
+    Encode a stream as an aws-chunked body, signing each chunk as it is read.
+
+    Each chunk's signature chains from the previous one, starting with the
+    seed signature from the request's Authorization header:
+
+        string_to_sign = "AWS4-HMAC-SHA256-PAYLOAD" + "\n" +
+                         timestamp + "\n" +
+                         credential_scope + "\n" +
+                         previous_signature + "\n" +
+                         hex(sha256("")) + "\n" +
+                         hex(sha256(chunk_data))
+
+    Only one chunk is held in memory at a time. The body always ends with a
+    signed zero-length chunk.
+
+    Args:
+        src: Stream to read object data from
+        decoded_length: Number of bytes to read from src
+        chunk_size: Size of every chunk except the last
+        seed_signature: Signature from the Authorization header
+        signing_key: Derived signing key used for the Authorization header
+        timestamp: ISO 8601 timestamp used for the Authorization header
+        credential_scope: date/region/service/aws4_request
+
+    Yields:
+        bytes: One encoded chunk per iteration
+
+    Raises:
+        ValueError: If src ends before decoded_length bytes were read
+    """
+    previous_signature = seed_signature
+    remaining = decoded_length
+    while True:
+        chunk = _read_full(src, min(chunk_size, remaining)) if remaining else b""
+        if remaining and not chunk:
+            raise ValueError(
+                f"Stream ended with {remaining} of {decoded_length} bytes unread"
+            )
+        string_to_sign = '\n'.join([
+            'AWS4-HMAC-SHA256-PAYLOAD',
+            timestamp,
+            credential_scope,
+            previous_signature,
+            _EMPTY_SHA256,
+            sha256(chunk).hexdigest(),
+        ])
+        previous_signature = calculate_signature(signing_key, string_to_sign)
+        header = f"{len(chunk):x}{_CHUNK_SIGNATURE_PREFIX}{previous_signature}\r\n"
+        yield header.encode('ascii') + chunk + b"\r\n"
+        if not chunk:
+            return
+        remaining -= len(chunk)
+
+
 def hash_payload(payload: bytes | str) -> str:
     """
     Calculate the SHA256 hash of a payload.
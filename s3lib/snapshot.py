@@ -0,0 +1,337 @@
+"""
+Local snapshots of bucket listings for s3lib.
+
+A ListingSnapshot keeps the listing of a bucket (or of one prefix) in a
+SQLite file, in a table keyed and sorted by object key, so prefix queries
+are answered by a B-tree search without asking S3.
+
+The snapshot also remembers the pages it was built from: each page covers
+a key range (after, upper] and stores a fingerprint of the keys, sizes,
+ETags and modification times listed in it. Because every range is known,
+a refresh re-lists all pages concurrently with start-after, one request
+per unchanged page, instead of following one continuation token after
+another. Only pages whose fingerprint changed are rewritten. An append-only
+refresh lists just the keys past the snapshot's high-water mark.
+"""
+
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import blake2b
+from itertools import chain
+from typing import Generator, Iterable, Iterator
+
+from .listing import DEFAULT_JOBS, DEFAULT_SHARDS, _plan_ranges
+from .object_info import ObjectInfo
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Fingerprint of a page that has never been listed; matches no listing
+_UNLISTED = b""
+
+_SCHEMA = """
+CREATE TABLE meta (name TEXT PRIMARY KEY, value TEXT) WITHOUT ROWID;
+CREATE TABLE objects (
+    key TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    etag TEXT NOT NULL,
+    last_modified TEXT,
+    storage_class TEXT,
+    checksum_algorithm TEXT,
+    checksum_type TEXT
+) WITHOUT ROWID;
+CREATE TABLE pages (
+    after TEXT PRIMARY KEY,
+    upper TEXT,
+    keys INTEGER NOT NULL,
+    fingerprint BLOB NOT NULL
+) WITHOUT ROWID;
+"""
+
+_OBJECT_COLUMNS = "key, size, etag, last_modified, storage_class, checksum_algorithm, checksum_type"
+
+
+def _fingerprint(objects: Iterable[ObjectInfo]) -> bytes:
+    digest = blake2b(digest_size=16)
+    for obj in objects:
+        digest.update(f"{obj.key}\0{obj.size}\0{obj.etag}\0{obj.last_modified_text}\n".encode())
+    return digest.digest()
+
+
+def _prefix_end(prefix: str) -> str | None:
+    """The smallest key after every key starting with prefix, or None if there is none."""
+    while prefix:
+        c = ord(prefix[-1]) + 1
+        if c <= 0x10FFFF:
+            # Surrogates cannot appear in keys
+            if 0xD800 <= c <= 0xDFFF:
+                c = 0xE000
+            return prefix[:-1] + chr(c)
+        prefix = prefix[:-1]
+    return None
+
+
+class ListingSnapshot:
+    """
+    A bucket listing stored in a local SQLite file and refreshed incrementally.
+
+    Open an existing snapshot with ListingSnapshot(path), or build a new one
+    with ListingSnapshot.create(). Queries are served from the file; only
+    refresh() talks to S3.
+
+    Args:
+        path: Snapshot file written by create()
+
+    Raises:
+        FileNotFoundError: path does not exist
+        ValueError: path is not a listing snapshot
+
+    Usage:
+        with ConnectionPool(access_id, secret, max_connections=8) as pool:
+            if os.path.exists("logs.snapshot"):
+                snapshot = ListingSnapshot("logs.snapshot")
+                snapshot.refresh(pool)
+            else:
+                snapshot = ListingSnapshot.create("logs.snapshot", pool, "mybucket", prefix="logs/")
+        with snapshot:
+            for obj in snapshot.list(prefix="logs/2024-06-"):
+                print(obj.key, obj.size)
+    """
+
+    def __init__(self, path: str):
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        self.path = path
+        self._lock = threading.Lock()
+        # Refresh workers write through this connection, one at a time under _lock
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        try:
+            meta = dict(self._db.execute("SELECT name, value FROM meta").fetchall())
+            self.bucket: str = meta['bucket']
+            self.prefix: str = meta['prefix']
+            self.batch_size = int(meta['batch_size'])
+        except (sqlite3.DatabaseError, KeyError):
+            self._db.close()
+            raise ValueError(f"{path} is not a listing snapshot")
+
+    @classmethod
+    def create(
+        cls,
+        path: str,
+        pool,
+        bucket: str,
+        prefix: str | None = None,
+        shards: int = DEFAULT_SHARDS,
+        jobs: int = DEFAULT_JOBS,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> 'ListingSnapshot':
+        """
+        List bucket into a new snapshot file.
+
+        The key space is split into shards as by list_sharded, and the shards
+        are listed concurrently. Each listed page is stored with its range and
+        fingerprint for later refreshes.
+
+        Args:
+            path: File to create
+            pool: ConnectionPool to lease connections from
+            bucket: S3 bucket name
+            prefix: Only keep keys starting with prefix
+            shards: Number of key ranges the first listing is split into
+            jobs: Number of pages listed concurrently, now and by refresh()
+            batch_size: Keys per page
+
+        Raises:
+            FileExistsError: path already exists
+        """
+        if os.path.exists(path):
+            raise FileExistsError(path)
+        prefix = prefix or ""
+        db = sqlite3.connect(path)
+        try:
+            db.executescript(_SCHEMA)
+            db.executemany("INSERT INTO meta VALUES (?, ?)",
+                           [('bucket', bucket), ('prefix', prefix), ('batch_size', str(batch_size))])
+            db.executemany("INSERT INTO pages VALUES (?, ?, 0, ?)", [
+                ("" if lo is None else prefix + lo, None if hi is None else prefix + hi, _UNLISTED)
+                for (lo, hi) in _plan_ranges(None, shards)
+            ])
+            db.commit()
+        finally:
+            db.close()
+        snapshot = cls(path)
+        snapshot.refresh(pool, jobs=jobs)
+        return snapshot
+
+    def refresh(self, pool, jobs: int = DEFAULT_JOBS, append_only: bool = False) -> dict[str, int]:
+        """
+        Bring the snapshot up to date with the bucket.
+
+        Every stored page is listed again, concurrently, and rewritten only if
+        its fingerprint changed. A page that gained keys is split into as many
+        pages as it now needs. The refresh is one transaction: if it fails,
+        the snapshot is left as it was.
+
+        Args:
+            pool: ConnectionPool to lease connections from
+            jobs: Number of pages listed concurrently
+            append_only: Only list keys after the snapshot's high-water mark,
+                         for buckets where new keys always sort after old
+                         ones (e.g. timestamped logs). Changes to keys
+                         already in the snapshot go unnoticed.
+
+        Returns:
+            dict with pages (pages listed), changed (pages rewritten) and
+            objects (keys now in the snapshot)
+        """
+        with self._lock:
+            rows = self._db.execute("SELECT after, upper, fingerprint FROM pages ORDER BY after").fetchall()
+        try:
+            if append_only:
+                rows = self._open_tail(rows)
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                changed = list(executor.map(lambda row: self._refresh_page(pool, *row), rows))
+            with self._lock:
+                self._db.commit()
+        except BaseException:
+            with self._lock:
+                self._db.rollback()
+            raise
+        return {'pages': len(rows), 'changed': sum(changed), 'objects': self.count()}
+
+    def _open_tail(self, rows: list[tuple]) -> list[tuple]:
+        """
+        The pages that can hold keys after the high-water mark.
+
+        The page holding the high-water mark is closed there, and a new page
+        starting at it takes the rest of its range.
+        """
+        high_water_mark = self.high_water_mark()
+        if high_water_mark is None:
+            return rows
+        # The first page starts at "", before every key
+        index = len(rows)
+        while rows[index - 1][0] >= high_water_mark:
+            index -= 1
+        (after, upper, _) = rows[index - 1]
+        tail = rows[index:]
+        if upper is None or upper > high_water_mark:
+            with self._lock:
+                self._db.execute("UPDATE pages SET upper = ? WHERE after = ?", (high_water_mark, after))
+                self._db.execute("INSERT INTO pages VALUES (?, ?, 0, ?)", (high_water_mark, upper, _UNLISTED))
+            tail.insert(0, (high_water_mark, upper, _UNLISTED))
+        return tail
+
+    def _refresh_page(self, pool, after: str, upper: str | None, fingerprint: bytes) -> bool:
+        """List the page (after, upper] again and rewrite it if it changed."""
+        with pool.lease() as conn:
+            pages = self._list_range(conn, after, upper)
+            first = next(pages, [])
+            second = next(pages, None)
+            if second is None and _fingerprint(first) == fingerprint:
+                return False
+            with self._lock:
+                if upper is None:
+                    self._db.execute("DELETE FROM objects WHERE key > ?", (after,))
+                else:
+                    self._db.execute("DELETE FROM objects WHERE key > ? AND key <= ?", (after, upper))
+                self._db.execute("DELETE FROM pages WHERE after = ?", (after,))
+            # Pages end at their last key, except the last, which keeps the old bound
+            held: list[ObjectInfo] | None = None
+            for page in chain([first], [second] if second else [], pages):
+                if held:
+                    self._write_page(after, held[-1].key, held)
+                    after = held[-1].key
+                held = page
+            self._write_page(after, upper, held or [])
+            return True
+
+    def _list_range(self, conn, after: str, upper: str | None) -> Iterator[list[ObjectInfo]]:
+        """Yield the pages of keys k with after < k <= upper."""
+        token = None
+        while True:
+            (objects, _, token) = conn.list_bucket_page(
+                self.bucket, token, start=after or None, prefix=self.prefix or None, batch_size=self.batch_size)
+            page = []
+            done = token is None
+            for obj in objects:
+                info = ObjectInfo.from_dict(obj)
+                if upper is not None and info.key > upper:
+                    done = True
+                    break
+                page.append(info)
+            if upper is not None and page and page[-1].key == upper:
+                done = True
+            if page:
+                yield page
+            if done:
+                return
+
+    def _write_page(self, after: str, upper: str | None, objects: list[ObjectInfo]) -> None:
+        with self._lock:
+            self._db.executemany(f"INSERT INTO objects ({_OBJECT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)", [
+                (obj.key, obj.size, obj.etag, obj.last_modified_text, obj.storage_class,
+                 obj.checksum_algorithm, obj.checksum_type)
+                for obj in objects
+            ])
+            self._db.execute("INSERT INTO pages VALUES (?, ?, ?, ?)",
+                             (after, upper, len(objects), _fingerprint(objects)))
+
+    def _key_range(self, prefix: str | None) -> tuple[str, str | None]:
+        prefix = self.prefix if prefix is None else prefix
+        if not prefix.startswith(self.prefix):
+            raise ValueError(f"Snapshot {self.path} only holds keys starting with {self.prefix!r}")
+        return (prefix, _prefix_end(prefix))
+
+    def list(self, prefix: str | None = None, start: str | None = None) -> Generator[ObjectInfo, None, None]:
+        """
+        Yield the snapshot's objects in key order.
+
+        Args:
+            prefix: Only objects whose keys start with prefix. Must lie within
+                    the prefix the snapshot was created with.
+            start: Only objects after this key
+
+        Raises:
+            ValueError: prefix is outside the snapshot
+        """
+        (lo, hi) = self._key_range(prefix)
+        query = f"SELECT {_OBJECT_COLUMNS} FROM objects WHERE key >= ? AND key > ?"
+        params: tuple = (lo, start or "")
+        if hi is not None:
+            query += " AND key < ?"
+            params += (hi,)
+        with self._lock:
+            cursor = self._db.execute(query + " ORDER BY key", params)
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(self.batch_size)
+            if not rows:
+                return
+            for row in rows:
+                yield ObjectInfo(row[0], row[1], row[2], *row[3:])
+
+    def count(self, prefix: str | None = None) -> int:
+        """Number of objects in the snapshot whose keys start with prefix."""
+        (lo, hi) = self._key_range(prefix)
+        with self._lock:
+            if hi is None:
+                row = self._db.execute("SELECT COUNT(*) FROM objects WHERE key >= ?", (lo,)).fetchone()
+            else:
+                row = self._db.execute("SELECT COUNT(*) FROM objects WHERE key >= ? AND key < ?", (lo, hi)).fetchone()
+            return row[0]
+
+    def high_water_mark(self) -> str | None:
+        """The last key in the snapshot, or None if it is empty."""
+        with self._lock:
+            return self._db.execute("SELECT MAX(key) FROM objects").fetchone()[0]
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,14 +1,24 @@
-from binascii import b2a_base64
 from http.client import HTTPResponse
+from io import BufferedIOBase
 from pathlib import Path
-from . import Connection, LIST_BUCKET_ATTRIBUTES, LIST_BUCKET_CHECKSUM_ATTRIBUTES, LIST_BUCKET_KEY, sign
+from . import Connection, ConnectionPool, LIST_BUCKET_ATTRIBUTES, LIST_BUCKET_CHECKSUM_ATTRIBUTES, LIST_BUCKET_KEY, sign
+from . import PreconditionFailed, S3ByteStream, _check_digest, _expected_checksum, _new_hasher
+from .utils import lower_headers
+from .delete import delete_parallel, delete_prefix
+from .download import download_parallel
+from .listing import list_parallel, list_sharded
+from .multipart import upload_multipart
+from .snapshot import ListingSnapshot
+from .usage import disk_usage
+from .sigv4 import DEFAULT_SIGNED_CHUNK_SIZE, Presigner
 from base64 import b64encode
 from docopt import docopt
-from json import dumps
-from os import PathLike, environ
-from os.path import expanduser
+from json import dumps, loads
+from os import PathLike, environ, remove, stat
+from os.path import exists, expanduser
 from safeoutput import open as safeopen
 import sys
+from stat import S_ISREG
 from typing import BinaryIO, Tuple, cast
 
 
@@ -47,11 +57,22 @@ def load_creds(path: PathLike | None) -> Tuple[str, bytes]:
 _BUFFSIZE = 65536
 
 
-def copy(src: BinaryIO, dst: BinaryIO):
-    buf = src.read(_BUFFSIZE)
-    while len(buf) > 0:
-        dst.write(buf)
-        buf = src.read(_BUFFSIZE)
+def _copy_chunks(src: BufferedIOBase | S3ByteStream):
+    """
+    Yield successive chunks of src as views of one reusable buffer.
+
+    Each view is only valid until the next chunk is requested.
+    """
+    buf = memoryview(bytearray(_BUFFSIZE))
+    n = src.readinto(buf)
+    while n > 0:
+        yield buf[:n]
+        n = src.readinto(buf)
+
+
+def copy(src: BufferedIOBase, dst: BinaryIO):
+    for chunk in _copy_chunks(src):
+        dst.write(chunk)
 
 
 LS_USAGE = """
@@ -68,6 +89,22 @@ Options:
     --mark=<mark>       Starting point for enumeration.
     --prefix=<prefix>   Prefix to match on.
     --batch=<batch>     Batch size for s3 queries [default: 1000].
+    --jobs=<jobs>       List up to this many "/"-separated prefixes
+                        concurrently [default: 1].
+    --unordered         With --jobs, print keys as they arrive instead of in
+                        key order.
+    --shards=<shards>   With --jobs, split the key range into this many shards
+                        instead of fanning out over "/"-separated prefixes.
+                        Suits flat buckets with hash-like keys.
+    --snapshot=<path>   Keep the listing in a local snapshot file: list the
+                        bucket into it on the first run, refresh it on later
+                        runs, then print from it. --prefix on the first run
+                        limits the snapshot to that prefix.
+    --refresh=<mode>    With --snapshot: "full" re-lists every stored page
+                        concurrently and rewrites the changed ones, "append"
+                        only lists keys after the last stored key, "none"
+                        prints the snapshot without contacting S3
+                        [default: full].
     --http              Use HTTP instead of HTTPS (useful in VPCs).
 
 Available fields:
@@ -83,6 +120,13 @@ def ls_main(argv=None) -> None:
     args = docopt(LS_USAGE, argv)
     (access_id, secret_key) = load_creds(args.get('--creds'))
     use_ssl = not args.get('--http')
+    jobs = int(args['--jobs'])
+    if args.get('--snapshot') and args.get('<bucket>'):
+        _ls_snapshot(args, access_id, secret_key, use_ssl, jobs)
+        return
+    if jobs > 1 and args.get('<bucket>'):
+        _ls_parallel(args, access_id, secret_key, use_ssl, jobs)
+        return
     with Connection(access_id, secret_key, args.get('--host'), args.get('--port'), use_ssl=use_ssl) as s3:
         with safeopen(args.get('--output')) as outfile:
             bucket = args.get('<bucket>')
@@ -91,21 +135,131 @@ def ls_main(argv=None) -> None:
                                        start=args.get('--mark'),
                                        prefix=args.get('--prefix'),
                                        batch_size=args.get('--batch'))
-                fields = args.get('<field>') or [LIST_BUCKET_KEY]
-                for obj in objs:
-                    #  Use empty string for missing fields (e.g., checksums not present)
-                    selected = [obj.get(field) or '' for field in fields]
-                    print("\t".join(selected), file=outfile)
+                _print_objects(objs, args.get('<field>') or [LIST_BUCKET_KEY], outfile)
             else:
                 buckets = s3.list_buckets()
                 for bucket in buckets:
                     print(bucket, file=outfile)
 
 
+def _ls_parallel(args, access_id, secret_key, use_ssl, jobs: int) -> None:
+    with ConnectionPool(access_id, secret_key, args.get('--host'), args.get('--port'),
+                        max_connections=jobs, use_ssl=use_ssl) as pool:
+        with safeopen(args.get('--output')) as outfile:
+            if args.get('--shards'):
+                objs = list_sharded(pool, args['<bucket>'],
+                                    prefix=args.get('--prefix'),
+                                    start=args.get('--mark'),
+                                    shards=int(args['--shards']),
+                                    jobs=jobs,
+                                    ordered=not args.get('--unordered'),
+                                    batch_size=args.get('--batch'))
+            else:
+                objs = list_parallel(pool, args['<bucket>'],
+                                     prefix=args.get('--prefix'),
+                                     start=args.get('--mark'),
+                                     jobs=jobs,
+                                     ordered=not args.get('--unordered'),
+                                     batch_size=args.get('--batch'))
+            _print_objects(objs, args.get('<field>') or [LIST_BUCKET_KEY], outfile)
+
+
+def _ls_snapshot(args, access_id, secret_key, use_ssl, jobs: int) -> None:
+    path = args['--snapshot']
+    bucket = args['<bucket>']
+    mode = args['--refresh']
+    if mode not in ("full", "append", "none"):
+        raise ValueError(f"Invalid --refresh mode '{mode}': expected full, append or none")
+    if exists(path):
+        snapshot = ListingSnapshot(path)
+        if snapshot.bucket != bucket:
+            snapshot.close()
+            raise ValueError(f"Snapshot {path} lists bucket {snapshot.bucket}, not {bucket}")
+        if mode != "none":
+            with ConnectionPool(access_id, secret_key, args.get('--host'), args.get('--port'),
+                                max_connections=jobs, use_ssl=use_ssl) as pool:
+                snapshot.refresh(pool, jobs=jobs, append_only=(mode == "append"))
+    else:
+        with ConnectionPool(access_id, secret_key, args.get('--host'), args.get('--port'),
+                            max_connections=jobs, use_ssl=use_ssl) as pool:
+            snapshot = ListingSnapshot.create(path, pool, bucket,
+                                              prefix=args.get('--prefix'),
+                                              shards=int(args.get('--shards') or jobs),
+                                              jobs=jobs,
+                                              batch_size=int(args['--batch']))
+    with snapshot, safeopen(args.get('--output')) as outfile:
+        objs = (obj.to_dict() for obj in snapshot.list(prefix=args.get('--prefix'), start=args.get('--mark')))
+        _print_objects(objs, args.get('<field>') or [LIST_BUCKET_KEY], outfile)
+
+
+def _print_objects(objs, fields: list[str], outfile) -> None:
+    for obj in objs:
+        #  Use empty string for missing fields (e.g., checksums not present)
+        selected = [obj.get(field) or '' for field in fields]
+        print("\t".join(selected), file=outfile)
+
+
+DU_USAGE = """
+s3du -- Program summarizes object counts and bytes per prefix in an s3 bucket.
+
+Usage:
+    s3du [options] <bucket>
+
+Options:
+    --host=<host>           Name of host.
+    --port=<port>           Port to connect to.
+    --output=<output>       Name of output.
+    --creds=<creds>         Name of file to find aws access id and secret key.
+    --prefix=<prefix>       Only count keys starting with prefix.
+    --depth=<depth>         Group keys by this many delimiter-separated levels
+                            below --prefix [default: 1].
+    --delimiter=<delim>     Separator between levels [default: /].
+    --batch=<batch>         Batch size for s3 queries [default: 1000].
+    --jobs=<jobs>           List this many key-range shards concurrently
+                            [default: 8].
+    --shards=<shards>       Split the key range into this many shards
+                            [default: 16].
+    --top=<n>               Only report the n prefixes with the most bytes,
+                            largest first.
+    --format=<format>       Report as "tsv" (prefix, objects, bytes, largest)
+                            or "json", which adds size histograms and a
+                            total [default: tsv].
+    --http                  Use HTTP instead of HTTPS (useful in VPCs).
+"""
+
+
+def du_main(argv=None) -> None:
+    args = docopt(DU_USAGE, argv)
+    (access_id, secret_key) = load_creds(args.get('--creds'))
+    use_ssl = not args.get('--http')
+    report_format = args['--format']
+    if report_format not in ("tsv", "json"):
+        raise ValueError(f"Invalid --format '{report_format}': expected tsv or json")
+    jobs = int(args['--jobs'])
+    with ConnectionPool(access_id, secret_key, args.get('--host'), args.get('--port'),
+                        max_connections=max(jobs, 1), use_ssl=use_ssl) as pool:
+        summary = disk_usage(pool, args['<bucket>'],
+                             prefix=args.get('--prefix'),
+                             depth=int(args['--depth']),
+                             delimiter=args['--delimiter'],
+                             shards=int(args['--shards']),
+                             jobs=jobs,
+                             batch_size=int(args['--batch']))
+    groups = summary.top(int(args['--top'])) if args.get('--top') else summary.by_prefix()
+    with safeopen(args.get('--output')) as outfile:
+        if report_format == "json":
+            report = {'groups': [group.to_dict() for group in groups], 'total': summary.total.to_dict()}
+            print(dumps(report, indent=2), file=outfile)
+        else:
+            for group in groups:
+                print(f"{group.prefix}\t{group.count}\t{group.bytes}\t{group.largest}", file=outfile)
+
+
 GET_USAGE = """
 s3get -- Program reads an object in an s3 bucket.
 
 Usage:
+    s3get --many [options] <bucket> <dir>
     s3get [options] <bucket> <key> [<file>]
 
 Options:
@@ -116,6 +270,15 @@ Options:
     --if-match=<etag>       Only download if ETag matches (error if changed)
     --if-none-match=<etag>  Skip download if ETag matches (for caching)
     --range=<range>         Byte range to fetch, e.g. 0-499, 500-, -999
+    --jobs=<jobs>           Byte ranges to download concurrently when writing to
+                            a file [default: 1].
+    --resume                Continue an interrupted download into <file>. The
+                            object's ETag is kept in <file>.s3get until the
+                            download completes.
+    --many                  Read keys from stdin, one per line, and write each
+                            object to <dir>/<key>.
+    --prefetch=<n>          With --many, objects fetched ahead of the one being
+                            written [default: 8].
     --http                  Use HTTP instead of HTTPS (useful in VPCs).
 """
 
@@ -125,60 +288,44 @@ def verified_copy(src: HTTPResponse, dst: BinaryIO, verify: bool = True) -> None
     Copy from HTTP response to destination, optionally verifying checksum.
 
     Args:
-        src: HTTPResponse object (has .getheaders() and .read())
+        src: HTTPResponse object (has .getheaders() and .readinto())
         dst: File-like object to write to
         verify: If True, verify x-amz-checksum-sha256/sha1/md5 if present
 
     Raises:
         ValueError: If checksum verification fails
     """
-    # Check for available checksums (prefer SHA256 > SHA1 > MD5)
-    headers = dict(src.getheaders())
-    expected_checksum = None
-    algorithm = None
-
-    if headers.get('x-amz-checksum-sha256'):
-        expected_checksum = headers.get('x-amz-checksum-sha256')
-        algorithm = 'SHA256'
-    elif headers.get('x-amz-checksum-sha1'):
-        expected_checksum = headers.get('x-amz-checksum-sha1')
-        algorithm = 'SHA1'
-    elif headers.get('x-amz-checksum-md5'):
-        expected_checksum = headers.get('x-amz-checksum-md5')
-        algorithm = 'MD5'
+    algorithm, expected_checksum = _expected_checksum(dict(src.getheaders()))
 
     if verify and expected_checksum and algorithm:
         # Copy while hashing
-        if algorithm == 'SHA256':
-            from hashlib import sha256
-            hasher = sha256()
-        elif algorithm == 'SHA1':
-            from hashlib import sha1
-            hasher = sha1()
-        elif algorithm == 'MD5':
-            from hashlib import md5
-            hasher = md5()
-
-        buf = src.read(_BUFFSIZE)
-        while len(buf) > 0:
-            hasher.update(buf)
-            dst.write(buf)
-            buf = src.read(_BUFFSIZE)
-
-        # Verify
-        actual_checksum = b2a_base64(hasher.digest()).strip().decode('ascii')
-        if actual_checksum != expected_checksum:
-            raise ValueError(
-              f"Checksum verification failed!\n"
-              f"Algorithm: {algorithm}\n"
-              f"Expected:  {expected_checksum}\n"
-              f"Actual:    {actual_checksum}"
-            )
+        hasher = _new_hasher(algorithm)
+        for chunk in _copy_chunks(src):
+            hasher.update(chunk)
+            dst.write(chunk)
+        _check_digest(algorithm, expected_checksum, hasher.digest())
     else:
         # No checksum or verification disabled - just copy
         copy(src, dst)
 
 
+def verify_file(path: PathLike, headers: dict[str, str]) -> None:
+    """
+    Verify a downloaded file against the checksum in the object's headers.
+
+    Raises:
+        ValueError: If checksum verification fails
+    """
+    algorithm, expected_checksum = _expected_checksum(headers)
+    if algorithm is None or expected_checksum is None:
+        return
+    hasher = _new_hasher(algorithm)
+    with open(path, 'rb') as f:
+        while buf := f.read(1024 * 1024):
+            hasher.update(buf)
+    _check_digest(algorithm, expected_checksum, hasher.digest())
+
+
 def _parse_range(range_str: str) -> Tuple[int | None, int | None]:
     """Parse a range string like '0-499', '500-', or '-999' into a (start, end) tuple."""
     parts = range_str.split('-', 1)
@@ -198,10 +345,30 @@ def get_main(argv=None) -> None:
     verify = not args.get('--no-verify-checksum')
     use_ssl = not args.get('--http')
 
+    if args.get('--many'):
+        _get_many(args, access_id, secret_key, use_ssl, verify)
+        return
+
     byte_range = None
     if args.get('--range'):
         byte_range = _parse_range(args['--range'])
 
+    if args.get('--resume'):
+        if file_path is None or byte_range is not None or args.get('--if-none-match'):
+            raise ValueError("--resume needs a <file> and cannot be combined with --range or --if-none-match")
+        if_match = args.get('--if-match')
+        with Connection(access_id, secret_key, args.get('--host'), args.get('--port'), use_ssl=use_ssl) as s3:
+            if not get_resumable(s3, args['<bucket>'], args['<key>'], file_path, verify=verify,
+                                 if_match=if_match.strip('"') if if_match else None):
+                print("412 Precondition Failed - ETag mismatch", file=sys.stderr)
+                sys.exit(1)
+        return
+
+    jobs = int(args['--jobs'])
+    if jobs > 1 and file_path is not None and byte_range is None and not args.get('--if-none-match'):
+        _get_parallel(args, access_id, secret_key, use_ssl, jobs, verify)
+        return
+
     with Connection(access_id, secret_key, args.get('--host'), args.get('--port'), use_ssl=use_ssl) as s3:
         # Use structured API for conditional requests
         # User provides ETags from command line (may or may not have quotes)
@@ -241,6 +408,153 @@ def get_main(argv=None) -> None:
                 verified_copy(response, outfile, verify=verify)
 
 
+def _get_parallel(args, access_id, secret_key, use_ssl, jobs: int, verify: bool) -> None:
+    file_path = args['<file>']
+    if_match = args.get('--if-match')
+    if if_match:
+        if_match = if_match.strip('"')
+    with ConnectionPool(access_id, secret_key, args.get('--host'), args.get('--port'),
+                        max_connections=jobs, use_ssl=use_ssl) as pool:
+        with open(file_path, 'wb') as outfile:
+            try:
+                headers = download_parallel(pool, args['<bucket>'], args['<key>'], outfile,
+                                            jobs=jobs, if_match=if_match)
+            except PreconditionFailed:
+                print("412 Precondition Failed - ETag mismatch", file=sys.stderr)
+                sys.exit(1)
+    if verify:
+        verify_file(file_path, headers)
+
+
+def _get_many(args, access_id, secret_key, use_ssl, verify: bool) -> None:
+    """Download every key on stdin into a directory, prefetching ahead of the writes."""
+    directory = Path(args['<dir>'])
+    prefetch = int(args['--prefetch'])
+    keys = (line.rstrip("\n") for line in sys.stdin)
+    with ConnectionPool(access_id, secret_key, args.get('--host'), args.get('--port'),
+                        max_connections=prefetch + 1, use_ssl=use_ssl) as pool:
+        for key, body, _ in pool.get_objects(args['<bucket>'], (key for key in keys if key),
+                                             prefetch=prefetch, verify=verify):
+            path = _many_path(directory, key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'wb') as outfile:
+                if isinstance(body, bytes):
+                    outfile.write(body)
+                else:
+                    with body:
+                        copy(body, outfile)
+
+
+def _many_path(directory: Path, key: str) -> Path:
+    """Path of key under directory, refusing keys that would escape it."""
+    parts = key.split("/")
+    if key.startswith("/") or any(part in ("", ".", "..") for part in parts):
+        raise ValueError(f"Refusing to write key {key!r} outside {directory}")
+    return directory.joinpath(*parts)
+
+
+RESUME_SUFFIX = ".s3get"
+
+
+def _load_resume_state(sidecar: str) -> dict | None:
+    try:
+        with open(sidecar, 'r') as f:
+            return loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def get_resumable(s3: Connection, bucket: str, key: str, file_path: str,
+                  verify: bool = True, if_match: str | None = None) -> bool:
+    """
+    Download an object into file_path, continuing an earlier partial download.
+
+    While a download is in progress, the object's ETag, size and checksum are
+    kept in a sidecar file, file_path + RESUME_SUFFIX. If the sidecar exists,
+    only the bytes past the end of file_path are fetched, pinned with
+    If-Match to the recorded ETag. If the object has changed since, the
+    partial file is discarded and the object is downloaded in full. The
+    sidecar is removed once the download completes.
+
+    Checksum verification hashes the existing prefix from disk, then the
+    remaining bytes as they arrive, so resuming costs no extra pass.
+
+    Args:
+        s3: Open Connection
+        bucket: S3 bucket name
+        key: Object key
+        file_path: Destination file
+        verify: Verify the object's full-object checksum, if it has one
+        if_match: ETag (without quotes) the object must have
+
+    Returns:
+        True once file_path holds the object; False if if_match did not match
+
+    Raises:
+        ChecksumMismatch: If checksum verification fails. The sidecar is
+                          removed, so the next attempt starts over.
+    """
+    sidecar = file_path + RESUME_SUFFIX
+    state = _load_resume_state(sidecar)
+    if state is not None and (if_match is None or if_match == state['etag']):
+        try:
+            offset = stat(file_path).st_size
+        except OSError:
+            offset = 0
+        if offset > state['size']:
+            offset = 0
+        if offset == state['size']:
+            # Interrupted after the last byte; nothing left to fetch
+            _resume_copy(None, file_path, offset, state, sidecar, verify)
+            return True
+        stream, _ = s3.get_object2(bucket, key, if_match=state['etag'], byte_range=(offset, None))
+        if stream is not None:
+            _resume_copy(stream, file_path, offset, state, sidecar, verify)
+            return True
+        print("Object changed since the partial download, restarting", file=sys.stderr)
+
+    stream, headers = s3.get_object2(bucket, key, if_match=if_match)
+    if stream is None:
+        return False
+    lowered = lower_headers(headers)
+    state = {
+        'etag': lowered.get('etag', '').strip('"'),
+        'size': int(lowered['content-length']),
+        'checksum': _expected_checksum(lowered),
+    }
+    with open(sidecar, 'w') as f:
+        f.write(dumps(state))
+    _resume_copy(stream, file_path, 0, state, sidecar, verify)
+    return True
+
+
+def _resume_copy(stream: S3ByteStream | None, file_path: str, offset: int, state: dict,
+                 sidecar: str, verify: bool) -> None:
+    algorithm, expected_checksum = state['checksum']
+    hasher = _new_hasher(algorithm) if verify and algorithm else None
+    if offset == 0:
+        open(file_path, 'wb').close()
+    with open(file_path, 'r+b') as outfile:
+        if hasher is not None:
+            # Hash the bytes already on disk
+            buf = memoryview(bytearray(_BUFFSIZE))
+            remaining = offset
+            while remaining and (n := outfile.readinto(buf[:min(remaining, _BUFFSIZE)])):
+                hasher.update(buf[:n])
+                remaining -= n
+        outfile.seek(offset)
+        outfile.truncate()
+        if stream is not None:
+            with stream:
+                for chunk in _copy_chunks(stream):
+                    if hasher is not None:
+                        hasher.update(chunk)
+                    outfile.write(chunk)
+    remove(sidecar)
+    if hasher is not None:
+        _check_digest(algorithm, expected_checksum, hasher.digest())
+
+
 CP_USAGE = """
 s3cp -- Program copies an object from one location to another.
 
@@ -312,13 +626,23 @@ Usage:
     s3put [options] [--header=<header>]... <bucket> <object> [<file>]
 
 Options:
-    --host=<host>       Name of host.
-    --port=<port>       Port to connect to.
-    --creds=<creds>     Name of file to find aws access id and secret key.
-    --no-checksum       Disable checksum calculation (for stdin uploads)
-    --create-only       Only upload if object doesn't exist (returns 412 if exists)
-    --if-match=<etag>   Only upload if current ETag matches (optimistic locking)
-    --http              Use HTTP instead of HTTPS (useful in VPCs).
+    --host=<host>                  Name of host.
+    --port=<port>                  Port to connect to.
+    --creds=<creds>                Name of file to find aws access id and secret key.
+    --no-checksum                  Disable checksum calculation (for stdin uploads)
+    --create-only                  Only upload if object doesn't exist (returns 412 if exists)
+    --if-match=<etag>              Only upload if current ETag matches (optimistic locking)
+    --streaming                    Sign the upload chunk by chunk as it streams (aws-chunked).
+                                   Reads stdin with constant memory instead of buffering it.
+    --multipart                    Use a parallel multipart upload for inputs of at least
+                                   the multipart threshold. The object's ETag then gets a
+                                   part count suffix and its checksum is composite, not
+                                   the SHA256 of the whole object.
+    --multipart-threshold=<bytes>  With --multipart, the smallest input uploaded in parts
+                                   [default: 67108864].
+    --part-size=<bytes>            Multipart part size [default: 16777216].
+    --jobs=<jobs>                  Parts to upload concurrently [default: 4].
+    --http                         Use HTTP instead of HTTPS (useful in VPCs).
 """
 
 
@@ -341,6 +665,50 @@ def put_main(argv=None) -> None:
         except ValueError:
             raise ValueError("Header '%s' is not of form key:value" % header)
 
+    file_path = args.get('<file>')
+    multipart_threshold = int(args['--multipart-threshold'])
+    # Multipart uploads have no single-PUT conditional or aws-chunked equivalent.
+    multipart_allowed = args.get('--multipart') and not (
+        args.get('--streaming') or args.get('--create-only') or args.get('--if-match'))
+
+    if not multipart_allowed:
+        _put_single(args, access_id, secret_key, use_ssl, headers, None)
+    elif file_path is None:
+        # Only stdin streams of at least the threshold go multipart; read that much to find out.
+        stdin = get_input_fd(None)
+        head = stdin.read(multipart_threshold)
+        if len(head) >= multipart_threshold:
+            _put_multipart(args, access_id, secret_key, use_ssl, headers, stdin, head)
+            return
+        _put_single(args, access_id, secret_key, use_ssl, headers, head)
+    elif _is_large_file(file_path, multipart_threshold):
+        with open(file_path, 'rb') as data:
+            _put_multipart(args, access_id, secret_key, use_ssl, headers, data, b"")
+    else:
+        _put_single(args, access_id, secret_key, use_ssl, headers, None)
+
+
+def _is_large_file(path, threshold: int) -> bool:
+    st = stat(path)
+    return S_ISREG(st.st_mode) and st.st_size >= threshold
+
+
+def _put_multipart(args, access_id, secret_key, use_ssl, headers, data, head: bytes) -> None:
+    jobs = int(args['--jobs'])
+    with ConnectionPool(access_id, secret_key, args.get('--host'), args.get('--port'),
+                        max_connections=jobs, use_ssl=use_ssl) as pool:
+        result = upload_multipart(pool, args.get('<bucket>'), args.get('<object>'), data,
+                                  part_size=int(args['--part-size']), jobs=jobs,
+                                  headers=headers or None, head=head)
+    print("HTTP Code: ", result['status'])
+    print('etag: "%s"' % result['etag'])
+    if result['checksum']:
+        print("checksum: %s" % result['checksum'])
+    if result['version_id']:
+        print("x-amz-version-id: %s" % result['version_id'])
+
+
+def _put_single(args, access_id, secret_key, use_ssl, headers, stdin_data: bytes | None) -> None:
     with Connection(access_id, secret_key, args.get('--host'), args.get('--port'), use_ssl=use_ssl) as s3:
         file_path = args.get('<file>')
 
@@ -361,9 +729,19 @@ def put_main(argv=None) -> None:
         if if_match:
             if_match = if_match.strip('"')
 
+        # Streaming uploads sign each chunk as it is read, so the payload is
+        # signed without buffering stdin or hashing the file up front.
+        signed_chunk_size = DEFAULT_SIGNED_CHUNK_SIZE if args.get('--streaming') else None
+
         # Read stdin into bytes so checksums can be calculated
         # For regular files, pass file object to avoid memory issues
-        if file_path is None:
+        data: bytes | BinaryIO
+        if stdin_data is not None:
+            # stdin already read by put_main while checking the multipart threshold
+            data = stdin_data
+        elif file_path is None and signed_chunk_size is not None:
+            data = get_input_fd(None)
+        elif file_path is None:
             # stdin - read into bytes for checksum calculation
             if hasattr(sys.stdin, 'buffer'):
                 data = sys.stdin.buffer.read()
@@ -381,11 +759,12 @@ def put_main(argv=None) -> None:
               headers,
               checksum_algorithm=checksum_algorithm,
               if_none_match=args.get('--create-only'),
-              if_match=if_match
+              if_match=if_match,
+              signed_chunk_size=signed_chunk_size,
             )
         finally:
             # Close file if we opened it
-            if file_path is not None and hasattr(data, 'close'):
+            if file_path is not None and not isinstance(data, bytes):
                 data.close()
         print("HTTP Code: ", status)
         for (header, value) in resp_headers:
@@ -397,14 +776,22 @@ s3rm -- Program deletes s3 keys.
 
 Usage:
     s3rm [options] <bucket> <object>...
+    s3rm [options] --prefix=<prefix> <bucket>
 
 Options:
-    --host=<host>       Name of host.
-    --port=<port>       Port to connect to.
-    --creds=<creds>     Name of file to find aws access id and secret key.
-    -v, --verbose       Be verbose when deleting files, showing them as they are removed.
-    --batch=<batch>     Batch size for s3 queries [default: 500].
-    --http              Use HTTP instead of HTTPS (useful in VPCs).
+    --host=<host>         Name of host.
+    --port=<port>         Port to connect to.
+    --creds=<creds>       Name of file to find aws access id and secret key.
+    -v, --verbose         Be verbose when deleting files, showing them as they are removed.
+    --batch=<batch>       Batch size for s3 queries [default: 500].
+    --jobs=<jobs>         Delete this many batches concurrently, retrying keys
+                          that fail to delete. Results are printed as batches
+                          complete, not in argument order [default: 1].
+    --prefix=<prefix>     Delete every key starting with prefix, listing the
+                          next page while the last one is deleted.
+    --checkpoint=<file>   With --prefix, save progress to file, and resume from
+                          it if it exists. Removed once every key is deleted.
+    --http                Use HTTP instead of HTTPS (useful in VPCs).
 """
 
 
@@ -412,6 +799,27 @@ def rm_main(argv=None) -> None:
     args = docopt(RM_USAGE, argv)
     (access_id, secret_key) = load_creds(args.get('--creds'))
     use_ssl = not args.get('--http')
+    jobs = int(args['--jobs'])
+    if args.get('--prefix') is not None:
+        # One more connection for the listing
+        with ConnectionPool(access_id, secret_key, args.get('--host'), args.get('--port'),
+                            max_connections=jobs + 1, use_ssl=use_ssl) as pool:
+            for (key, result) in delete_prefix(pool, args['<bucket>'], args['--prefix'],
+                                               jobs=jobs,
+                                               batch_size=int(args['--batch']),
+                                               quiet=not args.get('--verbose'),
+                                               checkpoint=args.get('--checkpoint')):
+                print(key, result)
+        return
+    if jobs > 1:
+        with ConnectionPool(access_id, secret_key, args.get('--host'), args.get('--port'),
+                            max_connections=jobs, use_ssl=use_ssl) as pool:
+            for (key, result) in delete_parallel(pool, args['<bucket>'], args['<object>'],
+                                                 jobs=jobs,
+                                                 batch_size=int(args['--batch']),
+                                                 quiet=not args.get('--verbose')):
+                print(key, result)
+        return
     with Connection(access_id, secret_key, args.get('--host'), args.get('--port'), use_ssl=use_ssl) as s3:
         batch_size_str = args.get('--batch')
         assert batch_size_str is not None  # docopt provides default string.
@@ -423,18 +831,36 @@ def rm_main(argv=None) -> None:
 
 
 SIGN_USAGE = """
-s3sign -- Sign an S3 form.
+s3sign -- Sign an S3 form, or presign URLs for keys read from stdin.
 
 Usage:
+    s3sign --presign [options] <bucket>
     s3sign [options] <file>
 
 Options:
-    --creds=<creds>     Name of file to find aws access id and secret key.
+    --creds=<creds>       Name of file to find aws access id and secret key.
+    --presign             Read keys from stdin, one per line, and print a
+                          presigned URL for each.
+    --method=<method>     HTTP method the presigned URLs allow [default: GET].
+    --expires=<seconds>   Lifetime of presigned URLs, at most 604800 [default: 3600].
+    --host=<host>         Name of host.
+    --region=<region>     AWS region of the bucket.
+    --http                Presign http:// URLs instead of https://.
 """
 
 
+def _presign_host(bucket: str, host: str | None, region: str) -> str:
+    """Virtual-hosted endpoint for bucket, matching the one Connection sends requests to."""
+    if host is None and region != "us-east-1":
+        return f"{bucket}.s3-{region}.amazonaws.com"
+    return f"{bucket}.{host or 's3.amazonaws.com'}"
+
+
 def sign_main(argv=None) -> None:
     args = docopt(SIGN_USAGE, argv)
+    if args.get('--presign'):
+        presign_main(args)
+        return
     (_, secret_key) = load_creds(args.get('--creds'))
     file_path = args.get('<file>')
     assert file_path is not None  # docopt ensures required arg
@@ -444,3 +870,19 @@ def sign_main(argv=None) -> None:
     signature = sign(secret_key, policy)
     print(policy.decode())
     print(signature.decode())
+
+
+def presign_main(args) -> None:
+    """Write one presigned URL per key on stdin, all signed with one derived key."""
+    (access_id, secret_key) = load_creds(args.get('--creds'))
+    bucket = args['<bucket>']
+    region = args.get('--region') or environ.get("AWS_DEFAULT_REGION") or "us-east-1"
+    host = _presign_host(bucket, args.get('--host'), region)
+    method = args['--method'].upper()
+    scheme = "http" if args.get('--http') else "https"
+    presigner = Presigner(access_id, secret_key, region, expires=int(args['--expires']))
+    write = sys.stdout.write
+    for line in sys.stdin:
+        key = line.rstrip("\n")
+        if key:
+            write(presigner.url(method, host, "/" + key, scheme) + "\n")
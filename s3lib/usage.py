@@ -0,0 +1,163 @@
+"""
+Storage usage per prefix for s3lib.
+
+disk_usage lists a bucket and folds every object into the group for its
+prefix at a given depth, keeping only a count, a byte total, the largest
+size and a power-of-two size histogram per group. Memory therefore grows
+with the number of groups, not the number of objects, and the listing is
+consumed as it streams in, over parallel shards of a ConnectionPool.
+"""
+
+from array import array
+from typing import Iterable, Tuple
+
+from .listing import DEFAULT_JOBS, DEFAULT_SHARDS, list_sharded
+
+DEFAULT_DELIMITER = "/"
+
+# Sizes are binned by bit length: bin 0 holds empty objects and bin i holds
+# sizes in [2**(i - 1), 2**i), which covers every size below 2**63.
+HISTOGRAM_BINS = 64
+
+
+class PrefixUsage:
+    """
+    Totals for the objects under one prefix.
+
+    Attributes:
+        prefix: Group prefix
+        count: Number of objects
+        bytes: Total size in bytes
+        largest: Size of the largest object
+        histogram: array('q') of object counts per size bin; see
+                   histogram_items()
+    """
+
+    __slots__ = ('prefix', 'count', 'bytes', 'largest', 'histogram')
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        self.count = 0
+        self.bytes = 0
+        self.largest = 0
+        self.histogram = array('q', bytes(8 * HISTOGRAM_BINS))
+
+    def add(self, size: int) -> None:
+        self.count += 1
+        self.bytes += size
+        if size > self.largest:
+            self.largest = size
+        self.histogram[size.bit_length()] += 1
+
+    def histogram_items(self) -> list[Tuple[int, int]]:
+        """(smallest size in bin, object count) for each non-empty bin, smallest first."""
+        return [(0 if i == 0 else 1 << (i - 1), count) for (i, count) in enumerate(self.histogram) if count]
+
+    def to_dict(self) -> dict:
+        return {
+            'prefix': self.prefix,
+            'count': self.count,
+            'bytes': self.bytes,
+            'largest': self.largest,
+            'histogram': self.histogram_items(),
+        }
+
+
+class UsageSummary:
+    """
+    Streaming aggregation of object sizes by prefix.
+
+    Args:
+        prefix: Listing prefix; groups are formed from the rest of each key
+        depth: Number of delimiter-separated levels below prefix that name a
+               group. A key with fewer levels counts toward the deepest
+               prefix it has, e.g. at depth 2 "a/x" counts toward "a/".
+        delimiter: Separator between levels
+
+    Usage:
+        summary = UsageSummary(depth=2)
+        for obj in conn.list_objects(bucket, stream=True):
+            summary.add(obj.key, obj.size)
+        for group in summary.top(10):
+            print(group.prefix, group.bytes)
+    """
+
+    def __init__(self, prefix: str | None = None, depth: int = 1, delimiter: str = DEFAULT_DELIMITER):
+        if depth < 0:
+            raise ValueError("depth must be 0 or greater")
+        self.prefix = prefix or ""
+        self.depth = depth
+        self.delimiter = delimiter
+        self.groups: dict[str, PrefixUsage] = {}
+        self.total = PrefixUsage(self.prefix)
+
+    def group_of(self, key: str) -> str:
+        """The group prefix key counts toward."""
+        end = len(self.prefix)
+        for _ in range(self.depth):
+            cut = key.find(self.delimiter, end)
+            if cut < 0:
+                break
+            end = cut + len(self.delimiter)
+        return key[:end]
+
+    def add(self, key: str, size: int) -> None:
+        group = self.group_of(key)
+        usage = self.groups.get(group)
+        if usage is None:
+            usage = self.groups[group] = PrefixUsage(group)
+        usage.add(size)
+        self.total.add(size)
+
+    def update(self, objects: Iterable[Tuple[str, int]]) -> None:
+        """add() every (key, size) pair."""
+        for (key, size) in objects:
+            self.add(key, size)
+
+    def top(self, n: int | None = None) -> list[PrefixUsage]:
+        """The n groups with the most bytes (all groups if n is None), largest first."""
+        groups = sorted(self.groups.values(), key=lambda usage: (-usage.bytes, usage.prefix))
+        return groups if n is None else groups[:n]
+
+    def by_prefix(self) -> list[PrefixUsage]:
+        """All groups in prefix order."""
+        return [self.groups[prefix] for prefix in sorted(self.groups)]
+
+
+def disk_usage(
+    pool,
+    bucket: str,
+    prefix: str | None = None,
+    depth: int = 1,
+    delimiter: str = DEFAULT_DELIMITER,
+    shards: int = DEFAULT_SHARDS,
+    jobs: int = DEFAULT_JOBS,
+    batch_size: int | None = None,
+) -> UsageSummary:
+    """
+    Count objects and bytes per prefix at depth, listing the bucket in parallel.
+
+    Args:
+        pool: ConnectionPool to lease connections from; allow at least jobs
+              connections
+        bucket: S3 bucket name
+        prefix: Only count keys starting with prefix
+        depth: Levels below prefix that name a group; see UsageSummary
+        delimiter: Separator between levels
+        shards: Key ranges to split the listing into, as for list_sharded
+        jobs: Number of shards listed concurrently. With 1, the bucket is
+              listed in order on a single connection.
+        batch_size: Keys per list request
+
+    Returns:
+        UsageSummary with a PrefixUsage per group and a total
+    """
+    summary = UsageSummary(prefix, depth, delimiter)
+    if jobs <= 1:
+        with pool.lease() as conn:
+            summary.update((obj.key, obj.size) for obj in conn.list_objects(
+                bucket, prefix=prefix, batch_size=batch_size, stream=True))
+    else:
+        summary.update((str(obj['Key']), int(obj['Size'] or 0)) for obj in list_sharded(
+            pool, bucket, prefix=prefix, shards=shards, jobs=jobs, batch_size=batch_size))
+    return summary
@@ -1,6 +1,8 @@
 import logging
-from http.client import HTTPResponse
-from typing import Iterable, Optional, TypeVar
+import re
+import time
+from http.client import HTTPException, HTTPResponse
+from typing import Callable, Iterable, Mapping, Optional, TypeVar
 
 # Configure module-level logger
 logger = logging.getLogger(__name__)
@@ -88,9 +90,86 @@ def get_string_to_sign(method: str,
     return string.encode('utf-8')
 
 
+class S3ResponseError(ValueError):
+    """
+    An error response from S3.
+
+    A ValueError, which is how S3 failures have always been raised.
+
+    Attributes:
+        status: HTTP status of the response
+        code: S3 error code from the response body, e.g. AccessDenied, or None
+    """
+
+    def __init__(self, message: str, status: int, code: str | None = None):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+
+
+# 4xx error codes S3 sends when a request may succeed if sent again later
+THROTTLING_ERROR_CODES = frozenset(("SlowDown", "RequestTimeout", "Throttling", "ThrottlingException",
+                                    "TooManyRequests", "RequestLimitExceeded"))
+
+_ERROR_CODE = re.compile(rb"<Code>([^<]*)</Code>")
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Whether a request that failed with error may succeed if sent again.
+
+    Transport errors, short or corrupt bodies, 5xx responses and throttling
+    are retryable; any other S3 error response, such as AccessDenied or
+    NoSuchKey, is not.
+    """
+    if isinstance(error, S3ResponseError):
+        return error.status >= 500 or error.status == 429 or error.code in THROTTLING_ERROR_CODES
+    return isinstance(error, (ValueError, OSError, HTTPException))
+
+
+# First retry of a failed request waits this long (seconds); each later retry doubles it.
+RETRY_BACKOFF = 0.5
+
+
+def retry_delay(attempt: int) -> float:
+    """Seconds to wait after the attempt-th failure of a request (counting from 1)."""
+    return RETRY_BACKOFF * 2 ** (attempt - 1)
+
+
+def retry_call(fn: Callable[..., X], args: tuple, max_retries: int, describe: str) -> X:
+    """
+    Call fn(*args), retrying transient failures with exponential backoff.
+
+    Args:
+        fn: Function that sends the request
+        args: Arguments to call fn with, on every attempt
+        max_retries: Most attempts made before the last error is raised
+        describe: What fn does, for the debug log, e.g. "Part 3 of key"
+
+    Returns:
+        What fn returned
+
+    Raises:
+        The error of the last attempt, or of the first error that is not
+        retryable (see is_retryable)
+    """
+    attempt = 1
+    while True:
+        try:
+            return fn(*args)
+        except (ValueError, OSError, HTTPException) as e:
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+            delay = retry_delay(attempt)
+            logger.debug("%s failed (%s: %s), retrying in %.1fs", describe, type(e).__name__, e, delay)
+            time.sleep(delay)
+            attempt += 1
+
+
 def raise_http_resp_error(resp: HTTPResponse) -> None:
     body = resp.read()
     message = "S3 request failed with:\n%s %s\n%s\n%s" % (resp.status, resp.reason, resp.msg, body.decode('utf-8'))
+    match = _ERROR_CODE.search(body)
 
     # Log error details if debug mode is enabled
     logger.debug("S3 HTTP Error %s %s", resp.status, resp.reason)
@@ -98,5 +177,15 @@ def raise_http_resp_error(resp: HTTPResponse) -> None:
     if body:
         logger.debug("Response body: %s", body.decode('utf-8', errors='replace'))
 
-    # TODO we should stop using ValueError to represent an s3 failure. We need a custom exception class for S3 errors.
-    raise ValueError(message)
+    raise S3ResponseError(message, resp.status, match.group(1).decode('utf-8') if match else None)
+
+
+def lower_headers(headers: Mapping[str, str] | Iterable[tuple[str, str]]) -> dict[str, str]:
+    """
+    Response headers as a dict keyed by lowercase name.
+
+    Accepts either a dict or the (name, value) list from getheaders(), since
+    S3 does not use consistent capitalization (e.g. ETag vs etag).
+    """
+    items = headers.items() if isinstance(headers, Mapping) else headers
+    return {name.lower(): value for (name, value) in items}
@@ -0,0 +1,26 @@
+"""
+Shared test helpers.
+"""
+
+import contextlib
+
+import pytest
+
+
+class FakePool:
+    """Stands in for ConnectionPool: every lease yields the same fake connection."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.leases = 0
+
+    @contextlib.contextmanager
+    def lease(self):
+        self.leases += 1
+        yield self.conn
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    """Retry failed requests at once instead of waiting out the backoff."""
+    monkeypatch.setattr('s3lib.utils.RETRY_BACKOFF', 0)
@@ -1,4 +1,5 @@
 import pytest
+import time
 import re
 
 from s3lib.utils import get_string_to_sign
@@ -364,6 +365,53 @@ def test_get_object2_stream_early_exit_closes():
     mock_resp.close.assert_called_once()
 
 
+def test_get_object2_stream_small_remainder_drained():
+    """A remainder under drain_threshold is read off so the connection stays open."""
+    conn = Connection("someaccess", b"somesecret", drain_threshold=16)
+    mock_resp = _readinto_response(b"0123456789" * 2)
+    conn._s3_get_request = lambda *a, **kw: (mock_resp, {"Content-Length": "20"})
+
+    stream, _ = conn.get_object2("bucket", "key")
+    with stream:
+        assert stream.read(5) == b"01234"
+
+    mock_resp.close.assert_not_called()
+    assert mock_resp.read() == b""
+    assert stream.release == "drained"
+    assert conn.stats()["drained"] == 1
+    assert conn.stats()["closed"] == 0
+
+
+def test_get_object2_stream_large_remainder_closed():
+    """A remainder over drain_threshold is not downloaded; the response is closed."""
+    conn = Connection("someaccess", b"somesecret", drain_threshold=16)
+    mock_resp = _readinto_response(b"0123456789" * 4)
+    conn._s3_get_request = lambda *a, **kw: (mock_resp, {"Content-Length": "40"})
+
+    stream, _ = conn.get_object2("bucket", "key")
+    with stream:
+        assert stream.read(5) == b"01234"
+
+    mock_resp.close.assert_called_once()
+    assert stream.release == "closed"
+    assert conn.stats()["drained"] == 0
+    assert conn.stats()["closed"] == 1
+
+
+def test_get_object2_stream_short_remainder_closed():
+    """A body that ends before Content-Length promised is closed, not kept."""
+    conn = Connection("someaccess", b"somesecret")
+    mock_resp = _readinto_response(b"0123456789")
+    conn._s3_get_request = lambda *a, **kw: (mock_resp, {"Content-Length": "20"})
+
+    stream, _ = conn.get_object2("bucket", "key")
+    with stream:
+        stream.read(5)
+
+    mock_resp.close.assert_called_once()
+    assert stream.release == "closed"
+
+
 def test_get_object2_on_close_called_on_exit():
     """on_close callback fires when the stream context manager exits."""
     import unittest.mock as mock
@@ -421,6 +469,173 @@ def test_get_object2_206_on_byte_range():
     assert len(data) == 500
 
 
+def test_s3_byte_stream_readinto():
+    """readinto fills the caller's buffer and marks the stream exhausted at EOF."""
+    import io
+    import unittest.mock as mock
+
+    mock_resp = mock.Mock()
+    body = io.BytesIO(b"hello world")
+    mock_resp.readinto.side_effect = body.readinto
+    stream = S3ByteStream(mock_resp)
+    buf = bytearray(4)
+    chunks = []
+    with stream:
+        while n := stream.readinto(buf):
+            chunks.append(bytes(buf[:n]))
+    assert b"".join(chunks) == b"hello world"
+    mock_resp.close.assert_not_called()
+
+
+def _readinto_response(body):
+    import io
+    import unittest.mock as mock
+
+    mock_resp = mock.Mock()
+    src = io.BytesIO(body)
+    mock_resp.readinto.side_effect = src.readinto
+    mock_resp.read.side_effect = src.read
+    return mock_resp
+
+
+def test_get_object_into_allocates_from_content_length():
+    conn = Connection("someaccess", b"somesecret")
+    mock_resp = _readinto_response(b"abcdef")
+    conn._s3_get_request = lambda *a, **kw: (mock_resp, {"Content-Length": "6"})
+
+    data, headers = conn.get_object_into("bucket", "key")
+    assert bytes(data) == b"abcdef"
+    assert conn._outstanding_response is None
+    mock_resp.close.assert_not_called()
+
+
+def test_get_object_into_reuses_buffer():
+    conn = Connection("someaccess", b"somesecret")
+    buf = bytearray(16)
+    for body in (b"first", b"second!"):
+        mock_resp = _readinto_response(body)
+        conn._s3_get_request = lambda *a, **kw: (mock_resp, {"content-length": str(len(body))})
+        data, _ = conn.get_object_into("bucket", "key", buf)
+        assert data.obj is buf
+        assert bytes(data) == body
+
+
+def test_get_object_into_buffer_too_small():
+    conn = Connection("someaccess", b"somesecret", drain_threshold=0)
+    mock_resp = _readinto_response(b"abcdef")
+    conn._s3_get_request = lambda *a, **kw: (mock_resp, {"content-length": "6"})
+
+    with pytest.raises(ValueError, match="too small"):
+        conn.get_object_into("bucket", "key", bytearray(3))
+    mock_resp.close.assert_called_once()
+
+
+def test_get_object_into_returns_none_on_412():
+    conn = Connection("someaccess", b"somesecret")
+    conn._s3_get_request = lambda *a, **kw: (None, {"etag": '"xyz999"'})
+    data, headers = conn.get_object_into("bucket", "key", bytearray(3), if_match="abc123")
+    assert data is None
+
+
+def _verify_headers(body, algorithm="sha256"):
+    import hashlib
+    from base64 import b64encode
+
+    digest = hashlib.new(algorithm, body).digest()
+    return {"Content-Length": str(len(body)), f"x-amz-checksum-{algorithm}": b64encode(digest).decode()}
+
+
+def test_get_object2_verify_passes():
+    """verify=True hashes while reading and accepts a matching body."""
+    conn = Connection("someaccess", b"somesecret")
+    body = b"verified body" * 1000
+    conn._s3_get_request = lambda *a, **kw: (_readinto_response(body), _verify_headers(body))
+
+    stream, _ = conn.get_object2("bucket", "key", verify=True)
+    assert stream.checksum_algorithm == "SHA256"
+    with stream:
+        chunks = []
+        while chunk := stream.read(1000):
+            chunks.append(chunk)
+    assert b"".join(chunks) == body
+
+
+def test_get_object2_verify_read_zero_does_not_finish():
+    """read(0) returns b'' without verifying a body that has not been read yet."""
+    conn = Connection("someaccess", b"somesecret")
+    body = b"zero-length reads" * 100
+    conn._s3_get_request = lambda *a, **kw: (_readinto_response(body), _verify_headers(body))
+
+    stream, _ = conn.get_object2("bucket", "key", verify=True)
+    with stream:
+        assert stream.read(0) == b""
+        assert stream.read(10) == body[:10]
+        assert stream.read(0) == b""
+        assert stream.read() == body[10:]
+    assert stream.release == 'exhausted'
+
+
+def test_get_object2_verify_mismatch_raises_at_exhaustion():
+    """A corrupted body raises ChecksumMismatch from the read that hits EOF."""
+    from s3lib import ChecksumMismatch
+
+    conn = Connection("someaccess", b"somesecret")
+    body = b"x" * 100
+    headers = _verify_headers(b"y" * 100, "sha1")
+    conn._s3_get_request = lambda *a, **kw: (_readinto_response(body), headers)
+
+    stream, _ = conn.get_object2("bucket", "key", verify=True)
+    assert stream.checksum_algorithm == "SHA1"
+    buf = bytearray(60)
+    with stream:
+        assert stream.readinto(buf) == 60
+        assert stream.readinto(buf) == 40
+        with pytest.raises(ChecksumMismatch, match="Checksum verification failed"):
+            stream.readinto(buf)
+
+
+def test_get_object2_verify_read_all():
+    """read() with no size consumes the body and verifies immediately."""
+    from s3lib import ChecksumMismatch
+
+    conn = Connection("someaccess", b"somesecret")
+    conn._s3_get_request = lambda *a, **kw: (_readinto_response(b"abc"), _verify_headers(b"abd", "md5"))
+    stream, _ = conn.get_object2("bucket", "key", verify=True)
+    with stream:
+        with pytest.raises(ChecksumMismatch):
+            stream.read()
+
+
+def test_get_object2_verify_skips_ranges_and_composite():
+    conn = Connection("someaccess", b"somesecret")
+    conn._s3_get_request = lambda *a, **kw: (_readinto_response(b"abc"), _verify_headers(b"other"))
+    stream, _ = conn.get_object2("bucket", "key", byte_range=(0, 2), verify=True)
+    assert stream.checksum_algorithm is None
+    with stream:
+        assert stream.read() == b"abc"
+
+    headers = {"x-amz-checksum-sha256": "Zm9v-3"}
+    conn._s3_get_request = lambda *a, **kw: (_readinto_response(b"abc"), headers)
+    stream, _ = conn.get_object2("bucket", "key", verify=True)
+    assert stream.checksum_algorithm is None
+    with stream:
+        assert stream.read() == b"abc"
+
+
+def test_get_object_into_verify():
+    from s3lib import ChecksumMismatch
+
+    conn = Connection("someaccess", b"somesecret")
+    body = b"into-buffer"
+    conn._s3_get_request = lambda *a, **kw: (_readinto_response(body), _verify_headers(body))
+    data, _ = conn.get_object_into("bucket", "key", verify=True)
+    assert bytes(data) == body
+
+    conn._s3_get_request = lambda *a, **kw: (_readinto_response(body), _verify_headers(b"not-thebody"))
+    with pytest.raises(ChecksumMismatch):
+        conn.get_object_into("bucket", "key", verify=True)
+
+
 def test_put_object2_returns_put_result():
     """Successful PUT returns a PutResult with etag, version_id, checksum."""
     import unittest.mock as mock
@@ -548,3 +763,248 @@ def test_automatic_region_discovery():
         buckets_west_2 = list(conn.list_bucket('s3libtestbucket2'))
         assert len(buckets_west_2) > 0
         assert conn.region == 'us-west-1'
+
+
+def _list_page_xml(keys, next_token=None):
+    contents = "".join(f"<Contents><Key>{key}</Key><Size>1</Size></Contents>" for key in keys)
+    token = f"<NextContinuationToken>{next_token}</NextContinuationToken>" if next_token else ""
+    return (f'<ListBucketResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/">'
+            f'<Name>bucket</Name><Prefix></Prefix>{contents}{token}</ListBucketResult>').encode()
+
+
+def _list_response(body, fail_after=None):
+    """Mock list response that serves body in small reads, optionally dropping the connection."""
+    import io
+    import unittest.mock as mock
+
+    src = io.BytesIO(body)
+    resp = mock.Mock()
+    resp.status = 200
+
+    def read(size=-1):
+        if fail_after is not None and src.tell() >= fail_after:
+            raise ConnectionResetError("reset")
+        return src.read(min(size, 100))
+
+    resp.read.side_effect = read
+    return resp
+
+
+def test_list_bucket2_stream_yields_before_page_is_read(monkeypatch):
+    monkeypatch.setattr("s3lib.LIST_READ_CHUNK_SIZE", 100)
+    conn = Connection("someaccess", b"somesecret")
+    body = _list_page_xml([f"key{i:03d}" for i in range(50)])
+    resp = _list_response(body)
+    conn._s3_request = lambda *a, **kw: resp
+
+    objects = conn.list_bucket2("bucket", stream=True)
+    assert next(objects)['Key'] == "key000"
+    assert resp.read.call_count < len(body) // 100
+    assert [obj['Key'] for obj in objects] == [f"key{i:03d}" for i in range(1, 50)]
+
+
+def test_list_bucket2_default_reads_whole_page_first(monkeypatch):
+    monkeypatch.setattr("s3lib.LIST_READ_CHUNK_SIZE", 100)
+    conn = Connection("someaccess", b"somesecret")
+    body = _list_page_xml([f"key{i:03d}" for i in range(50)])
+    resp = _list_response(body)
+    conn._s3_request = lambda *a, **kw: resp
+
+    objects = conn.list_bucket2("bucket")
+    assert next(objects)['Key'] == "key000"
+    assert resp.read.call_count > len(body) // 100
+    assert conn.is_ready()
+
+
+def test_list_bucket2_pages_and_retries_dropped_read(monkeypatch):
+    monkeypatch.setattr("s3lib.LIST_READ_CHUNK_SIZE", 100)
+    conn = Connection("someaccess", b"somesecret")
+    first = _list_page_xml([f"a{i:03d}" for i in range(30)], next_token="tok")
+    second = _list_page_xml([f"b{i:03d}" for i in range(30)])
+    responses = [_list_response(first, fail_after=600), _list_response(first), _list_response(second)]
+    requests = []
+
+    def fake_request(method, bucket, key, args, headers, body):
+        requests.append(dict(args))
+        return responses.pop(0)
+
+    conn._s3_request = fake_request
+    keys = [obj['Key'] for obj in conn.list_bucket2("bucket", stream=True)]
+    assert keys == [f"a{i:03d}" for i in range(30)] + [f"b{i:03d}" for i in range(30)]
+    assert [args.get("continuation-token") for args in requests] == [None, None, "tok"]
+
+
+def test_list_bucket2_abandoned_stream_releases_connection():
+    conn = Connection("someaccess", b"somesecret")
+    resp = _list_response(_list_page_xml(["a", "b", "c"]))
+    conn._s3_request = lambda *a, **kw: resp
+    conn._outstanding_response = resp
+
+    objects = conn.list_bucket2("bucket", stream=True)
+    next(objects)
+    objects.close()
+    assert conn.is_ready()
+
+
+def test_list_objects_and_columns(monkeypatch):
+    monkeypatch.setattr("s3lib.LIST_READ_CHUNK_SIZE", 100)
+    pages = [_list_page_xml(["a", "b", "c"], next_token="tok"), _list_page_xml(["d", "e"])]
+    conn = Connection("someaccess", b"somesecret")
+
+    conn._s3_request = lambda *a, **kw: _list_response(pages[0] if "continuation-token" not in a[3] else pages[1])
+    objects = list(conn.list_objects("bucket"))
+    assert [(obj.key, obj.size) for obj in objects] == [("a", 1), ("b", 1), ("c", 1), ("d", 1), ("e", 1)]
+
+    batches = list(conn.list_columns("bucket", batch_size=2))
+    assert [batch.keys for batch in batches] == [["a", "b"], ["c", "d"], ["e"]]
+    assert list(batches[0].sizes) == [1, 1]
+
+
+class _PrefetchListConnection(Connection):
+    """Connection whose ListObjectsV2 requests are served from a list of page bodies."""
+
+    def __init__(self, bodies):
+        super().__init__("someaccess", b"somesecret")
+        self.bodies = bodies
+        self.requests = []
+
+    def _s3_request(self, method, bucket, key, args, headers, body):
+        self.requests.append(args.get("continuation-token"))
+        return _list_response(self.bodies[len(self.requests) - 1])
+
+
+def test_list_bucket2_prefetch_reads_ahead_on_own_connection():
+    conn = Connection("someaccess", b"somesecret")
+    background = _PrefetchListConnection([
+        _list_page_xml(["a", "b"], next_token="t1"),
+        _list_page_xml(["c"], next_token="t2"),
+        _list_page_xml(["d", "e"]),
+    ])
+    conn._clone = lambda: background
+    conn._s3_request = lambda *a, **kw: pytest.fail("listing used the caller's connection")
+
+    objects = conn.list_bucket2("bucket", prefetch=2)
+    assert next(objects)['Key'] == "a"
+    deadline = time.monotonic() + 5
+    while len(background.requests) < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    # Two pages queued ahead of the one being consumed
+    assert background.requests == [None, "t1", "t2"]
+    assert [obj['Key'] for obj in objects] == ["b", "c", "d", "e"]
+
+
+def test_list_bucket2_prefetch_error_and_early_exit():
+    conn = Connection("someaccess", b"somesecret")
+    background = _PrefetchListConnection([_list_page_xml(["a"], next_token="t1")])
+    conn._clone = lambda: background
+    objects = conn.list_bucket2("bucket", prefetch=1)
+    assert next(objects)['Key'] == "a"
+    with pytest.raises(IndexError):
+        next(objects)
+
+    background = _PrefetchListConnection([_list_page_xml([str(i)], next_token=f"t{i}") for i in range(100)])
+    conn._clone = lambda: background
+    objects = conn.list_bucket2("bucket", prefetch=1)
+    next(objects)
+    objects.close()
+    assert len(background.requests) < 100
+
+
+_NS = 'xmlns="http://s3.amazonaws.com/doc/2006-03-01/"'
+_TRICKY_PAGE = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    f'<ListBucketResult {_NS}><Name>bucket</Name><Prefix/>'
+    '<NextContinuationToken>1/abc==</NextContinuationToken><KeyCount>5</KeyCount>'
+    '<Contents><Key>plain.txt</Key><LastModified>2024-01-01T00:00:00.000Z</LastModified>'
+    '<ETag>&quot;0123&quot;</ETag><Size>42</Size><StorageClass>STANDARD</StorageClass></Contents>'
+    '<Contents><Key>a&amp;b &lt;c&gt; &#x0D;&#10;d</Key><ETag></ETag><Size>0</Size><StorageClass/></Contents>'
+    '<Contents><Key>owned</Key><Size>1</Size><Owner><ID>id</ID><DisplayName>me</DisplayName></Owner></Contents>'
+    '<Contents><Key><![CDATA[x<y]]></Key><!-- note --><Size>2</Size></Contents>'
+    '<Contents><Key>café/日本</Key><Size>3</Size></Contents>'
+    '<CommonPrefixes><Prefix>logs/</Prefix></CommonPrefixes>'
+    '<CommonPrefixes><Prefix>a&amp;b/</Prefix></CommonPrefixes>'
+    '</ListBucketResult>'
+).encode()
+
+
+# Entries in S3's usual layout mixed with ones that need the element-by-element path
+_MIXED_PAGE = (
+    f'<ListBucketResult {_NS}><Name>bucket</Name><Prefix></Prefix><KeyCount>5</KeyCount>' +
+    ''.join(f'<Contents><Key>k{i}</Key><LastModified>2024-01-01T00:00:00.000Z</LastModified>'
+            f'<ETag>&quot;e{i}&quot;</ETag><Size>{i}</Size><StorageClass>STANDARD</StorageClass></Contents>'
+            for i in range(3)) +
+    '<Contents><Key>a&amp;b</Key><LastModified>2024-01-01T00:00:00.000Z</LastModified>'
+    '<ETag>&quot;x&quot;</ETag><Size>1</Size><StorageClass>STANDARD</StorageClass></Contents>'
+    '<CommonPrefixes><Prefix>p/</Prefix></CommonPrefixes>'
+    '<Contents><Key>sum</Key><LastModified>2024-01-01T00:00:00.000Z</LastModified><ETag>&quot;y&quot;</ETag>'
+    '<ChecksumAlgorithm>CRC32</ChecksumAlgorithm><Size>2</Size><StorageClass>STANDARD</StorageClass></Contents>'
+    '<Contents><Key>k9</Key><LastModified>2024-01-01T00:00:00.000Z</LastModified>'
+    '<ETag>&quot;e9&quot;</ETag><Size>9</Size><StorageClass>GLACIER</StorageClass></Contents>'
+    '<NextContinuationToken>tok</NextContinuationToken></ListBucketResult>'
+).encode()
+
+
+def _parse_all(parser, body, chunk_size):
+    objects = []
+    for i in range(0, len(body), chunk_size):
+        objects += parser.feed(body[i:i + chunk_size])
+    objects += parser.close()
+    return (objects, parser.prefixes, parser.next_token)
+
+
+@pytest.mark.parametrize("page", [_TRICKY_PAGE, _MIXED_PAGE])
+@pytest.mark.parametrize("records", [False, True])
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 100000])
+def test_list_parser_matches_element_tree(page, records, chunk_size):
+    from s3lib import _ListResponseParser, _TreeListParser
+
+    expected = _parse_all(_TreeListParser(records), page, 100000)
+    parser = _ListResponseParser(records)
+    assert _parse_all(parser, page, chunk_size) == expected
+    assert parser._fallback is None
+
+
+def test_list_parser_keeps_unusual_values():
+    from s3lib import _parse_list_response
+
+    objects, prefixes, token = _parse_list_response(_TRICKY_PAGE)
+    assert [obj['Key'] for obj in objects][1:4] == ["a&b <c> \r\nd", "owned", "x<y"]
+    assert objects[1]['ETag'] is None
+    assert (prefixes, token) == (["logs/", "a&b/"], "1/abc==")
+    objects, prefixes, token = _parse_list_response(_MIXED_PAGE)
+    assert [obj['Key'] for obj in objects] == ["k0", "k1", "k2", "a&b", "sum", "k9"]
+    assert (objects[0]['ETag'], objects[4]['ChecksumAlgorithm']) == ('"e0"', "CRC32")
+    assert (prefixes, token) == (["p/"], "tok")
+
+
+def test_list_parser_falls_back_for_unexpected_documents():
+    from xml.etree.ElementTree import ParseError
+    from s3lib import _ListResponseParser
+
+    prefixed = ('<s3:ListBucketResult xmlns:s3="http://s3.amazonaws.com/doc/2006-03-01/">'
+                '<s3:Contents><s3:Key>k</s3:Key></s3:Contents></s3:ListBucketResult>').encode()
+    parser = _ListResponseParser()
+    assert _parse_all(parser, prefixed, 10) == ([{'Key': 'k'}], [], None)
+    assert parser._fallback is not None
+
+    with pytest.raises(ParseError):
+        _parse_all(_ListResponseParser(), _TRICKY_PAGE[:-10], 64)
+
+
+def test_parse_delete_bulk_response():
+    from s3lib import _parse_delete_bulk_response, _parse_delete_bulk_response_tree
+
+    body = (f'<?xml version="1.0" encoding="UTF-8"?>\n<DeleteResult {_NS}>'
+            '<Deleted><Key>a&amp;b</Key></Deleted>'
+            '<Error><Key>c</Key><Code>AccessDenied</Code><Message>Access Denied</Message></Error>'
+            '<Deleted><Key>d</Key><VersionId>v1</VersionId></Deleted>'
+            '</DeleteResult>').encode()
+    expected = [("a&b", "Deleted"), ("c", "Error"), ("d", "Deleted")]
+    assert list(_parse_delete_bulk_response_tree(body)) == expected
+    assert list(_parse_delete_bulk_response(body)) == expected
+    assert list(_parse_delete_bulk_response(body.decode())) == expected
+    # A nested element sends the whole response to ElementTree, without repeating results
+    nested = body.replace(b"<VersionId>v1</VersionId>", b"<Extra><X>1</X></Extra>")
+    assert list(_parse_delete_bulk_response(nested)) == expected
+    with pytest.raises(ValueError, match="Key element"):
+        list(_parse_delete_bulk_response(f'<DeleteResult {_NS}><Deleted></Deleted></DeleteResult>'))
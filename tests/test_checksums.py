@@ -309,6 +309,85 @@ def test_s3_request_inner_unsigned_payload_for_streams():
     assert headers.get("x-amz-content-sha256") == "UNSIGNED-PAYLOAD"
 
 
+def test_s3_request_inner_signed_chunks_for_streams():
+    """Test _s3_request_inner sends an aws-chunked body when signed_chunk_size is set."""
+    import unittest.mock as mock
+    import s3lib
+    import io
+    from s3lib.sigv4 import STREAMING_PAYLOAD, aws_chunked_length
+
+    data = b"x" * 20000
+    stream = io.BytesIO(data)
+
+    with s3lib.Connection("test_key", b"test_secret") as conn:
+        mock_http_conn = mock.Mock()
+        mock_response = mock.Mock()
+        mock_response.status = 200
+        mock_response.getheaders.return_value = []
+        mock_response.read.return_value = b""
+        mock_response.isclosed.return_value = True
+        mock_http_conn.getresponse.return_value = mock_response
+        conn.conn = mock_http_conn
+
+        conn._s3_request_inner("PUT", "bucket", "key", {}, {"content-length": str(len(data))}, stream,
+                               signed_chunk_size=8192)
+
+    call_args = mock_http_conn.request.call_args
+    body = b"".join(call_args[0][2])
+    headers = call_args[0][3]
+
+    assert headers["x-amz-content-sha256"] == STREAMING_PAYLOAD
+    assert headers["content-encoding"] == "aws-chunked"
+    assert headers["x-amz-decoded-content-length"] == "20000"
+    assert headers["content-length"] == str(aws_chunked_length(20000, 8192))
+    assert len(body) == aws_chunked_length(20000, 8192)
+    assert body.startswith(b"2000;chunk-signature=")
+    assert body.endswith(b"\r\n\r\n")
+
+
+def test_put_object_signed_chunks_spools_pipe():
+    """put_object with signed_chunk_size streams a pipe without reading it into memory."""
+    import unittest.mock as mock
+    import os
+    import s3lib
+
+    data = b"piped data" * 1000
+    (r_fid, w_fid) = os.pipe()
+    with os.fdopen(w_fid, 'wb') as w:
+        w.write(data)
+
+    captured = {}
+
+    def fake_request(method, bucket, key, args, headers, content, **kw):
+        captured['headers'] = headers
+        captured['body'] = content.read()
+        captured['signed_chunk_size'] = kw.get('signed_chunk_size')
+        resp = mock.Mock()
+        resp.status = 200
+        resp.read.return_value = b""
+        resp.getheaders.return_value = []
+        return resp
+
+    conn = s3lib.Connection("test_key", b"test_secret")
+    conn._s3_request = fake_request
+    with os.fdopen(r_fid, 'rb') as r:
+        conn.put_object("bucket", "key", r, signed_chunk_size=8192)
+
+    assert captured['headers']['content-length'] == str(len(data))
+    assert captured['body'] == data
+    assert captured['signed_chunk_size'] == 8192
+
+
+def test_put_object_signed_chunk_size_minimum():
+    """signed_chunk_size below the S3 minimum is rejected."""
+    import s3lib
+    import io
+
+    conn = s3lib.Connection("test_key", b"test_secret")
+    with pytest.raises(ValueError, match="signed_chunk_size"):
+        conn.put_object("bucket", "key", io.BytesIO(b"data"), signed_chunk_size=1024)
+
+
 def test_s3_request_inner_with_provided_md5():
     """Test _s3_request_inner uses provided md5_hint."""
     import unittest.mock as mock
@@ -0,0 +1,187 @@
+"""
+Tests for concurrent bulk deletes.
+"""
+
+import json
+import os
+import threading
+from http.client import HTTPException
+
+import pytest
+from conftest import FakePool
+
+from s3lib import S3ResponseError, delete_parallel, delete_prefix
+
+NS = "http://s3.amazonaws.com/doc/2006-03-01/"
+
+
+def _response(deleted, errors):
+    entries = "".join(f"<Deleted><Key>{key}</Key></Deleted>" for key in deleted)
+    entries += "".join(f"<Error><Key>{key}</Key><Code>SlowDown</Code><Message>Slow</Message></Error>"
+                       for key in errors)
+    return f'<DeleteResult xmlns="{NS}">{entries}</DeleteResult>'.encode()
+
+
+class FakeDeleteConnection:
+    """
+    Serves DeleteObjects requests and lists the objects left.
+
+    flaky maps keys to the number of times they are reported as Error
+    before they are deleted; broken is the number of requests that raise
+    error (a dropped connection by default).
+    Each request waits up to hold seconds for another to overlap it.
+    objects are the keys list_bucket2 lists; deleted keys are removed.
+    """
+
+    def __init__(self, flaky=None, broken=0, hold=0.0, objects=(), error=None):
+        self.flaky = dict(flaky or {})
+        self.broken = broken
+        self.error = error or HTTPException("connection reset")
+        self.hold = hold
+        self.objects = set(objects)
+        self.listed_from = []
+        self.requests = []
+        self.invalidated = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+        self._release = threading.Event()
+
+    def list_bucket2(self, bucket, start=None, prefix=None, batch_size=None, stream=False, prefetch=0):
+        self.listed_from.append(start)
+        for key in sorted(self.objects):
+            if key.startswith(prefix or "") and key > (start or ""):
+                yield {'Key': key, 'Size': '1'}
+
+    def _invalidate_cached(self, bucket, key):
+        self.invalidated.append(key)
+
+    def _s3_delete_bulk_request(self, bucket, keys, quiet):
+        with self._lock:
+            self.requests.append(list(keys))
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            if self.active > 1:
+                self._release.set()
+            broken = self.broken > 0
+            self.broken -= broken
+        try:
+            self._release.wait(self.hold)
+            if broken:
+                raise self.error
+            with self._lock:
+                errors = [key for key in keys if self.flaky.get(key, 0) > 0]
+                for key in errors:
+                    self.flaky[key] -= 1
+            deleted = [key for key in keys if key not in errors]
+            self.objects.difference_update(deleted)
+            return _response([] if quiet else deleted, errors)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+pytestmark = pytest.mark.usefixtures("no_backoff")
+
+
+def test_delete_parallel_deletes_every_key():
+    keys = [f"k{i:03d}" for i in range(25)]
+    pool = FakePool(FakeDeleteConnection(hold=1.0))
+    results = list(delete_parallel(pool, "bucket", iter(keys), jobs=3, batch_size=10))
+    assert sorted(results) == [(key, "Deleted") for key in keys]
+    assert [len(batch) for batch in pool.conn.requests] == [10, 10, 5]
+    assert sorted(pool.conn.invalidated) == keys
+    assert pool.conn.peak > 1
+
+
+def test_delete_parallel_retries_error_keys():
+    keys = ["a", "b", "c", "d"]
+    pool = FakePool(FakeDeleteConnection(flaky={"b": 2, "d": 1}))
+    results = dict(delete_parallel(pool, "bucket", keys, jobs=1, batch_size=2))
+    assert results == {key: "Deleted" for key in keys}
+    # Only the failed keys are sent again, ahead of new batches once their backoff is over
+    assert pool.conn.requests == [["a", "b"], ["b"], ["b"], ["c", "d"], ["d"]]
+
+
+def test_delete_parallel_reports_keys_that_keep_failing():
+    pool = FakePool(FakeDeleteConnection(flaky={"b": 10}))
+    results = list(delete_parallel(pool, "bucket", ["a", "b"], jobs=2, batch_size=1, max_retries=3))
+    assert sorted(results) == [("a", "Deleted"), ("b", "Error")]
+    assert pool.conn.requests.count(["b"]) == 3
+
+
+def test_delete_parallel_quiet_yields_only_failures():
+    pool = FakePool(FakeDeleteConnection(flaky={"b": 10}))
+    results = list(delete_parallel(pool, "bucket", ["a", "b", "c"], jobs=2, quiet=True, max_retries=2))
+    assert results == [("b", "Error")]
+
+
+def test_delete_parallel_retries_failed_requests():
+    pool = FakePool(FakeDeleteConnection(broken=2))
+    results = list(delete_parallel(pool, "bucket", ["a", "b"], jobs=1, max_retries=3))
+    assert results == [("a", "Deleted"), ("b", "Deleted")]
+    with pytest.raises(HTTPException):
+        list(delete_parallel(FakePool(FakeDeleteConnection(broken=3)), "bucket", ["a"], jobs=1, max_retries=3))
+
+
+def test_delete_parallel_does_not_retry_rejected_requests():
+    error = S3ResponseError("S3 request failed with:\n403 Forbidden", 403, "AccessDenied")
+    pool = FakePool(FakeDeleteConnection(broken=1, error=error))
+    with pytest.raises(S3ResponseError, match="403"):
+        list(delete_parallel(pool, "bucket", ["a"], jobs=1, max_retries=3))
+    assert pool.conn.requests == [["a"]]
+    throttled = FakePool(FakeDeleteConnection(
+        broken=2, error=S3ResponseError("S3 request failed with:\n503", 503, "SlowDown")))
+    assert list(delete_parallel(throttled, "bucket", ["a"], jobs=1, max_retries=3)) == [("a", "Deleted")]
+
+
+PURGE = [f"logs/{i:02d}" for i in range(10)] + ["other"]
+
+
+def test_delete_prefix_deletes_only_the_prefix(tmp_path):
+    pool = FakePool(FakeDeleteConnection(objects=PURGE))
+    checkpoint = str(tmp_path / "purge.json")
+    results = list(delete_prefix(pool, "bucket", "logs/", jobs=2, batch_size=3, prefetch=1, checkpoint=checkpoint))
+    assert sorted(results) == [(key, "Deleted") for key in PURGE[:-1]]
+    assert pool.conn.objects == {"other"}
+    assert not os.path.exists(checkpoint)
+    assert list(delete_prefix(pool, "bucket", "logs/", quiet=True)) == []
+
+
+def test_delete_prefix_resumes_from_checkpoint(tmp_path):
+    pool = FakePool(FakeDeleteConnection(objects=PURGE))
+    checkpoint = str(tmp_path / "purge.json")
+    purge = delete_prefix(pool, "bucket", "logs/", jobs=1, batch_size=3, checkpoint=checkpoint)
+    assert [next(purge) for _ in range(4)] == [(key, "Deleted") for key in PURGE[:4]]
+    purge.close()
+    with open(checkpoint) as f:
+        assert json.load(f) == {'bucket': "bucket", 'prefix': "logs/", 'after': "logs/03"}
+
+    with pytest.raises(ValueError, match="not bucket/data/"):
+        next(delete_prefix(pool, "bucket", "data/", checkpoint=checkpoint))
+    list(delete_prefix(pool, "bucket", "logs/", jobs=2, batch_size=3, checkpoint=checkpoint))
+    assert pool.conn.listed_from[-1] == "logs/03"
+    assert pool.conn.objects == {"other"}
+    assert not os.path.exists(checkpoint)
+
+
+def test_delete_prefix_checkpoint_stops_before_failed_keys(tmp_path):
+    pool = FakePool(FakeDeleteConnection(objects=PURGE, flaky={"logs/04": 10}))
+    checkpoint = str(tmp_path / "purge.json")
+    results = list(delete_prefix(pool, "bucket", "logs/", jobs=2, batch_size=3, quiet=True,
+                                 max_retries=2, checkpoint=checkpoint))
+    assert results == [("logs/04", "Error")]
+    assert pool.conn.objects == {"logs/04", "other"}
+    with open(checkpoint) as f:
+        assert json.load(f)['after'] == "logs/03"
+
+
+def test_delete_prefix_raises_listing_errors():
+    class BrokenListing(FakeDeleteConnection):
+        def list_bucket2(self, bucket, start=None, prefix=None, batch_size=None, stream=False, prefetch=0):
+            yield {'Key': "logs/00"}
+            raise ValueError("503 Slow Down")
+
+    pool = FakePool(BrokenListing())
+    with pytest.raises(ValueError, match="Slow Down"):
+        list(delete_prefix(pool, "bucket", "logs/", batch_size=1))
@@ -0,0 +1,179 @@
+"""
+Tests for DiskCache.
+"""
+
+import io
+import os
+import time
+import unittest.mock as mock
+
+import pytest
+
+from s3lib import ChecksumMismatch, DiskCache, S3ByteStream, disk_cache
+
+
+class FakeStore:
+    """In-memory bucket served through get_object2, honouring if_none_match."""
+
+    def __init__(self):
+        self.objects = {}
+        self.requests = []
+
+    def put(self, key, body, etag):
+        self.objects[key] = (body, etag)
+
+    def get_object2(self, bucket, key, if_match=None, if_none_match=None, byte_range=None, verify=False):
+        self.requests.append((key, if_none_match))
+        body, etag = self.objects[key]
+        headers = {"ETag": f'"{etag}"', "Content-Length": str(len(body))}
+        if if_none_match == etag:
+            return (None, headers)
+        src = io.BytesIO(body)
+        resp = mock.Mock()
+        resp.readinto.side_effect = src.readinto
+        resp.read.side_effect = src.read
+        return (S3ByteStream(resp), headers)
+
+
+def _read(cache, s3, key):
+    body, headers = cache.get_object(s3, "bucket", key)
+    with body:
+        return body.read()
+
+
+def test_miss_then_hit(tmp_path):
+    s3 = FakeStore()
+    s3.put("a", b"alpha", "e1")
+    cache = DiskCache(tmp_path)
+    assert _read(cache, s3, "a") == b"alpha"
+    assert _read(cache, s3, "a") == b"alpha"
+    assert s3.requests == [("a", None), ("a", "e1")]
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'revalidations': 1, 'evictions': 0,
+                             'entries': 1, 'bytes': 5}
+
+
+def test_changed_object_is_replaced(tmp_path):
+    s3 = FakeStore()
+    s3.put("a", b"alpha", "e1")
+    cache = DiskCache(tmp_path)
+    _read(cache, s3, "a")
+    s3.put("a", b"alpha-2", "e2")
+    assert _read(cache, s3, "a") == b"alpha-2"
+    assert _read(cache, s3, "a") == b"alpha-2"
+    assert cache.stats()['bytes'] == 7
+    # Old body removed, one entry (meta + body) left
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_persists_across_instances(tmp_path):
+    s3 = FakeStore()
+    s3.put("a", b"alpha", "e1")
+    _read(DiskCache(tmp_path), s3, "a")
+    cache = DiskCache(tmp_path)
+    assert _read(cache, s3, "a") == b"alpha"
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 0
+
+
+def test_lru_eviction(tmp_path):
+    s3 = FakeStore()
+    for key in "abc":
+        s3.put(key, key.encode() * 10, "e-" + key)
+    cache = DiskCache(tmp_path, max_bytes=25)
+    _read(cache, s3, "a")
+    _read(cache, s3, "b")
+    _read(cache, s3, "a")  # b is now least recently used
+    _read(cache, s3, "c")
+    stats = cache.stats()
+    assert stats['evictions'] == 1
+    assert stats['bytes'] == 20
+    s3.requests.clear()
+    _read(cache, s3, "a")
+    _read(cache, s3, "b")
+    assert s3.requests == [("a", "e-a"), ("b", None)]
+
+
+def test_large_objects_stream_uncached(tmp_path):
+    s3 = FakeStore()
+    s3.put("big", b"x" * 100, "e1")
+    cache = DiskCache(tmp_path, max_bytes=10)
+    body, _ = cache.get_object(s3, "bucket", "big")
+    assert isinstance(body, S3ByteStream)
+    with body:
+        assert body.read() == b"x" * 100
+    assert cache.stats()['entries'] == 0
+    assert os.listdir(tmp_path) == []
+
+
+def test_failed_download_leaves_no_files(tmp_path):
+    s3 = FakeStore()
+    s3.put("a", b"alpha", "e1")
+
+    def corrupt(*args, **kwargs):
+        resp = mock.Mock()
+        resp.readinto.side_effect = io.BytesIO(b"alpha").readinto
+        return (S3ByteStream(resp, checksum=("SHA256", "bm90IHRoZSBjaGVja3N1bQ==")),
+                {"ETag": '"e1"', "Content-Length": "5"})
+
+    s3.get_object2 = corrupt
+    cache = DiskCache(tmp_path)
+    with pytest.raises(ChecksumMismatch):
+        cache.get_object(s3, "bucket", "a")
+    assert os.listdir(tmp_path) == []
+    assert cache.stats()['entries'] == 0
+
+
+def test_load_sweeps_leftovers(tmp_path):
+    (tmp_path / ".tmp-abc").write_bytes(b"partial")
+    (tmp_path / "orphan-0000.body").write_bytes(b"orphan")
+    (tmp_path / ".tmp-fresh").write_bytes(b"partial")
+    stale = time.time() - 2 * 60 * 60
+    for filename in (".tmp-abc", "orphan-0000.body"):
+        os.utime(tmp_path / filename, (stale, stale))
+    DiskCache(tmp_path)
+    assert os.listdir(tmp_path) == [".tmp-fresh"]
+
+
+def test_load_keeps_stores_in_progress(tmp_path, monkeypatch):
+    s3 = FakeStore()
+    s3.put("a", b"alpha", "e1")
+    s3.put("b", b"bravo", "e2")
+    cache = DiskCache(tmp_path)
+
+    # Another process opens the directory while the body is being written...
+    download = s3.get_object2
+
+    def get_object2(*args, **kwargs):
+        (stream, headers) = download(*args, **kwargs)
+        inner = stream.readinto
+
+        def readinto(buf):
+            DiskCache(tmp_path)
+            return inner(buf)
+        stream.readinto = readinto
+        return (stream, headers)
+
+    s3.get_object2 = get_object2
+    assert _read(cache, s3, "a") == b"alpha"
+
+    # ...and between the body's rename and the metadata write
+    s3.get_object2 = download
+    write_atomic = disk_cache._write_atomic
+
+    def opened_before_meta(*args):
+        DiskCache(tmp_path)
+        write_atomic(*args)
+
+    monkeypatch.setattr('s3lib.disk_cache._write_atomic', opened_before_meta)
+    assert _read(cache, s3, "b") == b"bravo"
+    assert DiskCache(tmp_path).stats()['entries'] == 2
+
+
+def test_invalidate(tmp_path):
+    s3 = FakeStore()
+    s3.put("a", b"alpha", "e1")
+    cache = DiskCache(tmp_path)
+    _read(cache, s3, "a")
+    cache.invalidate("bucket", "a")
+    assert cache.stats()['entries'] == 0
+    assert os.listdir(tmp_path) == []
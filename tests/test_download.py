@@ -0,0 +1,169 @@
+"""
+Tests for parallel ranged downloads.
+"""
+
+import hashlib
+import io
+import threading
+from base64 import b64encode
+
+import pytest
+from conftest import FakePool
+
+from s3lib import PreconditionFailed, S3ResponseError
+from s3lib.download import coalesce_ranges, download_parallel, iter_ranges, read_ranges
+from s3lib.ui import verify_file
+
+
+class FakeStream(io.BytesIO):
+    def __exit__(self, *args):
+        return False
+
+
+class FakeRangeConnection:
+    """Serves HEAD and ranged GETs for one in-memory object."""
+
+    def __init__(self, data, etag="etag1", current_etag=None, fail=None, error=None):
+        self.store = {'lock': threading.Lock(), 'data': data, 'etag': etag,
+                      'current_etag': current_etag or etag, 'requests': [], 'fail': fail or {}, 'error': error}
+
+    def head_object(self, bucket, key):
+        return [("Content-Length", str(len(self.store['data']))), ("ETag", f'"{self.store["etag"]}"')]
+
+    def get_object2(self, bucket, key, if_match=None, if_none_match=None, byte_range=None):
+        with self.store['lock']:
+            self.store['requests'].append(byte_range)
+            if self.store['fail'].get(byte_range, 0) > 0:
+                self.store['fail'][byte_range] -= 1
+                return (FakeStream(b"short"), {})
+            if if_match is not None and if_match != self.store['current_etag']:
+                return (None, {})
+            if self.store['error'] is not None:
+                raise self.store['error']
+        start, end = byte_range
+        size = len(self.store['data'])
+        headers = {"ETag": f'"{self.store["current_etag"]}"',
+                   "Content-Range": f"bytes {start}-{min(end, size - 1)}/{size}"}
+        return (FakeStream(self.store['data'][start:end + 1]), headers)
+
+    def get_object_into(self, bucket, key, buffer, if_match=None, byte_range=None):
+        stream, headers = self.get_object2(bucket, key, if_match=if_match, byte_range=byte_range)
+        if stream is None:
+            return (None, headers)
+        n = stream.readinto(buffer)
+        return (memoryview(buffer)[:n], headers)
+
+
+pytestmark = pytest.mark.usefixtures("no_backoff")
+
+
+def test_iter_ranges():
+    assert list(iter_ranges(10, 4)) == [(0, 3), (4, 7), (8, 9)]
+    assert list(iter_ranges(8, 4)) == [(0, 3), (4, 7)]
+    assert list(iter_ranges(0, 4)) == []
+
+
+def test_download_parallel_writes_every_range(tmp_path, monkeypatch):
+    monkeypatch.setattr('s3lib.download.READ_CHUNK_SIZE', 7)
+    data = bytes(range(256)) * 40
+    pool = FakePool(FakeRangeConnection(data))
+    path = tmp_path / "out"
+    path.write_bytes(b"stale contents longer than nothing" * 1000)
+    with open(path, 'wb') as f:
+        headers = download_parallel(pool, "bucket", "key", f, range_size=1000, jobs=4)
+    assert path.read_bytes() == data
+    assert headers['etag'] == '"etag1"'
+    assert sorted(pool.conn.store['requests']) == list(iter_ranges(len(data), 1000))
+
+
+def test_download_parallel_empty_object(tmp_path):
+    pool = FakePool(FakeRangeConnection(b""))
+    path = tmp_path / "out"
+    with open(path, 'wb') as f:
+        download_parallel(pool, "bucket", "key", f)
+    assert path.read_bytes() == b""
+    assert pool.conn.store['requests'] == []
+
+
+def test_download_parallel_retries_short_range(tmp_path):
+    data = b"0123456789" * 10
+    pool = FakePool(FakeRangeConnection(data, fail={(50, 99): 2}))
+    path = tmp_path / "out"
+    with open(path, 'wb') as f:
+        download_parallel(pool, "bucket", "key", f, range_size=50, jobs=2, max_retries=3)
+    assert path.read_bytes() == data
+
+
+def test_download_parallel_object_changed(tmp_path):
+    pool = FakePool(FakeRangeConnection(b"x" * 100, etag="etag1", current_etag="etag2"))
+    with open(tmp_path / "out", 'wb') as f:
+        with pytest.raises(PreconditionFailed):
+            download_parallel(pool, "bucket", "key", f, range_size=10, jobs=2)
+    # A changed object is not retried
+    assert len(pool.conn.store['requests']) <= 10
+
+
+def test_download_parallel_if_match(tmp_path):
+    pool = FakePool(FakeRangeConnection(b"x" * 100, etag="etag1"))
+    with open(tmp_path / "out", 'wb') as f:
+        with pytest.raises(PreconditionFailed):
+            download_parallel(pool, "bucket", "key", f, if_match="other")
+    assert pool.conn.store['requests'] == []
+
+
+def test_coalesce_ranges():
+    assert coalesce_ranges([(50, 59), (0, 9), (12, 19), (15, 16)], max_gap=2) == [(0, 19), (50, 59)]
+    assert coalesce_ranges([(0, 9), (12, 19)], max_gap=1) == [(0, 9), (12, 19)]
+    assert coalesce_ranges([(0, 9), (10, 19)], max_gap=0) == [(0, 19)]
+    assert coalesce_ranges([]) == []
+    with pytest.raises(ValueError):
+        coalesce_ranges([(5, 4)])
+
+
+def test_read_ranges_coalesces_and_returns_views():
+    data = bytes(range(256)) * 4
+    pool = FakePool(FakeRangeConnection(data))
+    ranges = [(900, 909), (0, 3), (10, 19), (2, 5), (500, 500)]
+    views = read_ranges(pool, "bucket", "key", ranges, max_gap=8, jobs=2)
+    assert [bytes(v) for v in views] == [data[s:e + 1] for (s, e) in ranges]
+    assert all(isinstance(v, memoryview) for v in views)
+    # (0, 3), (2, 5) and (10, 19) share one request; the first pins the ETag
+    assert pool.conn.store['requests'][0] == (0, 19)
+    assert sorted(pool.conn.store['requests']) == [(0, 19), (500, 500), (900, 909)]
+    # Views into one span share its buffer
+    assert views[1].obj is views[2].obj
+
+
+def test_read_ranges_object_changed():
+    pool = FakePool(FakeRangeConnection(b"x" * 100, etag="etag1"))
+    with pytest.raises(PreconditionFailed):
+        read_ranges(pool, "bucket", "key", [(0, 9), (50, 59)], max_gap=0, etag="etag0")
+
+
+def test_read_ranges_past_end():
+    pool = FakePool(FakeRangeConnection(b"x" * 100))
+    with pytest.raises(S3ResponseError, match="past the end") as info:
+        read_ranges(pool, "bucket", "key", [(90, 109)], max_retries=3)
+    assert info.value.status == 416
+    # Not retried: the object really is shorter
+    assert pool.conn.store['requests'] == [(90, 109)]
+
+
+def test_download_parallel_does_not_retry_rejected_range(tmp_path):
+    error = S3ResponseError("S3 request failed with:\n403 Forbidden", 403, "AccessDenied")
+    pool = FakePool(FakeRangeConnection(b"x" * 100, error=error))
+    with open(tmp_path / "out", 'wb') as f:
+        with pytest.raises(S3ResponseError, match="403"):
+            download_parallel(pool, "bucket", "key", f, range_size=100, max_retries=3)
+    assert pool.conn.store['requests'] == [(0, 99)]
+
+
+def test_verify_file(tmp_path):
+    path = tmp_path / "out"
+    path.write_bytes(b"hello")
+    good = b64encode(hashlib.sha256(b"hello").digest()).decode()
+    verify_file(path, {"x-amz-checksum-sha256": good})
+    # Composite multipart checksums are not checksums of the bytes; skipped
+    verify_file(path, {"x-amz-checksum-sha256": "Zm9v-3"})
+    with pytest.raises(ValueError, match="Checksum verification failed"):
+        verify_file(path, {"x-amz-checksum-sha256": b64encode(b"0" * 32).decode()})
@@ -0,0 +1,157 @@
+"""
+Tests for parallel prefix-partitioned listing.
+"""
+
+import hashlib
+import threading
+import time
+
+import pytest
+from conftest import FakePool
+
+from s3lib import _parse_list_response
+from s3lib.listing import _split_point, list_parallel, list_sharded
+
+
+class FakeListConnection:
+    """Emulates ListObjectsV2 paging and delimiter roll-up over a sorted key list."""
+
+    def __init__(self, keys, latency=0):
+        self.store = {'lock': threading.Lock(), 'keys': sorted(keys), 'requests': [], 'latency': latency}
+
+    def list_bucket_page(self, bucket, continuation_token=None, start=None, prefix=None,
+                         batch_size=None, delimiter=None):
+        time.sleep(self.store['latency'])
+        with self.store['lock']:
+            self.store['requests'].append((prefix, start, continuation_token))
+        prefix = prefix or ""
+        after = continuation_token or start or ""
+        entries = []
+        for key in self.store['keys']:
+            if not key.startswith(prefix) or key <= after:
+                continue
+            cut = key.find(delimiter, len(prefix)) if delimiter else -1
+            entry = ("prefix", key[:cut + 1]) if cut >= 0 else ("key", key)
+            if entries and entries[-1] == entry:
+                continue
+            entries.append(entry)
+        page, rest = entries[:batch_size or 1000], entries[batch_size or 1000:]
+        # Resume after everything a returned prefix rolls up
+        token = (page[-1][1] + "\U0010ffff" if page[-1][0] == "prefix" else page[-1][1]) if rest else None
+        objects = [{'Key': name, 'Size': '1'} for (kind, name) in page if kind == "key"]
+        prefixes = [name for (kind, name) in page if kind == "prefix"]
+        return (objects, prefixes, token)
+
+
+KEYS = (["top-%d" % i for i in range(5)] +
+        ["a/%d" % i for i in range(7)] +
+        ["a/deep/%d" % i for i in range(4)] +
+        ["a0", "b/x", "b/y/z", "c/"])
+
+
+def test_list_parallel_ordered_matches_sorted_listing():
+    pool = FakePool(FakeListConnection(KEYS))
+    keys = [obj['Key'] for obj in list_parallel(pool, "bucket", ordered=True, jobs=4, batch_size=3)]
+    assert keys == sorted(KEYS)
+    # Every directory was listed by its own requests
+    assert {prefix for (prefix, _, _) in pool.conn.store['requests']} == {None, "a/", "a/deep/", "b/", "b/y/", "c/"}
+
+
+def test_list_parallel_unordered_yields_every_key():
+    pool = FakePool(FakeListConnection(KEYS))
+    keys = [obj['Key'] for obj in list_parallel(pool, "bucket", jobs=3, batch_size=2)]
+    assert sorted(keys) == sorted(KEYS)
+    assert len(keys) == len(KEYS)
+
+
+@pytest.mark.parametrize("prefixes", [5, 50])
+def test_list_parallel_unordered_counts_children_before_they_finish(prefixes):
+    # One-key prefixes finish almost at once; each must be counted before
+    # its last page arrives, or iteration stops early.
+    keys = ["d%02d/k" % i for i in range(prefixes)] + ["top"]
+    for _ in range(20):
+        listed = [obj['Key'] for obj in list_parallel(FakePool(FakeListConnection(keys)), "bucket", jobs=8)]
+        assert sorted(listed) == sorted(keys)
+
+
+def test_list_parallel_prefix_and_start():
+    pool = FakePool(FakeListConnection(KEYS))
+    keys = [obj['Key'] for obj in list_parallel(pool, "bucket", prefix="a/", start="a/3", ordered=True)]
+    assert keys == [key for key in sorted(KEYS) if key.startswith("a/") and key > "a/3"]
+    keys = [obj['Key'] for obj in list_parallel(pool, "bucket", start="a/deep/1", ordered=True)]
+    assert keys == [key for key in sorted(KEYS) if key > "a/deep/1"]
+    # A key equal to start is excluded even when it also names the prefix, e.g. a folder marker
+    markers = FakePool(FakeListConnection(["a", "a/", "a/x", "a/y/z", "b"]))
+    for ordered in (True, False):
+        for (prefix, start) in ((None, "a/"), ("a", "a"), ("a/", "a/")):
+            keys = [obj['Key'] for obj in list_parallel(markers, "bucket", prefix=prefix, start=start,
+                                                        ordered=ordered)]
+            assert sorted(keys) == [key for key in markers.conn.store['keys']
+                                    if key.startswith(prefix or "") and key > start]
+
+
+def test_list_parallel_error_propagates():
+    pool = FakePool(FakeListConnection(KEYS))
+
+    def fail(*args, **kwargs):
+        raise ValueError("S3 request failed with:\nAccessDenied")
+
+    pool.conn.list_bucket_page = fail
+    with pytest.raises(ValueError, match="AccessDenied"):
+        list(list_parallel(pool, "bucket"))
+
+
+def test_parse_list_response_common_prefixes():
+    xml = ('<ListBucketResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/">'
+           '<Contents><Key>a.txt</Key><Size>3</Size></Contents>'
+           '<CommonPrefixes><Prefix>logs/</Prefix></CommonPrefixes>'
+           '<CommonPrefixes><Prefix>data/</Prefix></CommonPrefixes>'
+           '<NextContinuationToken>tok</NextContinuationToken>'
+           '</ListBucketResult>')
+    objects, prefixes, token = _parse_list_response(xml)
+    assert objects == [{'Key': 'a.txt', 'Size': '3'}]
+    assert prefixes == ['logs/', 'data/']
+    assert token == 'tok'
+
+
+@pytest.mark.parametrize("lo, hi", [
+    (None, None), ("", None), ("a", "b"), ("a", "a0"), ("abc", "abd"), ("zz~~", None), ("3f9", "g"),
+])
+def test_split_point_between(lo, hi):
+    mid = _split_point(lo, hi)
+    assert mid is not None
+    assert (lo or "") < mid
+    assert hi is None or mid < hi
+
+
+def test_split_point_none_when_adjacent():
+    assert _split_point("a", "a ") is None
+    assert _split_point("a", "a") is None
+
+
+HASH_KEYS = [hashlib.sha1(str(i).encode()).hexdigest() for i in range(300)]
+
+
+def test_list_sharded_ordered():
+    pool = FakePool(FakeListConnection(HASH_KEYS))
+    keys = [obj['Key'] for obj in list_sharded(pool, "bucket", shards=5, jobs=3, ordered=True, batch_size=7)]
+    assert keys == sorted(HASH_KEYS)
+
+
+def test_list_sharded_steals_from_dense_shard():
+    """Keys crowded into one initial shard are rebalanced onto idle workers."""
+    dense = ["a" + key for key in HASH_KEYS]
+    pool = FakePool(FakeListConnection(dense, latency=0.001))
+    keys = [obj['Key'] for obj in list_sharded(pool, "bucket", shards=4, jobs=4, batch_size=5)]
+    assert sorted(keys) == sorted(dense)
+    assert len(keys) == len(dense)
+    first_pages = {start for (_, start, token) in pool.conn.store['requests'] if token is None}
+    assert len(first_pages) > 4
+
+
+def test_list_sharded_prefix_and_start():
+    pool = FakePool(FakeListConnection(HASH_KEYS + ["other/" + key for key in HASH_KEYS[:20]]))
+    keys = [obj['Key'] for obj in list_sharded(pool, "bucket", prefix="other/", start="other/8",
+                                               ordered=True, batch_size=3)]
+    assert keys == sorted("other/" + key for key in HASH_KEYS[:20] if key > "8")
+    assert list(list_sharded(pool, "bucket", prefix="other/", start="zzz")) == []
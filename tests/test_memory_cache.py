@@ -0,0 +1,185 @@
+"""
+Tests for MemoryCache and its integration with Connection.
+"""
+
+import io
+import threading
+import unittest.mock as mock
+
+from s3lib import Connection, MemoryCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_bounded_by_total_bytes():
+    cache = MemoryCache(max_bytes=10, max_object_size=10)
+    cache.put("b", "k1", b"1234", {}, "e1")
+    cache.put("b", "k2", b"5678", {}, "e2")
+    cache.get("b", "k1")  # k2 becomes least recently used
+    cache.put("b", "k3", b"abcd", {}, "e3")
+    assert cache.get("b", "k2") == (None, False)
+    assert cache.get("b", "k1")[0].body == b"1234"
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['bytes'] == 8
+
+
+def test_large_objects_not_cached():
+    cache = MemoryCache(max_bytes=100, max_object_size=4)
+    cache.put("b", "k", b"12345", {}, "e")
+    assert cache.stats()['entries'] == 0
+    assert not cache.cacheable(5)
+
+
+def test_ttl_marks_entries_stale():
+    clock = FakeClock()
+    cache = MemoryCache(ttl=5, clock=clock)
+    cache.put("b", "k", b"data", {}, "e")
+    assert cache.get("b", "k")[1] is True
+    clock.now = 6
+    entry, fresh = cache.get("b", "k")
+    assert not fresh
+    cache.revalidated("b", "k", entry)
+    assert cache.get("b", "k")[1] is True
+    assert cache.stats()['revalidations'] == 1
+
+
+def test_read_racing_a_write_is_not_cached():
+    cache = MemoryCache()
+    token = cache.read_token()
+    cache.put("b", "k", b"new", {}, "e2")
+    cache.put("b", "k", b"old", {}, "e1", read_token=token)
+    assert cache.get("b", "k")[0].body == b"new"
+
+
+def test_thread_safety():
+    cache = MemoryCache(max_bytes=1000, max_object_size=100)
+
+    def worker(n):
+        for i in range(500):
+            cache.put("b", f"k{(n * i) % 50}", b"x" * (i % 100), {}, "e")
+            cache.get("b", f"k{i % 50}")
+            if i % 7 == 0:
+                cache.invalidate("b", f"k{i % 50}")
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stats = cache.stats()
+    assert stats['bytes'] <= 1000
+    assert stats['bytes'] == sum(len(e.body) for e in cache._entries.values())
+
+
+def _response(body, etag="e1"):
+    resp = mock.Mock()
+    src = io.BytesIO(body)
+    resp.read.side_effect = src.read
+    resp.readinto.side_effect = src.readinto
+    return (resp, {"ETag": f'"{etag}"', "Content-Length": str(len(body))})
+
+
+def _connection(cache):
+    conn = Connection("someaccess", b"somesecret", object_cache=cache)
+    conn.requests = []
+
+    def fake_get(bucket, key, if_match=None, if_none_match=None, byte_range=None, extra_headers=None):
+        conn.requests.append(if_none_match)
+        if if_none_match == conn.etag:
+            return (None, {"ETag": f'"{conn.etag}"'})
+        return _response(conn.body, conn.etag)
+
+    conn._s3_get_request = fake_get
+    conn.body, conn.etag = b"hello", "e1"
+    return conn
+
+
+def _get(conn, key="k"):
+    stream, headers = conn.get_object2("b", key)
+    with stream:
+        return stream.read()
+
+
+def test_get_object2_served_from_cache():
+    cache = MemoryCache()
+    conn = _connection(cache)
+    assert _get(conn) == b"hello"
+    assert _get(conn) == b"hello"
+    assert conn.requests == [None]
+    assert conn._outstanding_response is None
+    assert cache.stats()['hits'] == 1
+
+
+def test_get_object2_revalidates_after_ttl():
+    clock = FakeClock()
+    cache = MemoryCache(ttl=1, clock=clock)
+    conn = _connection(cache)
+    _get(conn)
+    clock.now = 2
+    assert _get(conn) == b"hello"
+    conn.body, conn.etag = b"changed", "e2"
+    clock.now = 4
+    assert _get(conn) == b"changed"
+    assert conn.requests == [None, "e1", "e1"]
+
+
+def test_get_object2_conditional_and_range_bypass_cache():
+    cache = MemoryCache()
+    conn = _connection(cache)
+    _get(conn)
+    stream, _ = conn.get_object2("b", "k", byte_range=(0, 1))
+    with stream:
+        stream.read()
+    assert conn.requests == [None, None]
+
+
+def test_get_object2_verify_bypasses_cache():
+    import hashlib
+    from base64 import b64encode
+
+    cache = MemoryCache()
+    conn = _connection(cache)
+    _get(conn)
+    checksum = b64encode(hashlib.sha256(b"hello").digest()).decode()
+    resp, headers = _response(b"hello", "e1")
+    conn._s3_get_request = lambda *a, **kw: (resp, dict(headers, **{"x-amz-checksum-sha256": checksum}))
+    stream, _ = conn.get_object2("b", "k", verify=True)
+    assert stream.checksum_algorithm == "SHA256"
+    with stream:
+        assert stream.read() == b"hello"
+    assert cache.stats()['hits'] == 0
+
+
+def test_put_object2_writes_through_and_delete_invalidates():
+    cache = MemoryCache()
+    conn = _connection(cache)
+    conn._s3_put_request = lambda *a, **kw: (200, [("etag", '"e9"')])
+    conn._s3_delete_request = lambda *a, **kw: (204, [])
+    conn.put_object2("b", "k", b"written")
+    assert _get(conn) == b"written"
+    assert conn.requests == []
+
+    conn.delete_object("b", "k")
+    assert _get(conn) == b"hello"
+    assert conn.requests == [None]
+
+
+def test_delete_objects_and_put_object_invalidate():
+    cache = MemoryCache()
+    conn = _connection(cache)
+    _get(conn, "a")
+    _get(conn, "b")
+    conn._s3_delete_bulk_request = lambda bucket, keys, quiet: (
+        '<DeleteResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/">'
+        '<Deleted><Key>a</Key></Deleted></DeleteResult>')
+    list(conn.delete_objects("b", ["a"]))
+    assert cache.get("b", "a") == (None, False)
+    conn._s3_put_request = lambda *a, **kw: (200, [])
+    conn.put_object("b", "b", io.BytesIO(b"streamed"))
+    assert cache.stats()['entries'] == 0
@@ -0,0 +1,239 @@
+"""
+Tests for multipart uploads: Connection operations and the parallel engine.
+"""
+
+import io
+import threading
+import unittest.mock as mock
+from base64 import b64encode
+from hashlib import sha256
+
+import pytest
+from conftest import FakePool
+
+from s3lib import Connection, PartResult, S3ResponseError, _render_complete_multipart_content
+from s3lib.multipart import (
+    MIN_PART_SIZE,
+    FileSlice,
+    _iter_stream_parts,
+    part_size_for,
+    upload_multipart,
+)
+
+
+class FakeMultipartConnection:
+    """In-memory stand-in for the multipart methods of Connection."""
+
+    def __init__(self, fail_parts=None, error=None):
+        self.store = {'lock': threading.Lock(), 'parts': {}, 'created': 0,
+                      'active': 0, 'max_active': 0, 'aborted': False}
+        self._fail_parts = fail_parts if fail_parts is not None else {}
+        self._error = error or S3ResponseError("S3 request failed with:\n500 Internal Server Error", 500)
+
+    def create_multipart_upload(self, bucket, key, headers=None, checksum_algorithm="SHA256"):
+        with self.store['lock']:
+            self.store['created'] += 1
+        return "upload-1"
+
+    def upload_part(self, bucket, key, upload_id, part_number, data, checksum_algorithm="SHA256"):
+        body = data if isinstance(data, bytes) else data.read()
+        with self.store['lock']:
+            if self._fail_parts.get(part_number, 0) > 0:
+                self._fail_parts[part_number] -= 1
+                raise self._error
+            self.store['parts'][part_number] = body
+            self.store['active'] += 1
+            self.store['max_active'] = max(self.store['max_active'], self.store['active'])
+        # Give other workers a chance to overlap
+        threading.Event().wait(0.01)
+        with self.store['lock']:
+            self.store['active'] -= 1
+        checksum = b64encode(sha256(body).digest()).decode() if checksum_algorithm else None
+        return PartResult(part_number=part_number, etag=f"etag{part_number}",
+                          checksum=checksum, checksum_algorithm=checksum_algorithm)
+
+    def complete_multipart_upload(self, bucket, key, upload_id, parts):
+        numbers = [p['part_number'] for p in parts]
+        assert numbers == list(range(1, len(numbers) + 1))
+        self.store['object'] = b"".join(self.store['parts'][n] for n in numbers)
+        return {'etag': f"final-{len(numbers)}", 'version_id': None, 'checksum': None, 'status': 200}
+
+    def abort_multipart_upload(self, bucket, key, upload_id):
+        self.store['aborted'] = True
+
+
+pytestmark = pytest.mark.usefixtures("no_backoff")
+
+
+def test_file_slice_reads_range(tmp_path):
+    path = tmp_path / "data"
+    path.write_bytes(b"0123456789")
+    with open(path, 'rb') as f:
+        part = FileSlice(f.fileno(), 3, 4)
+        assert len(part) == 4
+        assert part.read(2) == b"34"
+        assert part.read() == b"56"
+        assert part.read() == b""
+        assert part.seek(0) == 0
+        assert part.read(100) == b"3456"
+        part.seek(-1, 2)
+        assert part.read() == b"6"
+
+
+def test_part_size_for():
+    assert part_size_for(100, 1) == MIN_PART_SIZE
+    assert part_size_for(100, 8 * 1024 * 1024) == 8 * 1024 * 1024
+    # 10000 parts max: a 100 GiB object needs parts over 10 MiB
+    assert part_size_for(100 * 1024 ** 3, MIN_PART_SIZE) == -(-100 * 1024 ** 3 // 10000)
+
+
+def test_iter_stream_parts_with_head():
+    data = b"x" * (2 * MIN_PART_SIZE + 10)
+    src = io.BytesIO(data[MIN_PART_SIZE + 5:])
+    parts = list(_iter_stream_parts(src, MIN_PART_SIZE, head=data[:MIN_PART_SIZE + 5]))
+    assert [n for n, _ in parts] == [1, 2, 3]
+    assert [len(p) for _, p in parts] == [MIN_PART_SIZE, MIN_PART_SIZE, 10]
+    assert b"".join(p for _, p in parts) == data
+
+
+def test_iter_stream_parts_exact_multiple_and_empty():
+    parts = list(_iter_stream_parts(io.BytesIO(b"y" * MIN_PART_SIZE), MIN_PART_SIZE))
+    assert [len(p) for _, p in parts] == [MIN_PART_SIZE]
+    assert list(_iter_stream_parts(io.BytesIO(b""), MIN_PART_SIZE)) == [(1, b"")]
+
+
+def test_iter_stream_parts_slices_head_without_copying_the_rest():
+    head = bytes(range(256)) * (MIN_PART_SIZE // 256) * 3
+    parts = list(_iter_stream_parts(io.BytesIO(b"tail"), MIN_PART_SIZE, head=head))
+    assert [len(p) for _, p in parts] == [MIN_PART_SIZE, MIN_PART_SIZE, MIN_PART_SIZE, 4]
+    assert all(isinstance(p, bytes) for _, p in parts)
+    assert b"".join(p for _, p in parts) == head + b"tail"
+
+
+def test_upload_multipart_regular_file(tmp_path):
+    data = bytes(range(256)) * (MIN_PART_SIZE * 3 // 256 + 7)
+    path = tmp_path / "big"
+    path.write_bytes(data)
+    pool = FakePool(FakeMultipartConnection())
+    with open(path, 'rb') as f:
+        result = upload_multipart(pool, "bucket", "key", f, part_size=MIN_PART_SIZE, jobs=4)
+    assert result['etag'] == "final-4"
+    assert pool.conn.store['object'] == data
+    assert pool.conn.store['max_active'] > 1
+
+
+def test_upload_multipart_stream():
+    data = b"s" * (MIN_PART_SIZE * 2 + 1)
+    pool = FakePool(FakeMultipartConnection())
+    result = upload_multipart(pool, "bucket", "key", io.BytesIO(data), part_size=MIN_PART_SIZE, jobs=2)
+    assert result['etag'] == "final-3"
+    assert pool.conn.store['object'] == data
+
+
+def test_upload_multipart_retries_failed_part():
+    data = b"r" * (MIN_PART_SIZE * 2)
+    pool = FakePool(FakeMultipartConnection(fail_parts={2: 2}))
+    upload_multipart(pool, "bucket", "key", io.BytesIO(data), part_size=MIN_PART_SIZE, max_retries=3)
+    assert pool.conn.store['object'] == data
+    assert pool.conn.store['aborted'] is False
+
+
+def test_upload_multipart_aborts_after_retries():
+    data = b"a" * (MIN_PART_SIZE * 2)
+    pool = FakePool(FakeMultipartConnection(fail_parts={1: 5}))
+    with pytest.raises(ValueError, match="500"):
+        upload_multipart(pool, "bucket", "key", io.BytesIO(data), part_size=MIN_PART_SIZE, max_retries=2)
+    assert pool.conn.store['aborted'] is True
+    assert 'object' not in pool.conn.store
+
+
+def test_upload_multipart_does_not_retry_rejected_part():
+    data = b"d" * (MIN_PART_SIZE * 2)
+    error = S3ResponseError("S3 request failed with:\n404 Not Found", 404, "NoSuchUpload")
+    pool = FakePool(FakeMultipartConnection(fail_parts={1: 1}, error=error))
+    with pytest.raises(S3ResponseError, match="404"):
+        upload_multipart(pool, "bucket", "key", io.BytesIO(data), part_size=MIN_PART_SIZE, max_retries=3)
+    assert pool.conn.store['aborted'] is True
+
+
+def _mock_response(status=200, body=b"", headers=None):
+    resp = mock.Mock()
+    resp.status = status
+    resp.read.return_value = body
+    resp.getheader.side_effect = lambda name, default=None: (headers or {}).get(name, default)
+    resp.getheaders.return_value = list((headers or {}).items())
+    return resp
+
+
+def test_create_multipart_upload_parses_upload_id():
+    conn = Connection("someaccess", b"somesecret")
+    captured = {}
+
+    def fake_request(method, bucket, key, args, headers, content, **kw):
+        captured.update(method=method, args=args, headers=headers)
+        return _mock_response(body=(
+            b'<InitiateMultipartUploadResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/">'
+            b'<Bucket>bucket</Bucket><Key>key</Key><UploadId>abc-123</UploadId>'
+            b'</InitiateMultipartUploadResult>'))
+
+    conn._s3_request = fake_request
+    assert conn.create_multipart_upload("bucket", "key") == "abc-123"
+    assert captured['method'] == "POST"
+    assert captured['args'] == {"uploads": None}
+    assert captured['headers']["x-amz-checksum-algorithm"] == "SHA256"
+
+
+def test_upload_part_sends_checksum_and_signed_hash(tmp_path):
+    path = tmp_path / "data"
+    path.write_bytes(b"0123456789")
+    conn = Connection("someaccess", b"somesecret")
+    captured = {}
+
+    def fake_request(method, bucket, key, args, headers, content, **kw):
+        captured.update(args=args, headers=headers, sha256_hint=kw.get('sha256_hint'), body=content.read())
+        return _mock_response(headers={"etag": '"part-etag"'})
+
+    conn._s3_request = fake_request
+    with open(path, 'rb') as f:
+        result = conn.upload_part("bucket", "key", "abc-123", 2, FileSlice(f.fileno(), 2, 5))
+
+    digest = sha256(b"23456").digest()
+    assert captured['args'] == {"partNumber": "2", "uploadId": "abc-123"}
+    assert captured['headers']["content-length"] == "5"
+    assert captured['headers']["x-amz-checksum-sha256"] == b64encode(digest).decode()
+    assert captured['sha256_hint'] == digest
+    assert captured['body'] == b"23456"
+    assert result == PartResult(part_number=2, etag="part-etag",
+                                checksum=b64encode(digest).decode(), checksum_algorithm="SHA256")
+
+
+def test_complete_multipart_upload_raises_on_error_body():
+    conn = Connection("someaccess", b"somesecret")
+    conn._s3_request = lambda *a, **kw: _mock_response(
+        body=b"<Error><Code>InternalError</Code><Message>We encountered an internal error.</Message></Error>")
+    with pytest.raises(ValueError, match="InternalError"):
+        conn.complete_multipart_upload("bucket", "key", "abc-123", [])
+
+
+def test_complete_multipart_upload_result():
+    conn = Connection("someaccess", b"somesecret")
+    conn._s3_request = lambda *a, **kw: _mock_response(
+        body=(b'<CompleteMultipartUploadResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/">'
+              b'<ETag>"abc-2"</ETag><ChecksumSHA256>Zm9v-2</ChecksumSHA256>'
+              b'</CompleteMultipartUploadResult>'),
+        headers={"x-amz-version-id": "v1"})
+    result = conn.complete_multipart_upload("bucket", "key", "abc-123", [])
+    assert result == {'etag': "abc-2", 'version_id': "v1", 'checksum': "Zm9v-2", 'status': 200}
+
+
+def test_render_complete_multipart_content():
+    parts = [
+        PartResult(part_number=1, etag="e1", checksum="c1", checksum_algorithm="SHA256"),
+        PartResult(part_number=2, etag="e2", checksum=None, checksum_algorithm=None),
+    ]
+    assert _render_complete_multipart_content(parts) == (
+        b'<CompleteMultipartUpload>'
+        b'<Part><PartNumber>1</PartNumber><ETag>"e1"</ETag><ChecksumSHA256>c1</ChecksumSHA256></Part>'
+        b'<Part><PartNumber>2</PartNumber><ETag>"e2"</ETag></Part>'
+        b'</CompleteMultipartUpload>'
+    )
@@ -0,0 +1,58 @@
+"""
+Tests for typed listing records and column batches.
+"""
+
+from datetime import datetime, timezone
+
+from s3lib import ObjectColumns, ObjectInfo, _parse_list_response, _ListResponseParser
+
+PAGE = ('<ListBucketResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/">'
+        '<Contents><Key>a.txt</Key><LastModified>2024-01-02T03:04:05.250Z</LastModified>'
+        '<ETag>&quot;abc&quot;</ETag><Size>12345678901</Size><StorageClass>STANDARD</StorageClass>'
+        '<ChecksumAlgorithm>CRC32</ChecksumAlgorithm><ChecksumType>FULL_OBJECT</ChecksumType></Contents>'
+        '<Contents><Key>b.txt</Key><LastModified>2024-01-02T03:04:06.000Z</LastModified>'
+        '<ETag>&quot;def&quot;</ETag><Size>0</Size><StorageClass>STANDARD</StorageClass></Contents>'
+        '</ListBucketResult>')
+
+
+def _records(xml):
+    parser = _ListResponseParser(records=True)
+    return parser.feed(xml) + parser.close()
+
+
+def test_parser_builds_typed_records():
+    a, b = _records(PAGE)
+    assert a.key == "a.txt"
+    assert a.size == 12345678901
+    assert a.etag == "abc"
+    assert a.checksum_algorithm == "CRC32"
+    assert a.checksum_type == "FULL_OBJECT"
+    assert b.checksum_algorithm is None
+    # Interned: every record shares one string
+    assert a.storage_class is b.storage_class
+
+
+def test_timestamp_parsed_lazily():
+    (a, _) = _records(PAGE)
+    assert a._last_modified is None
+    assert a.last_modified == datetime(2024, 1, 2, 3, 4, 5, 250000, tzinfo=timezone.utc)
+    assert a.mtime == a.last_modified.timestamp()
+    assert ObjectInfo("k", 0, "", None).last_modified is None
+
+
+def test_dict_round_trip_matches_list_bucket2():
+    dicts, _, _ = _parse_list_response(PAGE)
+    records = _records(PAGE)
+    assert [obj.to_dict() for obj in records] == dicts
+    assert [ObjectInfo.from_dict(obj) for obj in dicts] == records
+
+
+def test_columns():
+    columns = ObjectColumns.from_objects(_records(PAGE))
+    assert len(columns) == 2
+    assert columns.keys == ["a.txt", "b.txt"]
+    assert columns.sizes.typecode == 'q'
+    assert list(columns.sizes) == [12345678901, 0]
+    assert list(columns.mtimes) == [1704164645.25, 1704164646.0]
+    assert columns.etags == ["abc", "def"]
+    assert columns.storage_classes == ["STANDARD", "STANDARD"]
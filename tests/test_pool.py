@@ -316,3 +316,84 @@ def test_pool_repr():
     assert "closed=False" in repr_str
 
     pool.close()
+
+
+class _FakeObjectConnection:
+    """Stands in for Connection in get_objects tests, serving bodies from a dict."""
+
+    objects: dict = {}
+
+    def __init__(self, *args, **kwargs):
+        self._stream = None
+        self._entered = False
+
+    def __enter__(self):
+        return self
+
+    def is_ready(self):
+        return self._stream is None or self._stream._exhausted
+
+    def _disconnect(self):
+        pass
+
+    def get_object2(self, bucket, key, verify=False):
+        import io
+        from s3lib import S3ByteStream
+
+        if key not in self.objects:
+            raise ValueError(f"404 NoSuchKey {key}")
+        body = self.objects[key]
+        self._stream = S3ByteStream(io.BytesIO(body), remaining=len(body))
+        return (self._stream, {"Content-Length": str(len(body))})
+
+
+def test_get_objects_in_order(monkeypatch):
+    """Objects come back in input order; small bodies are buffered as bytes."""
+    import s3lib
+
+    objects = {f"key{i}": f"body{i}".encode() for i in range(20)}
+    monkeypatch.setattr(_FakeObjectConnection, "objects", objects)
+    monkeypatch.setattr(s3lib, "Connection", _FakeObjectConnection)
+
+    with ConnectionPool(access_id="test", secret=b"secret", max_connections=4) as pool:
+        results = list(pool.get_objects("bucket", list(objects), prefetch=8))
+        assert pool.stats()['in_use'] == 0
+
+    assert [(key, body) for key, body, _ in results] == list(objects.items())
+
+
+def test_get_objects_streams_over_budget(monkeypatch):
+    """A body that does not fit the memory budget is yielded as a stream."""
+    import s3lib
+
+    objects = {"small": b"x" * 10, "large": b"y" * 100, "tail": b"z" * 10}
+    monkeypatch.setattr(_FakeObjectConnection, "objects", objects)
+    monkeypatch.setattr(s3lib, "Connection", _FakeObjectConnection)
+
+    with ConnectionPool(access_id="test", secret=b"secret", max_connections=4) as pool:
+        seen = {}
+        for key, body, headers in pool.get_objects("bucket", objects, max_buffered_bytes=50):
+            if isinstance(body, bytes):
+                seen[key] = ("bytes", body)
+            else:
+                with body:
+                    seen[key] = ("stream", body.read())
+
+    assert seen == {"small": ("bytes", objects["small"]),
+                    "large": ("stream", objects["large"]),
+                    "tail": ("bytes", objects["tail"])}
+
+
+def test_get_objects_error_raised_at_key(monkeypatch):
+    """A failed fetch raises when its key is reached, after earlier keys are yielded."""
+    import s3lib
+
+    monkeypatch.setattr(_FakeObjectConnection, "objects", {"a": b"1", "c": b"3"})
+    monkeypatch.setattr(s3lib, "Connection", _FakeObjectConnection)
+
+    with ConnectionPool(access_id="test", secret=b"secret", max_connections=4) as pool:
+        results = pool.get_objects("bucket", ["a", "missing", "c"])
+        assert next(results)[1] == b"1"
+        with pytest.raises(ValueError, match="NoSuchKey"):
+            next(results)
+        assert pool.stats()['in_use'] == 0
@@ -0,0 +1,132 @@
+"""
+Tests for S3RandomAccessFile.
+"""
+
+import io
+import zipfile
+
+import pytest
+from conftest import FakePool
+
+from s3lib import PreconditionFailed, S3RandomAccessFile
+
+
+class FakeObjectConnection:
+    """Serves HEAD and ranged get_object_into for one in-memory object."""
+
+    def __init__(self, data, etag="etag1"):
+        self.data = data
+        self.etag = etag
+        self.ranges = []
+        self.heads = 0
+
+    def head_object(self, bucket, key):
+        self.heads += 1
+        return [("Content-Length", str(len(self.data))), ("ETag", f'"{self.etag}"')]
+
+    def get_object_into(self, bucket, key, buffer=None, if_match=None, if_none_match=None, byte_range=None):
+        self.ranges.append(byte_range)
+        if if_match != self.etag:
+            return (None, {})
+        start, end = byte_range
+        return (memoryview(bytearray(self.data[start:end + 1])), {})
+
+
+DATA = bytes(range(256)) * 16  # 4096 bytes
+
+
+def test_seek_tell_read():
+    conn = FakeObjectConnection(DATA)
+    with S3RandomAccessFile(conn, "bucket", "key", block_size=100) as f:
+        assert f.size == len(DATA)
+        assert f.etag == "etag1"
+        assert f.seekable() and f.readable()
+        assert f.read(10) == DATA[:10]
+        assert f.tell() == 10
+        f.seek(-20, io.SEEK_END)
+        assert f.read() == DATA[-20:]
+        assert f.read(5) == b""
+        f.seek(250)
+        f.seek(-50, io.SEEK_CUR)
+        assert f.read(300) == DATA[200:500]
+        f.seek(len(DATA) + 10)
+        assert f.read(1) == b""
+
+
+def test_block_cache_hits():
+    conn = FakeObjectConnection(DATA)
+    with S3RandomAccessFile(conn, "bucket", "key", block_size=100, read_ahead=0) as f:
+        f.seek(1000)
+        f.read(10)
+        f.seek(1050)
+        f.read(10)
+        assert conn.ranges == [(1000, 1099)]
+        assert f.stats() == {'hits': 1, 'misses': 1, 'requests': 1, 'size': 1}
+
+
+def test_multi_block_read_is_one_request():
+    conn = FakeObjectConnection(DATA)
+    with S3RandomAccessFile(conn, "bucket", "key", block_size=100, read_ahead=0) as f:
+        f.seek(150)
+        assert f.read(300) == DATA[150:450]
+    assert conn.ranges == [(100, 499)]
+
+
+def test_sequential_reads_trigger_read_ahead():
+    conn = FakeObjectConnection(DATA)
+    with S3RandomAccessFile(conn, "bucket", "key", block_size=100, read_ahead=4) as f:
+        out = b"".join(iter(lambda: f.read(50), b""))
+    assert out == DATA
+    # First read is not known to be sequential; later misses fetch 5 blocks at a time
+    assert conn.ranges[0] == (0, 99)
+    assert conn.ranges[1] == (100, 599)
+    assert len(conn.ranges) == 9  # 41 blocks: 1 + 8 * 5
+
+
+def test_lru_eviction():
+    conn = FakeObjectConnection(DATA)
+    with S3RandomAccessFile(conn, "bucket", "key", block_size=100, cache_blocks=2, read_ahead=0) as f:
+        for offset in (0, 1000, 2000, 0):
+            f.seek(offset)
+            f.read(1)
+        assert f.stats()['size'] == 2
+    assert conn.ranges == [(0, 99), (1000, 1099), (2000, 2099), (0, 99)]
+
+
+def test_known_size_and_etag_skip_head():
+    conn = FakeObjectConnection(DATA)
+    with S3RandomAccessFile(conn, "bucket", "key", etag="etag1", size=len(DATA)) as f:
+        assert f.read(4) == DATA[:4]
+    assert conn.heads == 0
+
+
+def test_object_changed_raises():
+    conn = FakeObjectConnection(DATA)
+    with S3RandomAccessFile(conn, "bucket", "key", block_size=100) as f:
+        f.read(10)
+        conn.etag = "etag2"
+        # Cached block still served
+        assert f.read(10) == DATA[10:20]
+        f.seek(3000)
+        with pytest.raises(PreconditionFailed):
+            f.read(10)
+
+
+def test_pool_source_and_zipfile():
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        zf.writestr("a.txt", b"alpha" * 1000)
+        zf.writestr("b.txt", b"beta")
+    pool = FakePool(FakeObjectConnection(buf.getvalue()))
+    with S3RandomAccessFile(pool, "bucket", "archive.zip", block_size=512) as raw:
+        with zipfile.ZipFile(io.BufferedReader(raw)) as zf:
+            assert zf.namelist() == ["a.txt", "b.txt"]
+            assert zf.read("b.txt") == b"beta"
+    assert pool.leases == len(pool.conn.ranges) + 1
+
+
+def test_closed_file_raises():
+    f = S3RandomAccessFile(FakeObjectConnection(DATA), "bucket", "key")
+    f.close()
+    with pytest.raises(ValueError):
+        f.read(1)
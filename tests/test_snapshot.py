@@ -0,0 +1,137 @@
+"""
+Tests for local listing snapshots.
+"""
+
+import hashlib
+import threading
+
+import pytest
+from conftest import FakePool
+
+from s3lib import ListingSnapshot
+from s3lib.snapshot import _prefix_end
+
+
+class FakeStoreConnection:
+    """Emulates ListObjectsV2 paging over a dict of key -> ETag."""
+
+    def __init__(self, keys):
+        self.store = {'lock': threading.Lock(), 'objects': {key: "v1" for key in keys}, 'requests': []}
+
+    def list_bucket_page(self, bucket, continuation_token=None, start=None, prefix=None,
+                         batch_size=None, delimiter=None):
+        with self.store['lock']:
+            self.store['requests'].append((start, continuation_token))
+            after = continuation_token or start or ""
+            keys = sorted(key for key in self.store['objects'] if key.startswith(prefix or "") and key > after)
+            page, rest = keys[:batch_size], keys[batch_size:]
+            objects = [{'Key': key, 'Size': '5', 'ETag': '"%s"' % self.store['objects'][key],
+                        'LastModified': '2024-01-01T00:00:00.000Z', 'StorageClass': 'STANDARD'}
+                       for key in page]
+            return (objects, [], page[-1] if rest else None)
+
+
+KEYS = [hashlib.sha1(str(i).encode()).hexdigest() for i in range(200)]
+
+
+def _keys(snapshot, **kwargs):
+    return [obj.key for obj in snapshot.list(**kwargs)]
+
+
+def test_create_and_query(tmp_path):
+    pool = FakePool(FakeStoreConnection(KEYS + ["other/x"]))
+    path = str(tmp_path / "snap.db")
+    with ListingSnapshot.create(path, pool, "bucket", shards=4, jobs=4, batch_size=10) as snapshot:
+        assert _keys(snapshot) == sorted(KEYS + ["other/x"])
+        assert _keys(snapshot, prefix="a") == sorted(key for key in KEYS if key.startswith("a"))
+        assert _keys(snapshot, prefix="a", start=_keys(snapshot, prefix="a")[2]) == _keys(snapshot, prefix="a")[3:]
+        assert snapshot.count(prefix="other/") == 1
+        assert snapshot.high_water_mark() == "other/x"
+    with pytest.raises(FileExistsError):
+        ListingSnapshot.create(path, pool, "bucket")
+    with ListingSnapshot(path) as reopened:
+        assert reopened.bucket == "bucket"
+        obj = next(reopened.list(prefix="other/"))
+        assert (obj.key, obj.size, obj.etag) == ("other/x", 5, "v1")
+
+
+def test_refresh_only_rewrites_changed_pages(tmp_path):
+    pool = FakePool(FakeStoreConnection(KEYS))
+    snapshot = ListingSnapshot.create(str(tmp_path / "snap.db"), pool, "bucket", shards=4, batch_size=10)
+    pages = snapshot._db.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    pool.conn.store['requests'].clear()
+    assert snapshot.refresh(pool) == {'pages': pages, 'changed': 0, 'objects': len(KEYS)}
+    # One request per stored page, plus one for a shard's full last page,
+    # which does not end at a listed key
+    assert pages <= len(pool.conn.store['requests']) <= pages + 4
+
+    changed = sorted(KEYS)[55]
+    pool.conn.store['objects'][changed] = "v2"
+    del pool.conn.store['objects'][sorted(KEYS)[120]]
+    for i in range(25):
+        pool.conn.store['objects'][sorted(KEYS)[150] + "-new%02d" % i] = "v1"
+    stats = snapshot.refresh(pool)
+    assert stats['changed'] == 3
+    assert _keys(snapshot) == sorted(pool.conn.store['objects'])
+    assert next(snapshot.list(start=sorted(KEYS)[54])).etag == "v2"
+    # The page that grew was split, so the next refresh is back to about one request per page
+    pool.conn.store['requests'].clear()
+    stats = snapshot.refresh(pool)
+    assert stats['changed'] == 0
+    assert len(pool.conn.store['requests']) <= stats['pages'] + 4
+
+
+def test_refresh_append_only_lists_past_high_water_mark(tmp_path):
+    keys = ["log/%04d" % i for i in range(30)]
+    pool = FakePool(FakeStoreConnection(keys))
+    snapshot = ListingSnapshot.create(str(tmp_path / "snap.db"), pool, "bucket", prefix="log/", batch_size=10)
+    for i in range(30, 45):
+        pool.conn.store['objects']["log/%04d" % i] = "v1"
+    pool.conn.store['requests'].clear()
+    snapshot.refresh(pool, append_only=True)
+    assert ("log/0029", None) in pool.conn.store['requests']
+    assert all(start is not None and start >= "log/0029" for (start, _) in pool.conn.store['requests'])
+    assert _keys(snapshot) == ["log/%04d" % i for i in range(45)]
+    # A later full refresh agrees with the pages append mode wrote
+    assert snapshot.refresh(pool)['changed'] == 0
+    with pytest.raises(ValueError, match="only holds keys"):
+        list(snapshot.list(prefix="other/"))
+
+
+def test_failed_refresh_leaves_snapshot_unchanged(tmp_path):
+    pool = FakePool(FakeStoreConnection(KEYS))
+    snapshot = ListingSnapshot.create(str(tmp_path / "snap.db"), pool, "bucket", shards=4, batch_size=10)
+    pool.conn.store['objects'] = {"a": "v1"}
+    original = FakeStoreConnection.list_bucket_page
+    calls = []
+
+    def flaky(self, *args, **kwargs):
+        calls.append(1)
+        if len(calls) == 5:
+            raise ValueError("S3 request failed with:\nSlowDown")
+        return original(self, *args, **kwargs)
+
+    FakeStoreConnection.list_bucket_page = flaky
+    try:
+        with pytest.raises(ValueError, match="SlowDown"):
+            snapshot.refresh(pool, jobs=1)
+    finally:
+        FakeStoreConnection.list_bucket_page = original
+    assert _keys(snapshot) == sorted(KEYS)
+
+
+def test_not_a_snapshot(tmp_path):
+    path = tmp_path / "junk"
+    path.write_bytes(b"not sqlite at all" * 100)
+    with pytest.raises(ValueError, match="not a listing snapshot"):
+        ListingSnapshot(str(path))
+    with pytest.raises(FileNotFoundError):
+        ListingSnapshot(str(tmp_path / "missing"))
+
+
+def test_prefix_end():
+    assert _prefix_end("abc") == "abd"
+    assert _prefix_end("a\U0010ffff") == "b"
+    assert _prefix_end("퟿") == ""
+    assert _prefix_end("") is None
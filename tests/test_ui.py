@@ -184,6 +184,19 @@ def test_s3head(capsys, testbucket, testkey, testvalue):
     assert captured.err == ""
 
 
+def test_s3sign_presign(capsys, testcreds, monkeypatch):
+    import io
+    monkeypatch.setattr('sys.stdin', io.StringIO("a.txt\ndir/b c.txt\n\n"))
+    s3lib.ui.sign_main(['--presign', '--creds', testcreds, '--expires', '60', '--region', 'us-west-1', 'mybucket'])
+    captured = capsys.readouterr()
+    urls = captured.out.splitlines()
+    assert len(urls) == 2
+    assert urls[0].startswith("https://mybucket.s3-us-west-1.amazonaws.com/a.txt?X-Amz-Algorithm=AWS4-HMAC-SHA256")
+    assert urls[1].startswith("https://mybucket.s3-us-west-1.amazonaws.com/dir/b%20c.txt?")
+    assert all("X-Amz-Expires=60&" in url for url in urls)
+    assert captured.err == ""
+
+
 @pytest.mark.skip("Need to migrate to sign version 4 for examples to work")
 def test_s3sign(capsys, tmp_path, testcreds):
     import base64
@@ -199,3 +212,280 @@ def test_s3sign(capsys, tmp_path, testcreds):
     assert expected_policy == b64policy
     assert expected_signature == signature
     assert captured.err == ""
+
+
+def test_verified_copy_reuses_buffer():
+    import io
+    from base64 import b64encode
+    from hashlib import sha256
+    import unittest.mock as mock
+
+    body = os.urandom(3 * 65536 + 17)
+    src = mock.Mock()
+    src.readinto.side_effect = io.BytesIO(body).readinto
+    src.getheaders.return_value = [("x-amz-checksum-sha256", b64encode(sha256(body).digest()).decode())]
+    dst = io.BytesIO()
+    s3lib.ui.verified_copy(src, dst)
+    assert dst.getvalue() == body
+    buffers = {id(call.args[0].obj) for call in src.readinto.call_args_list}
+    assert len(buffers) == 1
+    src.read.assert_not_called()
+
+
+class FakeResumeConnection:
+    """Serves get_object2 for one in-memory object, honouring if_match and open-ended ranges."""
+
+    def __init__(self, body, etag="etag1"):
+        from base64 import b64encode
+        from hashlib import sha256
+
+        self.body = body
+        self.etag = etag
+        self.checksum = b64encode(sha256(body).digest()).decode()
+        self.requests = []
+
+    def get_object2(self, bucket, key, if_match=None, if_none_match=None, byte_range=None, verify=False):
+        import io
+        import unittest.mock as mock
+        from s3lib import S3ByteStream
+
+        self.requests.append((if_match, byte_range))
+        if if_match is not None and if_match != self.etag:
+            return (None, {})
+        start = byte_range[0] if byte_range else 0
+        resp = mock.Mock()
+        resp.readinto.side_effect = io.BytesIO(self.body[start:]).readinto
+        headers = {"ETag": f'"{self.etag}"', "Content-Length": str(len(self.body) - start)}
+        if byte_range is None:
+            headers["x-amz-checksum-sha256"] = self.checksum
+        return (S3ByteStream(resp), headers)
+
+
+def test_get_resumable_fresh_download(tmp_path):
+    body = os.urandom(200000)
+    s3 = FakeResumeConnection(body)
+    path = str(tmp_path / "out")
+    assert s3lib.ui.get_resumable(s3, "bucket", "key", path)
+    with open(path, 'rb') as f:
+        assert f.read() == body
+    assert not os.path.exists(path + s3lib.ui.RESUME_SUFFIX)
+    assert s3.requests == [(None, None)]
+
+
+def test_get_resumable_continues_partial(tmp_path):
+    from json import dumps
+
+    body = os.urandom(200000)
+    s3 = FakeResumeConnection(body)
+    path = str(tmp_path / "out")
+    with open(path, 'wb') as f:
+        f.write(body[:70001])
+    with open(path + s3lib.ui.RESUME_SUFFIX, 'w') as f:
+        f.write(dumps({'etag': "etag1", 'size': len(body), 'checksum': ["SHA256", s3.checksum]}))
+
+    assert s3lib.ui.get_resumable(s3, "bucket", "key", path)
+    with open(path, 'rb') as f:
+        assert f.read() == body
+    assert s3.requests == [("etag1", (70001, None))]
+    assert not os.path.exists(path + s3lib.ui.RESUME_SUFFIX)
+
+
+def test_get_resumable_detects_corrupt_prefix(tmp_path):
+    from json import dumps
+    from s3lib import ChecksumMismatch
+
+    body = os.urandom(1000)
+    s3 = FakeResumeConnection(body)
+    path = str(tmp_path / "out")
+    with open(path, 'wb') as f:
+        f.write(b"\0" * 500)
+    with open(path + s3lib.ui.RESUME_SUFFIX, 'w') as f:
+        f.write(dumps({'etag': "etag1", 'size': len(body), 'checksum': ["SHA256", s3.checksum]}))
+
+    with pytest.raises(ChecksumMismatch):
+        s3lib.ui.get_resumable(s3, "bucket", "key", path)
+    # The next attempt starts over
+    assert not os.path.exists(path + s3lib.ui.RESUME_SUFFIX)
+
+
+def test_get_resumable_restarts_when_object_changed(tmp_path, capsys):
+    from json import dumps
+
+    body = os.urandom(1000)
+    s3 = FakeResumeConnection(body, etag="etag2")
+    path = str(tmp_path / "out")
+    with open(path, 'wb') as f:
+        f.write(b"old version bytes" * 100)
+    with open(path + s3lib.ui.RESUME_SUFFIX, 'w') as f:
+        f.write(dumps({'etag': "etag1", 'size': 5000, 'checksum': [None, None]}))
+
+    assert s3lib.ui.get_resumable(s3, "bucket", "key", path)
+    with open(path, 'rb') as f:
+        assert f.read() == body
+    assert s3.requests == [("etag1", (1700, None)), (None, None)]
+    assert "restarting" in capsys.readouterr().err
+
+
+class FakeManyConnection:
+    """Stands in for pooled Connections in s3get --many, serving a fixed set of objects."""
+
+    objects = {"a.txt": b"alpha", "dir/b.txt": b"bravo" * 1000}
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def is_ready(self):
+        return True
+
+    def _disconnect(self):
+        pass
+
+    def get_object2(self, bucket, key, verify=False):
+        import io
+        from s3lib import S3ByteStream
+
+        body = self.objects[key]
+        return (S3ByteStream(io.BytesIO(body)), {"Content-Length": str(len(body))})
+
+
+def test_s3get_many(tmp_path, testcreds, monkeypatch):
+    import io
+
+    monkeypatch.setattr(s3lib, "Connection", FakeManyConnection)
+    monkeypatch.setattr('sys.stdin', io.StringIO("a.txt\n\ndir/b.txt\n"))
+    s3lib.ui.get_main(['--many', '--creds', testcreds, '--prefetch', '2', 'bucket', str(tmp_path / "out")])
+    for key, body in FakeManyConnection.objects.items():
+        assert (tmp_path / "out" / key).read_bytes() == body
+
+
+@pytest.mark.parametrize("key", ["../escape", "/abs", "a/./b", "dir/"])
+def test_s3get_many_rejects_unsafe_keys(tmp_path, key):
+    with pytest.raises(ValueError, match="Refusing"):
+        s3lib.ui._many_path(tmp_path, key)
+
+
+class FakeListingConnection(FakeManyConnection):
+    """Stands in for pooled Connections in s3ls --snapshot, listing a mutable set of keys."""
+
+    keys = ["a/1", "a/2", "b/1"]
+
+    def list_bucket_page(self, bucket, continuation_token=None, start=None, prefix=None,
+                         batch_size=None, delimiter=None):
+        after = continuation_token or start or ""
+        keys = [key for key in sorted(self.keys) if key.startswith(prefix or "") and key > after]
+        objects = [{'Key': key, 'Size': '1', 'ETag': '"e"'} for key in keys[:batch_size]]
+        return (objects, [], keys[batch_size - 1] if len(keys) > batch_size else None)
+
+
+def test_s3ls_snapshot(tmp_path, capsys, testcreds, monkeypatch):
+    monkeypatch.setattr(s3lib, "Connection", FakeListingConnection)
+    path = str(tmp_path / "snap")
+    s3lib.ui.ls_main(['--creds', testcreds, '--snapshot', path, '--jobs', '2', 'bucket'])
+    assert capsys.readouterr().out.split() == ["a/1", "a/2", "b/1"]
+
+    monkeypatch.setattr(FakeListingConnection, "keys", ["a/1", "a/2", "b/1", "b/2"])
+    s3lib.ui.ls_main(['--creds', testcreds, '--snapshot', path, '--refresh', 'none', '--prefix', 'b/', 'bucket'])
+    assert capsys.readouterr().out.split() == ["b/1"]
+    s3lib.ui.ls_main(['--creds', testcreds, '--snapshot', path, '--refresh', 'append', '--prefix', 'b/',
+                      'bucket', '--fields', 'Key', 'Size'])
+    assert capsys.readouterr().out.split("\n") == ["b/1\t1", "b/2\t1", ""]
+    with pytest.raises(ValueError, match="not other"):
+        s3lib.ui.ls_main(['--creds', testcreds, '--snapshot', path, 'other'])
+
+
+def test_s3du(tmp_path, capsys, testcreds, monkeypatch):
+    from json import loads
+
+    monkeypatch.setattr(s3lib, "Connection", FakeListingConnection)
+    monkeypatch.setattr(FakeListingConnection, "keys", ["a/1", "a/2", "b/1", "top"])
+    s3lib.ui.du_main(['--creds', testcreds, '--jobs', '2', 'bucket'])
+    assert capsys.readouterr().out.split("\n") == ["\t1\t1\t1", "a/\t2\t2\t1", "b/\t1\t1\t1", ""]
+    s3lib.ui.du_main(['--creds', testcreds, '--top', '1', '--format', 'json', 'bucket'])
+    report = loads(capsys.readouterr().out)
+    assert [group['prefix'] for group in report['groups']] == ["a/"]
+    assert report['total']['count'] == 4
+
+
+class FakeDeleteConnection(FakeManyConnection):
+    """Stands in for pooled Connections in s3rm --jobs and --prefix, deleting every key but "locked"."""
+
+    keys = ["a/1", "a/2", "b/1"]
+
+    def list_bucket2(self, bucket, start=None, prefix=None, batch_size=None, stream=False, prefetch=0):
+        for key in self.keys:
+            if key.startswith(prefix or "") and key > (start or ""):
+                yield {'Key': key}
+
+    def _invalidate_cached(self, bucket, key):
+        pass
+
+    def _s3_delete_bulk_request(self, bucket, keys, quiet):
+        entries = "".join("<Error><Key>locked</Key><Code>AccessDenied</Code></Error>" if key == "locked" else
+                          "" if quiet else f"<Deleted><Key>{key}</Key></Deleted>" for key in keys)
+        return f'<DeleteResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/">{entries}</DeleteResult>'.encode()
+
+
+def test_s3rm_jobs(capsys, testcreds, monkeypatch, no_backoff):
+    monkeypatch.setattr(s3lib, "Connection", FakeDeleteConnection)
+    s3lib.ui.rm_main(['--creds', testcreds, '--jobs', '2', '--batch', '2', '-v', 'bucket', 'a', 'b', 'c', 'locked'])
+    assert sorted(capsys.readouterr().out.splitlines()) == ["a Deleted", "b Deleted", "c Deleted", "locked Error"]
+    s3lib.ui.rm_main(['--creds', testcreds, '--jobs', '2', 'bucket', 'a', 'locked'])
+    assert capsys.readouterr().out == "locked Error\n"
+
+
+def test_s3rm_prefix(tmp_path, capsys, testcreds, monkeypatch):
+    monkeypatch.setattr(s3lib, "Connection", FakeDeleteConnection)
+    checkpoint = tmp_path / "purge.json"
+    s3lib.ui.rm_main(['--creds', testcreds, '--prefix', 'a/', '--checkpoint', str(checkpoint), '-v', 'bucket'])
+    assert sorted(capsys.readouterr().out.splitlines()) == ["a/1 Deleted", "a/2 Deleted"]
+    assert not checkpoint.exists()
+
+
+class FakePutConnection(FakeManyConnection):
+    """Stands in for Connection in s3put, recording whether an upload went multipart."""
+
+    uploads: list = []
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def put_object(self, bucket, key, data, headers, **kwargs):
+        self.uploads.append(("put", len(data.read())))
+        return (200, [("etag", '"single"')])
+
+    def create_multipart_upload(self, bucket, key, headers=None, checksum_algorithm="SHA256"):
+        return "upload-1"
+
+    def upload_part(self, bucket, key, upload_id, part_number, data, checksum_algorithm="SHA256"):
+        from s3lib import PartResult
+
+        self.uploads.append(("part", len(data.read())))
+        return PartResult(part_number=part_number, etag="e", checksum=None, checksum_algorithm=None)
+
+    def complete_multipart_upload(self, bucket, key, upload_id, parts):
+        return {'etag': f"multi-{len(parts)}", 'version_id': None, 'checksum': None, 'status': 201}
+
+
+def test_s3put_multipart_is_opt_in(tmp_path, capsys, testcreds, monkeypatch):
+    from s3lib.multipart import MIN_PART_SIZE
+
+    monkeypatch.setattr(s3lib, "Connection", FakePutConnection)
+    monkeypatch.setattr(s3lib.ui, "Connection", FakePutConnection)
+    monkeypatch.setattr(FakePutConnection, "uploads", [])
+    path = tmp_path / "big"
+    path.write_bytes(b"m" * (MIN_PART_SIZE + 1))
+    argv = ['--creds', testcreds, '--multipart-threshold', str(MIN_PART_SIZE),
+            '--part-size', str(MIN_PART_SIZE), 'bucket', 'key', str(path)]
+    s3lib.ui.put_main(argv)
+    assert FakePutConnection.uploads == [("put", MIN_PART_SIZE + 1)]
+    capsys.readouterr()
+
+    FakePutConnection.uploads.clear()
+    s3lib.ui.put_main(['--multipart'] + argv)
+    assert sorted(FakePutConnection.uploads) == [("part", 1), ("part", MIN_PART_SIZE)]
+    out = capsys.readouterr().out
+    assert 'HTTP Code:  201' in out
+    assert 'etag: "multi-2"' in out
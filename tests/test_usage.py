@@ -0,0 +1,62 @@
+"""
+Tests for per-prefix storage usage.
+"""
+
+import pytest
+from conftest import FakePool
+
+from s3lib import ObjectInfo, UsageSummary, disk_usage
+
+OBJECTS = {
+    "top.txt": 10,
+    "logs/a.log": 100,
+    "logs/2024/b.log": 1000,
+    "logs/2024/c.log": 3000,
+    "data/x/y/z.bin": 5,
+    "data/empty": 0,
+}
+
+
+class FakeUsageConnection:
+    """Serves OBJECTS through both list_objects and list_bucket_page."""
+
+    def list_objects(self, bucket, prefix=None, batch_size=None, stream=False):
+        for key in sorted(OBJECTS):
+            if key.startswith(prefix or ""):
+                yield ObjectInfo(key, OBJECTS[key], "e", None)
+
+    def list_bucket_page(self, bucket, continuation_token=None, start=None, prefix=None,
+                         batch_size=None, delimiter=None):
+        after = continuation_token or start or ""
+        keys = [key for key in sorted(OBJECTS) if key.startswith(prefix or "") and key > after]
+        page = keys[:batch_size or 1000]
+        objects = [{'Key': key, 'Size': str(OBJECTS[key])} for key in page]
+        return (objects, [], page[-1] if len(keys) > len(page) else None)
+
+
+def _totals(summary):
+    return {group.prefix: (group.count, group.bytes) for group in summary.by_prefix()}
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_disk_usage_depth_one(jobs):
+    summary = disk_usage(FakePool(FakeUsageConnection()), "bucket", jobs=jobs, shards=4, batch_size=2)
+    assert _totals(summary) == {"": (1, 10), "data/": (2, 5), "logs/": (3, 4100)}
+    assert (summary.total.count, summary.total.bytes, summary.total.largest) == (6, 4115, 3000)
+
+
+def test_disk_usage_prefix_and_depth():
+    summary = disk_usage(FakePool(FakeUsageConnection()), "bucket", prefix="logs/", depth=2, jobs=1)
+    assert _totals(summary) == {"logs/": (1, 100), "logs/2024/": (2, 4000)}
+    summary = disk_usage(FakePool(FakeUsageConnection()), "bucket", depth=0, jobs=1)
+    assert _totals(summary) == {"": (6, 4115)}
+
+
+def test_histogram_and_top():
+    summary = UsageSummary(depth=1)
+    summary.update([("a/1", 0), ("a/2", 1), ("a/3", 3), ("a/4", 1024), ("b/1", 5000)])
+    a = summary.groups["a/"]
+    assert a.histogram_items() == [(0, 1), (1, 1), (2, 1), (1024, 1)]
+    assert [group.prefix for group in summary.top(1)] == ["b/"]
+    assert [group.prefix for group in summary.top()] == ["b/", "a/"]
+    assert a.to_dict()['histogram'] == [(0, 1), (1, 1), (2, 1), (1024, 1)]
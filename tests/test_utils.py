@@ -1,4 +1,10 @@
-from s3lib.utils import batchify, split_args, take
+from http.client import HTTPException
+from unittest import mock
+
+import pytest
+
+from s3lib.utils import (S3ResponseError, batchify, is_retryable, raise_http_resp_error, retry_call, retry_delay,
+                         split_args, take)
 
 
 def test_take():
@@ -22,3 +28,47 @@ def test_batchify():
 def test_split_args():
     assert split_args({"delete": None}) == {"delete": None}
     assert split_args({"delete": None, 'a': 'b'}) == {"delete": None}
+
+
+def test_raise_http_resp_error_reads_status_and_code():
+    resp = mock.Mock(status=403, reason="Forbidden", msg="")
+    resp.read.return_value = b"<Error><Code>AccessDenied</Code><Message>Access Denied</Message></Error>"
+    resp.getheaders.return_value = []
+    with pytest.raises(S3ResponseError, match="AccessDenied") as info:
+        raise_http_resp_error(resp)
+    assert (info.value.status, info.value.code) == (403, "AccessDenied")
+    assert isinstance(info.value, ValueError)
+
+
+def test_is_retryable():
+    assert is_retryable(S3ResponseError("", 500, "InternalError"))
+    assert is_retryable(S3ResponseError("", 503, "SlowDown"))
+    assert is_retryable(S3ResponseError("", 400, "RequestTimeout"))
+    assert is_retryable(S3ResponseError("", 429))
+    assert not is_retryable(S3ResponseError("", 403, "AccessDenied"))
+    assert not is_retryable(S3ResponseError("", 416, "InvalidRange"))
+    assert is_retryable(ValueError("Short range"))
+    assert is_retryable(ConnectionResetError())
+    assert is_retryable(HTTPException())
+    assert not is_retryable(KeyError())
+
+
+def test_retry_call(no_backoff):
+    fn = mock.Mock(side_effect=[HTTPException("reset"), S3ResponseError("", 503, "SlowDown"), "done"])
+    assert retry_call(fn, (1, 2), 3, "Request") == "done"
+    assert fn.call_args_list == [mock.call(1, 2)] * 3
+
+    fn = mock.Mock(side_effect=HTTPException("reset"))
+    with pytest.raises(HTTPException):
+        retry_call(fn, (), 3, "Request")
+    assert fn.call_count == 3
+
+    fn = mock.Mock(side_effect=S3ResponseError("", 403, "AccessDenied"))
+    with pytest.raises(S3ResponseError):
+        retry_call(fn, (), 3, "Request")
+    assert fn.call_count == 1
+
+
+def test_retry_delay(monkeypatch):
+    monkeypatch.setattr('s3lib.utils.RETRY_BACKOFF', 0.5)
+    assert [retry_delay(attempt) for attempt in (1, 2, 3)] == [0.5, 1.0, 2.0]